@@ -8,6 +8,10 @@ setup(
     install_requires=[
         "omegaconf>=2.3.0",
     ],
+    extras_require={
+        "analytics": ["numpy>=1.24"],
+        "cache": ["msgpack>=1.0"],
+    },
     package_data={
         "sqlsofa": ["conf/**/*.yaml"],
     },
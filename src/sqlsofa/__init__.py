@@ -2,7 +2,27 @@
     sqlsofa
 
 Provides some tooling to parse the pydantic schemas from sofascrape into a postgres sql sever .
+
+Subpackages are loaded lazily on first attribute access, so ``import sqlsofa``
+does not pull in sqlmodel, sqlalchemy or sofascrape.
 """
 
+from sqlsofa.utils.lazy import attach
+
 __version__ = "0.1.1"
-__all__ = []
+
+__getattr__, __dir__, __all__ = attach(
+    __name__,
+    {
+        "abstract": ".abstract",
+        "analytics": ".analytics",
+        "conf": ".conf",
+        "converters": ".converters",
+        "football": ".football",
+        "general": ".general",
+        "loaders": ".loaders",
+        "query": ".query",
+        "schema": ".schema",
+        "utils": ".utils",
+    },
+)
@@ -1,5 +1,13 @@
-from .base import BaseComponenetConverter
+from typing import TYPE_CHECKING
 
-__all__ = [
-    "BaseComponenetConverter",
-]
+from sqlsofa.utils.lazy import attach
+
+if TYPE_CHECKING:
+    from .base import BaseComponenetConverter
+
+__getattr__, __dir__, __all__ = attach(
+    __name__,
+    {
+        "BaseComponenetConverter": ".base",
+    },
+)
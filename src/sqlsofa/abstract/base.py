@@ -1,10 +1,12 @@
 import logging
 from abc import ABC, abstractmethod
-from typing import Dict, Generic, List, Optional, Set
+from typing import Dict, Generic, List, Optional, Set, Type
 
 from pydantic import BaseModel
 from sqlmodel import Session, SQLModel
 
+from sqlsofa.utils.json_input import JsonData, validate_json
+
 logger = logging.getLogger(__name__)
 
 
@@ -16,9 +18,18 @@ class BaseEntityConverter(ABC):
 class BaseComponenetConverter:
     """Converts basic event data - can run standalone"""
 
+    # sofascrape schema ``convert`` takes, for the raw JSON entry point
+    schema: Optional[Type[BaseModel]] = None
+
     def __init__(self) -> None:
         self.data: List[SQLModel] = []
 
+    def convert_json(self, data: JsonData) -> None:
+        """``convert`` raw JSON, validated straight into ``schema``"""
+        if self.schema is None:
+            raise NotImplementedError(f"{type(self).__name__} has no input schema")
+        self.convert(validate_json(self.schema, data))
+
     @abstractmethod
     def convert(self, pydantic_data: BaseModel) -> None:
         """
@@ -0,0 +1,25 @@
+from typing import TYPE_CHECKING
+
+from sqlsofa.utils.lazy import attach
+
+if TYPE_CHECKING:
+    from .player_stats import (
+        load_season_stats,
+        per90,
+        percentile_ranks,
+        refresh_player_summaries,
+        rolling_mean,
+        season_player_summary,
+    )
+
+__getattr__, __dir__, __all__ = attach(
+    __name__,
+    {
+        "load_season_stats": ".player_stats",
+        "per90": ".player_stats",
+        "percentile_ranks": ".player_stats",
+        "refresh_player_summaries": ".player_stats",
+        "rolling_mean": ".player_stats",
+        "season_player_summary": ".player_stats",
+    },
+)
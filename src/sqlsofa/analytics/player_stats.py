@@ -0,0 +1,257 @@
+# sqlsofa/analytics/player_stats.py
+"""
+Vectorised player statistics for a season.
+
+The season's PlayerStatistics rows are read in one query into a NumPy
+structured array, one record per appearance sorted by player and kick-off.
+Per-90 rates, rolling form and percentile ranks are computed with grouped
+array operations instead of loops over ORM objects.
+"""
+
+import logging
+from datetime import datetime
+from typing import Dict, Optional, Sequence, Tuple
+
+import numpy as np
+from sqlalchemy import delete, insert, select
+from sqlalchemy.engine import Engine
+from sqlalchemy.sql import Select
+
+from sqlsofa.conf.database import open_session
+from sqlsofa.schema import sqlmodels as sqlschema
+
+logger = logging.getLogger(__name__)
+
+KEY_COLUMNS: Tuple[str, ...] = ("event_id", "start", "player_id", "team_id")
+STAT_COLUMNS: Tuple[str, ...] = tuple(
+    column.name
+    for column in sqlschema.PlayerStatistics.__table__.columns
+    if column.name not in ("id", "created_at", "event_id", "player_id")
+)
+
+# PlayerSeasonSummary metric -> PlayerStatistics column
+SUMMARY_METRICS: Dict[str, str] = {
+    "goals": "goals",
+    "assists": "goalAssist",
+    "xg": "expectedGoals",
+    "xa": "expectedAssists",
+    "key_passes": "keyPass",
+    "tackles": "totalTackle",
+    "interceptions": "interceptionWon",
+    "duels_won": "duelWon",
+}
+
+# Appearances in the rolling form window
+FORM_WINDOW = 5
+# Minutes needed to be ranked against the rest of the league
+MIN_MINUTES = 450
+
+STATS_DTYPE = np.dtype(
+    [(name, "i8") for name in KEY_COLUMNS] + [(name, "f8") for name in STAT_COLUMNS]
+)
+
+
+def season_stats_query(season_id: int) -> Select:
+    Entry = sqlschema.LineupPlayerEntry
+    Stats = sqlschema.PlayerStatistics
+    Event = sqlschema.Event
+    return (
+        select(
+            Event.id,
+            Event.startTimestamp,
+            Entry.player_id,
+            Entry.team_id,
+            *(Stats.__table__.c[name] for name in STAT_COLUMNS),
+        )
+        .join(Entry, Entry.statistics_id == Stats.id)
+        .join(sqlschema.TeamLineup, Entry.team_lineup_id == sqlschema.TeamLineup.id)
+        .join(
+            sqlschema.FootballLineup,
+            sqlschema.TeamLineup.football_lineup_id == sqlschema.FootballLineup.id,
+        )
+        .join(Event, sqlschema.FootballLineup.event_id == Event.id)
+        .where(Event.season_id == season_id, Entry.player_id.is_not(None))
+        .order_by(Entry.player_id, Event.startTimestamp, Event.id)
+    )
+
+
+def load_season_stats(engine: Engine, season_id: int) -> np.ndarray:
+    """
+    One record per appearance, sorted by player then kick-off.
+
+    Missing statistics are NaN, a missing team id is -1.
+    """
+    with open_session(engine) as session:
+        rows = session.execute(season_stats_query(season_id)).all()
+
+    stats = np.empty(len(rows), dtype=STATS_DTYPE)
+    if not rows:
+        return stats
+    # None becomes NaN in a float matrix, then split into typed columns
+    matrix = np.array(rows, dtype=float)
+    for i, name in enumerate(STATS_DTYPE.names):
+        column = matrix[:, i]
+        if name in KEY_COLUMNS:
+            column = np.where(np.isnan(column), -1, column)
+        stats[name] = column
+    logger.info(f"Loaded {len(stats)} appearances for season {season_id}")
+    return stats
+
+
+##############################
+# Grouped operations
+##############################
+
+
+def group_index(keys: np.ndarray) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Groups of a sorted key array.
+
+    Returns the unique keys, the group of each row and the first row of each
+    row's group.
+    """
+    unique, inverse = np.unique(keys, return_inverse=True)
+    first = np.searchsorted(keys, keys, side="left")
+    return unique, inverse, first
+
+
+def group_sum(values: np.ndarray, inverse: np.ndarray, n_groups: int) -> np.ndarray:
+    """Per-group sums, NaN counted as 0"""
+    return np.bincount(inverse, weights=np.nan_to_num(values), minlength=n_groups)
+
+
+def group_mean(values: np.ndarray, inverse: np.ndarray, n_groups: int) -> np.ndarray:
+    """Per-group mean ignoring NaN, NaN for groups without values"""
+    counts = np.bincount(inverse, weights=~np.isnan(values), minlength=n_groups)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        return np.where(
+            counts > 0, group_sum(values, inverse, n_groups) / counts, np.nan
+        )
+
+
+def rolling_mean(values: np.ndarray, first: np.ndarray, window: int) -> np.ndarray:
+    """
+    Mean of each row and up to ``window - 1`` previous rows of its group,
+    ignoring NaN. ``first`` is the first row of each row's group.
+    """
+    valid = ~np.isnan(values)
+    sums = np.concatenate([[0.0], np.cumsum(np.where(valid, values, 0.0))])
+    counts = np.concatenate([[0], np.cumsum(valid)])
+    rows = np.arange(len(values))
+    start = np.maximum(rows - window + 1, first)
+    n = counts[rows + 1] - counts[start]
+    with np.errstate(invalid="ignore", divide="ignore"):
+        return np.where(n > 0, (sums[rows + 1] - sums[start]) / n, np.nan)
+
+
+def per90(
+    stats: np.ndarray, columns: Sequence[str] = STAT_COLUMNS
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Season per-90 rates for each player.
+
+    Returns the player ids, their minutes and a (players, columns) matrix of
+    rates, NaN for players without minutes.
+    """
+    players, inverse, _ = group_index(stats["player_id"])
+    minutes = group_sum(stats["minutesPlayed"], inverse, len(players))
+    totals = np.column_stack(
+        [group_sum(stats[column], inverse, len(players)) for column in columns]
+    )
+    with np.errstate(invalid="ignore", divide="ignore"):
+        rates = np.where(minutes[:, None] > 0, totals / minutes[:, None] * 90, np.nan)
+    return players, minutes, rates
+
+
+def percentile_ranks(values: np.ndarray, eligible: np.ndarray) -> np.ndarray:
+    """
+    Percentile (0-100) of each value within the eligible values of its column,
+    ties share the mid rank. Ineligible or NaN values get NaN.
+    """
+    if values.ndim == 1:
+        return percentile_ranks(values[:, None], eligible)[:, 0]
+    ranks = np.full(values.shape, np.nan)
+    for j in range(values.shape[1]):
+        column = values[:, j]
+        mask = eligible & ~np.isnan(column)
+        pool = np.sort(column[mask])
+        if len(pool) == 0:
+            continue
+        left = np.searchsorted(pool, column[mask], side="left")
+        right = np.searchsorted(pool, column[mask], side="right")
+        ranks[mask, j] = (left + 0.5 * (right - left)) / len(pool) * 100
+    return ranks
+
+
+##############################
+# Season summary
+##############################
+
+
+def season_player_summary(
+    stats: np.ndarray,
+    min_minutes: float = MIN_MINUTES,
+    form_window: int = FORM_WINDOW,
+) -> Dict[str, np.ndarray]:
+    """Columns of PlayerSeasonSummary for every player in ``stats``"""
+    players, inverse, first = group_index(stats["player_id"])
+    n_players = len(players)
+    last = np.r_[np.flatnonzero(np.diff(inverse)), len(stats) - 1] if n_players else []
+
+    metrics = list(SUMMARY_METRICS)
+    _, minutes, rates = per90(stats, [SUMMARY_METRICS[m] for m in metrics])
+    ranks = percentile_ranks(rates, minutes >= min_minutes)
+    form = rolling_mean(stats["rating"], first, form_window)
+
+    summary = {
+        "player_id": players,
+        "team_id": stats["team_id"][last],
+        "appearances": np.bincount(inverse, minlength=n_players),
+        "minutes": minutes,
+        "rating": group_mean(stats["rating"], inverse, n_players),
+        "form_rating": form[last],
+    }
+    for j, metric in enumerate(metrics):
+        summary[f"{metric}_p90"] = rates[:, j]
+        summary[f"{metric}_pct"] = ranks[:, j]
+    return summary
+
+
+def _python(value):
+    """numpy scalar -> python value, NaN -> None"""
+    value = value.item()
+    if isinstance(value, float) and np.isnan(value):
+        return None
+    return value
+
+
+def refresh_player_summaries(
+    engine: Engine, season_id: int, min_minutes: Optional[float] = None
+) -> int:
+    """Rebuild PlayerSeasonSummary rows of a season, returns the players written"""
+    stats = load_season_stats(engine, season_id)
+    summary = season_player_summary(
+        stats, min_minutes=MIN_MINUTES if min_minutes is None else min_minutes
+    )
+    now = datetime.now()
+    rows = [
+        {
+            "season_id": season_id,
+            "updated_at": now,
+            **{name: _python(column[i]) for name, column in summary.items()},
+        }
+        for i in range(len(summary["player_id"]))
+    ]
+    for row in rows:
+        row["minutes"] = int(row["minutes"])
+        if row["team_id"] == -1:
+            row["team_id"] = None
+
+    model = sqlschema.PlayerSeasonSummary
+    with open_session(engine, bulk=True) as session:
+        session.execute(delete(model).where(model.season_id == season_id))
+        if rows:
+            session.execute(insert(model), rows)
+        session.commit()
+    logger.info(f"Wrote {len(rows)} player summaries for season {season_id}")
+    return len(rows)
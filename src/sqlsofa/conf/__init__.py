@@ -0,0 +1,15 @@
+from typing import TYPE_CHECKING
+
+from sqlsofa.utils.lazy import attach
+
+if TYPE_CHECKING:
+    from .database import engine_from_config, load_config, open_session
+
+__getattr__, __dir__, __all__ = attach(
+    __name__,
+    {
+        "engine_from_config": ".database",
+        "load_config": ".database",
+        "open_session": ".database",
+    },
+)
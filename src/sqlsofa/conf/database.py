@@ -0,0 +1,115 @@
+# sqlsofa/conf/database.py
+"""
+Engine and session factory driven by ``conf/database.yaml``.
+
+``engine_from_config`` builds the engine with the pool, timeout and
+executemany settings of the config and remembers the bulk session settings
+for it. Loaders, summary rebuilds and readers open their sessions through
+``open_session``, so throughput tuning is a config change. Engines created
+elsewhere get plain sessions.
+"""
+
+import logging
+import weakref
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Dict, Iterable, Optional, Union
+
+from sqlalchemy import create_engine, event, text
+from sqlalchemy.engine import Engine, make_url
+from sqlmodel import Session
+
+if TYPE_CHECKING:
+    from omegaconf import DictConfig
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CONFIG = Path(__file__).parent / "database.yaml"
+
+# engine -> settings applied to its bulk sessions
+_BULK_SETTINGS: "weakref.WeakKeyDictionary[Engine, Dict[str, Any]]" = (
+    weakref.WeakKeyDictionary()
+)
+
+
+def load_config(
+    *paths: Union[str, Path], overrides: Iterable[str] = ()
+) -> "DictConfig":
+    """The default config merged with ``paths`` and dotlist ``overrides``"""
+    from omegaconf import OmegaConf
+
+    configs = [OmegaConf.load(DEFAULT_CONFIG)]
+    configs.extend(OmegaConf.load(path) for path in paths)
+    configs.append(OmegaConf.from_dotlist(list(overrides)))
+    return OmegaConf.merge(*configs)
+
+
+def engine_kwargs(cfg: "DictConfig") -> Dict[str, Any]:
+    """create_engine arguments for the ``database`` section of ``cfg``"""
+    db = cfg.database
+    url = make_url(db.url)
+    kwargs: Dict[str, Any] = {
+        "echo": db.echo,
+        "pool_pre_ping": db.pool.pre_ping,
+        "pool_recycle": db.pool.recycle,
+        "insertmanyvalues_page_size": db.insertmanyvalues_page_size,
+    }
+    if url.get_backend_name() == "sqlite":
+        # SQLite has a single writer, the pool size settings do not apply
+        return kwargs
+
+    kwargs["pool_size"] = db.pool.size
+    kwargs["max_overflow"] = db.pool.max_overflow
+    connect_args: Dict[str, Any] = {}
+    if db.statement_timeout_ms is not None:
+        connect_args["options"] = f"-c statement_timeout={db.statement_timeout_ms}"
+    driver = url.get_driver_name()
+    if driver == "psycopg2" and db.executemany_mode is not None:
+        kwargs["executemany_mode"] = db.executemany_mode
+    if driver == "psycopg":
+        connect_args["prepare_threshold"] = db.prepare_threshold
+    if connect_args:
+        kwargs["connect_args"] = connect_args
+    return kwargs
+
+
+def engine_from_config(cfg: Optional["DictConfig"] = None) -> Engine:
+    """Engine for ``cfg`` (the default config when not given)"""
+    if cfg is None:
+        cfg = load_config()
+    engine = create_engine(cfg.database.url, **engine_kwargs(cfg))
+    bulk: Dict[str, Any] = {}
+    if (
+        engine.dialect.name == "postgresql"
+        and cfg.database.bulk.synchronous_commit is not None
+    ):
+        bulk["synchronous_commit"] = str(cfg.database.bulk.synchronous_commit)
+    _BULK_SETTINGS[engine] = bulk
+    if cfg.database.statement_stats.enabled:
+        from sqlsofa.utils.sql_stats import instrument
+
+        instrument(engine, log_json=cfg.database.statement_stats.log_json)
+    logger.info(f"Created engine for {engine.url!r}")
+    return engine
+
+
+def open_session(engine: Engine, bulk: bool = False, **kwargs: Any) -> Session:
+    """
+    A session on ``engine``.
+
+    Bulk sessions apply the engine's bulk settings transaction-locally (like
+    SET LOCAL) at the start of every transaction, so they never leak into
+    pooled connections.
+    """
+    session = Session(engine, **kwargs)
+    settings = _BULK_SETTINGS.get(engine) if bulk else None
+    if settings:
+
+        @event.listens_for(session, "after_begin")
+        def apply_settings(session, transaction, connection) -> None:
+            for name, value in settings.items():
+                connection.execute(
+                    text("SELECT set_config(:name, :value, true)"),
+                    {"name": name, "value": value},
+                )
+
+    return session
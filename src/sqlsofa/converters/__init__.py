@@ -1,4 +1,38 @@
-from .football_detials_converter import DetailsComponentBuilder
-from .football_match_converter import FootballMatchConverter
+from typing import TYPE_CHECKING
 
-__all__ = ["DetailsComponentBuilder", "FootballMatchConverter"]
+from sqlsofa.utils.lazy import attach
+
+if TYPE_CHECKING:
+    from .base_converter import ConversionResult
+    from .compact_result import CompactResult, LocalRef, RowBuffer
+    from .conversion_cache import ConversionCache
+    from .dead_letter import (
+        ComponentFailure,
+        DatabaseDeadLetterQueue,
+        DeadLetterQueue,
+        FileDeadLetterQueue,
+        retry_dead_letters,
+    )
+    from .football_detials_converter import DetailsComponentBuilder
+    from .football_match_converter import FootballMatchConverter
+    from .raw_rows import RawEventsConverter, RowMapping
+
+__getattr__, __dir__, __all__ = attach(
+    __name__,
+    {
+        "CompactResult": ".compact_result",
+        "ComponentFailure": ".dead_letter",
+        "ConversionCache": ".conversion_cache",
+        "ConversionResult": ".base_converter",
+        "DatabaseDeadLetterQueue": ".dead_letter",
+        "DeadLetterQueue": ".dead_letter",
+        "DetailsComponentBuilder": ".football_detials_converter",
+        "FileDeadLetterQueue": ".dead_letter",
+        "FootballMatchConverter": ".football_match_converter",
+        "LocalRef": ".compact_result",
+        "RawEventsConverter": ".raw_rows",
+        "RowMapping": ".raw_rows",
+        "RowBuffer": ".compact_result",
+        "retry_dead_letters": ".dead_letter",
+    },
+)
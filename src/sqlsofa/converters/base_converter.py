@@ -1,13 +1,20 @@
 # sqlsofa/converters/base_converter.py
+from __future__ import annotations
 
 import logging
 from abc import ABC, abstractmethod
 from dataclasses import dataclass, field
-from typing import Any, Dict, List, Optional, Set
+from typing import TYPE_CHECKING, Any, Dict, List, MutableMapping, Optional, Set, Tuple
 
-from sofascrape.schemas import general as sofaschema
+if TYPE_CHECKING:
+    # Annotations only - keeps ConversionResult importable without paying for
+    # sofascrape or the sqlmodel mappers (loaders import it)
+    from sofascrape.schemas import general as sofaschema
 
-from sqlsofa.schema import sqlmodels as sqlschema
+    from sqlsofa.schema import sqlmodels as sqlschema
+    from sqlsofa.utils.reference_cache import ReferenceCache
+
+    from .compact_result import CompactResult
 
 logger = logging.getLogger(__name__)
 
@@ -41,12 +48,28 @@ class ConversionResult:
     match_id: int = 0
     processed_components: Dict[str, bool] = field(default_factory=dict)
 
+    def compact(self) -> CompactResult:
+        """Row-tuple form of this result, see converters.compact_result"""
+        from .compact_result import CompactResult
+
+        return CompactResult.from_conversion_result(self)
+
 
 class BaseConverter(ABC):
     """Abstract base class for all converters"""
 
-    def __init__(self, match_data: sofaschema.FootballMatchResultDetailed):
+    # Bump when the rows produced change without a table layout change, so
+    # conversion caches stop returning the old rows
+    VERSION = 1
+
+    def __init__(
+        self,
+        match_data: sofaschema.FootballMatchResultDetailed,
+        reference_cache: Optional[ReferenceCache] = None,
+    ):
         self.match_data = match_data
+        # Shared across converters to reuse the sport/category/tournament chain
+        self.reference_cache = reference_cache
         self.entity_map = self._initialize_entity_map()
         self.normalized_entities = self._initialize_normalized_entities()
 
@@ -88,6 +111,15 @@ class BaseConverter(ABC):
         """Main conversion method"""
         pass
 
+    def convert_compact(self) -> CompactResult:
+        """
+        Convert and flatten to the compact row form.
+
+        The SQLModel object graph is dropped once flattened, use this when
+        holding many matches in memory before loading.
+        """
+        return self.convert().compact()
+
     def _collect_conversion_result(self) -> ConversionResult:
         """Collect all entities into result object"""
         return ConversionResult(
@@ -109,12 +141,106 @@ class BaseConverter(ABC):
         )
 
 
+# Changes a builder made to its copy of the entity map, see entity_map_changes:
+# ("set", value), ("merge", {key: change}), ("extend", items) or ("add", items)
+Change = Tuple[str, Any]
+
+
+def isolated_copy(value: Any) -> Any:
+    """Fresh copies of nested dicts, lists and sets - the entities are shared"""
+    if isinstance(value, dict):
+        return {key: isolated_copy(item) for key, item in value.items()}
+    if isinstance(value, list):
+        return [isolated_copy(item) for item in value]
+    if isinstance(value, set):
+        return set(value)
+    return value
+
+
+def _containers(value: Any) -> List[Any]:
+    found: List[Any] = []
+    if isinstance(value, (dict, list, set)):
+        found.append(value)
+        if isinstance(value, dict):
+            for item in value.values():
+                found.extend(_containers(item))
+        elif isinstance(value, list):
+            for item in value:
+                found.extend(_containers(item))
+    return found
+
+
+def _change(before: Any, after: Any, handed: Set[int]) -> Optional[Change]:
+    """How ``after`` differs from ``before``, None when unchanged"""
+    if id(after) not in handed:
+        # Replaced by the builder, or not a collection
+        return None if after is before else ("set", after)
+    if isinstance(after, dict):
+        if set(before) - set(after):
+            return ("set", after)
+        changes = {}
+        for key, item in after.items():
+            if key not in before:
+                changes[key] = ("set", item)
+            else:
+                change = _change(before[key], item, handed)
+                if change is not None:
+                    changes[key] = change
+        return ("merge", changes) if changes else None
+    if isinstance(after, list):
+        appended = len(after) >= len(before) and all(
+            a is b for a, b in zip(after, before)
+        )
+        if not appended:
+            return ("set", after)
+        return ("extend", after[len(before) :]) if len(after) > len(before) else None
+    if before <= after:
+        return ("add", after - before) if after - before else None
+    return ("set", after)
+
+
+def entity_map_changes(
+    before: Dict[str, Any], after: Dict[str, Any], handed: Set[int]
+) -> Dict[str, Change]:
+    """
+    Changes made to ``after``, an isolated_copy of ``before``.
+
+    ``handed`` holds the ids of the collections of ``after`` as handed to the
+    builder - collections still among them were changed in place and only
+    their additions are merged, others were replaced and are set whole.
+    """
+    change = _change(before, after, handed)
+    return change[1] if change is not None and change[0] == "merge" else {}
+
+
+def apply_changes(target: MutableMapping[str, Any], changes: Dict[str, Change]) -> None:
+    """Merge entity_map_changes into ``target``, key by key"""
+    for key, (kind, value) in changes.items():
+        if kind == "set":
+            target[key] = value
+            continue
+        # Additions to a collection replaced meanwhile start a new one
+        empty = {"merge": dict, "extend": list, "add": set}[kind]
+        current = target.get(key)
+        if not isinstance(current, empty):
+            current = target[key] = empty()
+        if kind == "merge":
+            apply_changes(current, value)
+        elif kind == "extend":
+            current.extend(value)
+        else:
+            current.update(value)
+
+
 class BaseComponentBuilder(ABC):
     """Abstract base class for component builders for converters"""
 
     def __init__(self, parent_converter: BaseConverter):
         self.parent: BaseConverter = parent_converter
-        self.entity_map: Dict[str, Any] = parent_converter.entity_map
+        self.entity_map: MutableMapping[str, Any] = parent_converter.entity_map
+        # Where built entities are collected - the converter's own collections,
+        # or a private set when run in isolation
+        self.normalized_entities: Dict[str, Any] = parent_converter.normalized_entities
         self.match_data: sofaschema.FootballMatchResultDetailed = (
             parent_converter.match_data
         )
@@ -128,3 +254,26 @@ class BaseComponentBuilder(ABC):
     def can_build(self) -> bool:
         """Check if this component can be built (data available)"""
         pass
+
+    def build_isolated(self) -> Tuple[Dict[str, Any], Dict[str, Change]]:
+        """
+        Build into private collections, leaving the converter untouched.
+
+        The builder gets its own copy of the entity map built so far (BASE),
+        nested collections included. Returns the built normalized entities and
+        the changes made to the entity map, for the converter to merge with
+        ``apply_changes``.
+        """
+        before = isolated_copy(self.parent.entity_map)
+        working = isolated_copy(before)
+        # Kept alive so their ids stay unique while the builder runs
+        collections = _containers(working)
+        self.entity_map = working
+        self.normalized_entities = self.parent._initialize_normalized_entities()
+        try:
+            self.build()
+            changes = entity_map_changes(before, working, {id(c) for c in collections})
+            return self.normalized_entities, changes
+        finally:
+            self.entity_map = self.parent.entity_map
+            self.normalized_entities = self.parent.normalized_entities
@@ -0,0 +1,264 @@
+# sqlsofa/converters/compact_result.py
+"""
+Memory-compact intermediate representation of converted matches.
+
+A ConversionResult holds full SQLModel instances, each with SQLAlchemy
+instance state and relationship collections. CompactResult keeps the same
+rows as plain tuples per table - roughly an order of magnitude smaller - and
+is what the loaders consume. ORM objects are only built on demand.
+"""
+
+import logging
+from functools import lru_cache
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+from sqlmodel import SQLModel
+
+from sqlsofa.schema.tables import SPECS_BY_TABLE
+
+from .base_converter import ConversionResult
+
+logger = logging.getLogger(__name__)
+
+
+class LocalRef(int):
+    """
+    Foreign key value pointing at a row of the same CompactResult.
+
+    Used for parents with surrogate ids, which are only known once the parent
+    is stored. The value is the row index in the parent table's buffer.
+    """
+
+    __slots__ = ()
+
+    def __repr__(self) -> str:
+        return f"LocalRef({int(self)})"
+
+
+@lru_cache(maxsize=None)
+def _layout(
+    table: str,
+) -> Tuple[Tuple[str, ...], Dict[str, str], Dict[str, Any], Dict[str, Callable]]:
+    """Columns, local-ref parents and column defaults for ``table``"""
+    spec = SPECS_BY_TABLE[table]
+    refs = {}
+    for _, foreign_key in spec.links:
+        fk = next(iter(spec.model.__table__.c[foreign_key].foreign_keys))
+        parent = fk.column.table.name
+        if not SPECS_BY_TABLE[parent].has_source_id:
+            refs[foreign_key] = parent
+
+    defaults, factories = {}, {}
+    for name in spec.columns:
+        field = spec.model.model_fields.get(name)
+        if field is None:
+            continue
+        if field.default_factory is not None:
+            factories[name] = field.default_factory
+        elif not field.is_required():
+            defaults[name] = field.default
+    return spec.columns, refs, defaults, factories
+
+
+class RowBuffer:
+    """Rows of a single table as tuples in ``columns`` order"""
+
+    __slots__ = ("table", "columns", "refs", "rows")
+
+    def __init__(self, table: str) -> None:
+        self.table = table
+        self.columns, refs, _, _ = _layout(table)
+        # fk column -> parent table, for columns that may hold a LocalRef
+        self.refs: Dict[str, str] = refs
+        self.rows: List[Tuple[Any, ...]] = []
+
+    def __len__(self) -> int:
+        return len(self.rows)
+
+    def append(self, values: Dict[str, Any]) -> LocalRef:
+        """Add a row, missing columns take the model defaults"""
+        _, _, defaults, factories = _layout(self.table)
+        row = []
+        for column in self.columns:
+            if column in values:
+                row.append(values[column])
+            elif column in factories:
+                row.append(factories[column]())
+            else:
+                row.append(defaults.get(column))
+        self.rows.append(tuple(row))
+        return LocalRef(len(self.rows) - 1)
+
+    def dicts(self) -> Iterator[Dict[str, Any]]:
+        for row in self.rows:
+            yield dict(zip(self.columns, row))
+
+
+class CompactResult:
+    """Converted match as row buffers per table"""
+
+    __slots__ = ("match_id", "tables", "processed_components")
+
+    def __init__(
+        self,
+        match_id: int = 0,
+        processed_components: Optional[Dict[str, bool]] = None,
+    ) -> None:
+        self.match_id = match_id
+        self.tables: Dict[str, RowBuffer] = {}
+        self.processed_components: Dict[str, bool] = processed_components or {}
+
+    def __repr__(self) -> str:
+        counts = {table: len(buffer) for table, buffer in self.tables.items()}
+        return f"CompactResult(match_id={self.match_id}, rows={counts})"
+
+    def buffer(self, table: str) -> RowBuffer:
+        if table not in self.tables:
+            self.tables[table] = RowBuffer(table)
+        return self.tables[table]
+
+    def add(self, table: str, values: Dict[str, Any]) -> LocalRef:
+        """Add a row to ``table``, returning a reference children can link to"""
+        return self.buffer(table).append(values)
+
+    @property
+    def row_count(self) -> int:
+        return sum(len(buffer) for buffer in self.tables.values())
+
+    def models(self, table: str) -> List[SQLModel]:
+        """
+        Build ORM objects for ``table`` on demand.
+
+        Foreign keys still pointing at unsaved parents (LocalRef) are left unset.
+        """
+        buffer = self.tables.get(table)
+        if buffer is None:
+            return []
+        model = SPECS_BY_TABLE[table].model
+        objs = []
+        for values in buffer.dicts():
+            for column in buffer.refs:
+                if isinstance(values[column], LocalRef):
+                    values[column] = None
+            objs.append(model(**values))
+        return objs
+
+    @classmethod
+    def from_conversion_result(cls, result: ConversionResult) -> "CompactResult":
+        """Flatten the SQLModel object graph of a ConversionResult into rows"""
+        compact = cls(
+            match_id=result.match_id,
+            processed_components=dict(result.processed_components),
+        )
+        seen: Dict[Tuple[str, Any], LocalRef] = {}
+
+        def add(obj: Any, **defaults: Any) -> Optional[LocalRef]:
+            """Add ``obj`` once, ``defaults`` fill columns the object left unset"""
+            if obj is None:
+                return None
+            spec = SPECS_BY_TABLE[obj.__tablename__]
+            if (spec.tablename, id(obj)) in seen:
+                return seen[(spec.tablename, id(obj))]
+
+            values = {column: getattr(obj, column) for column in spec.columns}
+            for column, value in defaults.items():
+                if values.get(column) is None:
+                    values[column] = value
+            for relationship, foreign_key in spec.links:
+                parent = getattr(obj, relationship, None)
+                if parent is None:
+                    continue
+                if SPECS_BY_TABLE[parent.__tablename__].has_source_id:
+                    values[foreign_key] = parent.id
+                else:
+                    values[foreign_key] = add(parent)
+
+            # Keyed rows are de-duplicated on their conflict columns so shared
+            # entities (countries, players, scores) are only kept once per match
+            key = tuple(values[column] for column in spec.conflict)
+            keyed = bool(key) and None not in key
+            if keyed and (spec.tablename, key) in seen:
+                ref = seen[(spec.tablename, key)]
+            else:
+                ref = compact.add(spec.tablename, values)
+                if keyed:
+                    seen[(spec.tablename, key)] = ref
+            seen[(spec.tablename, id(obj))] = ref
+            return ref
+
+        for collection in (
+            result.sports,
+            result.categories,
+            result.tournaments,
+            result.seasons,
+            result.countries,
+            result.team_colors,
+            result.venues,
+            result.teams,
+            result.events,
+        ):
+            for obj in collection:
+                add(obj)
+
+        for period in result.statistic_periods:
+            add(period)
+            for group in period.groups:
+                add(group)
+                for item in group.statistics_items:
+                    add(item)
+
+        for lineup in result.lineups:
+            add(lineup)
+            event_id = _event_id(lineup)
+            for team_lineup in lineup.lineups:
+                add(team_lineup)
+                for entry in team_lineup.players:
+                    player_id = entry.player.id if entry.player else entry.player_id
+                    if entry.player is not None:
+                        add(entry.player.country)
+                    add(entry.player)
+                    # Statistics are keyed by match and player
+                    add(entry.statistics, event_id=event_id, player_id=player_id)
+                    add(entry)
+
+        for incident, sequence in _incident_sequences(result.incidents):
+            add(incident, sequence=sequence)
+        for point in result.graph_points:
+            add(point)
+
+        return compact
+
+
+def _event_id(obj: Any) -> Optional[int]:
+    event = getattr(obj, "event", None)
+    return event.id if event is not None else obj.event_id
+
+
+def _incident_sequences(incidents: List[Any]) -> List[Tuple[Any, int]]:
+    """
+    Incidents with their key within the match and incident type.
+
+    Incidents with a sofascore id are keyed on it, so incidents removed after
+    a VAR review or scraped late do not move the others. Id-less incidents
+    (periods, injury time) fall back to their position among the match's
+    id-less incidents of the same type, in match-time order, counted down
+    from -1 so they never share a key with a (positive) sofascore id.
+    """
+
+    def match_time(incident: Any) -> Tuple[int, int, int]:
+        return (
+            incident.time or 0,
+            incident.addedTime or 0,
+            incident.timeSeconds or 0,
+        )
+
+    counters: Dict[Tuple[Optional[int], str], int] = {}
+    sequences = []
+    for incident in sorted(incidents, key=match_time):
+        if incident.source_id is not None:
+            sequences.append((incident, incident.source_id))
+            continue
+        group = (_event_id(incident), incident.incidentType)
+        counters[group] = counters.get(group, 0) - 1
+        sequences.append((incident, counters[group]))
+    return sequences
@@ -0,0 +1,235 @@
+# sqlsofa/converters/conversion_cache.py
+"""
+On-disk cache of converted matches.
+
+Entries are CompactResults serialised with msgpack, stored under a hash of
+the source payload, the converter and its VERSION, and the table layout.
+Re-running a load over unchanged payloads - after a loader fix, or into a
+fresh database - then skips conversion entirely. Schema changes alter the
+layout hash and converter fixes bump the converter's VERSION, so stale
+entries are never read back. The directory is bounded in size, least
+recently used entries are evicted first.
+"""
+
+import hashlib
+import json
+import logging
+import os
+import tempfile
+from collections import OrderedDict
+from datetime import datetime
+from enum import Enum
+from pathlib import Path
+from typing import Any, Callable, Dict, Optional, Sequence, Union
+
+import msgpack
+
+from sqlsofa.schema.tables import LOAD_ORDER
+
+from .compact_result import CompactResult, LocalRef, RowBuffer
+
+logger = logging.getLogger(__name__)
+
+# Bump when the serialised form changes
+FORMAT_VERSION = 1
+
+_LOCAL_REF = 1
+_DATETIME = 2
+
+
+def _default(obj: Any) -> Any:
+    if isinstance(obj, LocalRef):
+        return msgpack.ExtType(_LOCAL_REF, int(obj).to_bytes(8, "little"))
+    if isinstance(obj, tuple):
+        return list(obj)
+    if isinstance(obj, datetime):
+        return msgpack.ExtType(_DATETIME, obj.isoformat().encode())
+    if isinstance(obj, Enum):
+        return obj.value
+    raise TypeError(f"Can not serialise {type(obj).__name__} in a conversion cache")
+
+
+def _ext_hook(code: int, data: bytes) -> Any:
+    if code == _LOCAL_REF:
+        return LocalRef(int.from_bytes(data, "little"))
+    if code == _DATETIME:
+        return datetime.fromisoformat(data.decode())
+    return msgpack.ExtType(code, data)
+
+
+def dumps(result: CompactResult) -> bytes:
+    """msgpack bytes of ``result``"""
+    payload = {
+        "match_id": result.match_id,
+        "processed_components": result.processed_components,
+        "tables": {
+            table: [buffer.columns, buffer.rows]
+            for table, buffer in result.tables.items()
+        },
+    }
+    # strict types so LocalRef (an int) and row tuples reach _default
+    return msgpack.packb(payload, default=_default, strict_types=True)
+
+
+def loads(data: bytes) -> CompactResult:
+    """CompactResult from ``dumps`` output"""
+    payload = msgpack.unpackb(data, ext_hook=_ext_hook, strict_map_key=False)
+    result = CompactResult(payload["match_id"], payload["processed_components"])
+    for table, (columns, rows) in payload["tables"].items():
+        buffer = RowBuffer(table)
+        if tuple(columns) != buffer.columns:
+            raise ValueError(f"Cached columns of {table} do not match the schema")
+        buffer.rows = [tuple(row) for row in rows]
+        result.tables[table] = buffer
+    return result
+
+
+def layout_hash() -> str:
+    """Hash of the columns of every written table"""
+    layout = [(spec.tablename, spec.columns) for spec in LOAD_ORDER]
+    return hashlib.blake2b(repr(layout).encode(), digest_size=8).hexdigest()
+
+
+def payload_digest(payload: Any) -> bytes:
+    """Stable bytes of a source payload - pydantic json, or sorted json"""
+    if hasattr(payload, "model_dump_json"):
+        return payload.model_dump_json().encode()
+    return json.dumps(payload, sort_keys=True, default=repr).encode()
+
+
+class ConversionCache:
+    """
+    Converted matches on local disk, keyed by source payload.
+
+    ``max_bytes`` bounds the directory; the least recently used entries are
+    evicted when a new entry would exceed it. Safe to share between
+    processes - entries are written atomically - though each process keeps
+    its own recency order.
+    """
+
+    def __init__(
+        self,
+        directory: Union[str, Path],
+        max_bytes: int = 2 * 1024**3,
+        version: str = "",
+    ) -> None:
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.max_bytes = max_bytes
+        # Extra key material, e.g. a tag per deployment
+        self.version = f"{FORMAT_VERSION}:{layout_hash()}:{version}"
+        self.hits = 0
+        self.misses = 0
+        # key -> entry size, least recently used first
+        self._entries: "OrderedDict[str, int]" = OrderedDict()
+        for path in sorted(
+            self.directory.glob("*/*.msgpack"), key=lambda p: p.stat().st_mtime
+        ):
+            self._entries[path.stem] = path.stat().st_size
+        self.size = sum(self._entries.values())
+
+    def key(
+        self,
+        payload: Any,
+        converter_cls: Optional[Callable[..., Any]] = None,
+        components: Optional[Sequence[str]] = None,
+    ) -> str:
+        """Content address of converting ``payload`` with ``converter_cls``"""
+        digest = hashlib.blake2b(digest_size=20)
+        digest.update(self.version.encode())
+        if converter_cls is not None:
+            name = (
+                f"{converter_cls.__module__}.{converter_cls.__qualname__}"
+                f":{getattr(converter_cls, 'VERSION', '')}"
+            )
+            digest.update(name.encode())
+        digest.update(repr(None if components is None else sorted(components)).encode())
+        digest.update(payload_digest(payload))
+        return digest.hexdigest()
+
+    def _path(self, key: str) -> Path:
+        return self.directory / key[:2] / f"{key}.msgpack"
+
+    def get(self, key: str) -> Optional[CompactResult]:
+        path = self._path(key)
+        try:
+            result = loads(path.read_bytes())
+        except FileNotFoundError:
+            # Possibly evicted by another process
+            if key in self._entries:
+                self._remove(key)
+            self.misses += 1
+            return None
+        except Exception as e:
+            logger.warning(f"Dropping unreadable conversion cache entry {key}: {e}")
+            self._remove(key)
+            self.misses += 1
+            return None
+        self.hits += 1
+        os.utime(path)
+        self._entries[key] = self._entries.pop(key, path.stat().st_size)
+        return result
+
+    def put(self, key: str, result: CompactResult) -> None:
+        data = dumps(result)
+        if len(data) > self.max_bytes:
+            logger.debug(f"Match {result.match_id} is too large for the cache")
+            return
+        path = self._path(key)
+        path.parent.mkdir(exist_ok=True)
+        # Write then rename, readers never see a partial entry
+        fd, tmp = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+        os.replace(tmp, path)
+
+        self.size += len(data) - self._entries.pop(key, 0)
+        self._entries[key] = len(data)
+        self._evict()
+
+    def _remove(self, key: str) -> None:
+        self._path(key).unlink(missing_ok=True)
+        self.size -= self._entries.pop(key, 0)
+
+    def _evict(self) -> None:
+        while self.size > self.max_bytes and self._entries:
+            self._remove(next(iter(self._entries)))
+
+    def convert(
+        self,
+        payload: Any,
+        converter_cls: Optional[Callable[..., Any]] = None,
+        components: Optional[Sequence[str]] = None,
+        **kwargs: Any,
+    ) -> CompactResult:
+        """
+        Cached ``converter_cls(payload, **kwargs).convert(components)``, compacted.
+
+        Matches with failed components are not cached, so a retry converts
+        them again.
+        """
+        if converter_cls is None:
+            from .football_match_converter import FootballMatchConverter
+
+            converter_cls = FootballMatchConverter
+        key = self.key(payload, converter_cls, components)
+        cached = self.get(key)
+        if cached is not None:
+            return cached
+
+        converter = converter_cls(payload, **kwargs)
+        if components is None:
+            result = converter.convert().compact()
+        else:
+            result = converter.convert(components=components).compact()
+        if not getattr(converter, "failures", None):
+            self.put(key, result)
+        return result
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "entries": len(self._entries),
+            "bytes": self.size,
+        }
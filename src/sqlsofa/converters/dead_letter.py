@@ -0,0 +1,242 @@
+# sqlsofa/converters/dead_letter.py
+"""
+Dead-letter queues for match components that failed to convert.
+
+The converter keeps going when a component builder fails, so the rest of the
+match is still loaded. The failed component is recorded here with its
+payload and traceback, and ``retry_dead_letters`` later re-converts only the
+dead-lettered components.
+"""
+
+import json
+import logging
+import traceback
+from abc import ABC, abstractmethod
+from dataclasses import asdict, dataclass, field
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Union
+
+from sqlalchemy import select
+from sqlalchemy.engine import Engine
+from sqlmodel import Session
+
+from sqlsofa.conf.database import open_session
+from sqlsofa.schema import sqlmodels as sqlschema
+
+logger = logging.getLogger(__name__)
+
+
+def payload_json(payload: Any) -> Optional[str]:
+    """Best-effort json of a component payload, None if it can not be dumped"""
+    if payload is None:
+        return None
+    try:
+        if hasattr(payload, "model_dump_json"):
+            return payload.model_dump_json()
+        return json.dumps(payload, default=str)
+    except Exception as e:
+        logger.warning(f"Could not serialise component payload: {e}")
+        return None
+
+
+@dataclass
+class ComponentFailure:
+    """A component of a match that failed to convert"""
+
+    match_id: int
+    component: str
+    error_message: str
+    traceback: Optional[str] = None
+    payload: Optional[str] = None
+    retries: int = 0
+    attempted_at: datetime = field(default_factory=datetime.now)
+
+    @classmethod
+    def from_exception(
+        cls, match_id: int, component: str, error: BaseException, payload: Any = None
+    ) -> "ComponentFailure":
+        return cls(
+            match_id=match_id,
+            component=component,
+            error_message=f"{type(error).__name__}: {error}",
+            traceback="".join(
+                traceback.format_exception(type(error), error, error.__traceback__)
+            ),
+            payload=payload_json(payload),
+        )
+
+
+class DeadLetterQueue(ABC):
+    """Storage for failed components, one entry per (match, component)"""
+
+    @abstractmethod
+    def put(self, failure: ComponentFailure) -> None:
+        """Record a failure, bumping the retry count of an existing entry"""
+        pass
+
+    @abstractmethod
+    def pending(self, limit: Optional[int] = None) -> List[ComponentFailure]:
+        """Failures still waiting for a successful retry, oldest first"""
+        pass
+
+    @abstractmethod
+    def resolve(self, failure: ComponentFailure) -> None:
+        """Mark a failure as fixed"""
+        pass
+
+
+class DatabaseDeadLetterQueue(DeadLetterQueue):
+    """Dead letters as ``ComponentError`` rows"""
+
+    def __init__(self, engine: Engine) -> None:
+        self.engine = engine
+
+    def _find(
+        self, session: Session, failure: ComponentFailure
+    ) -> Optional[sqlschema.ComponentError]:
+        stmt = select(sqlschema.ComponentError).where(
+            sqlschema.ComponentError.match_id == failure.match_id,
+            sqlschema.ComponentError.component == failure.component,
+            sqlschema.ComponentError.status == sqlschema.ComponentStatusEnum.FAILED,
+        )
+        return session.execute(stmt).scalars().first()
+
+    def put(self, failure: ComponentFailure) -> None:
+        with open_session(self.engine) as session:
+            row = self._find(session, failure)
+            if row is None:
+                row = sqlschema.ComponentError(
+                    component=failure.component,
+                    status=sqlschema.ComponentStatusEnum.FAILED,
+                    match_id=failure.match_id,
+                )
+            else:
+                row.retries += 1
+            row.error_message = failure.error_message
+            row.traceback = failure.traceback
+            row.payload = failure.payload or row.payload
+            row.attempted_at = failure.attempted_at
+            session.add(row)
+            session.commit()
+
+    def pending(self, limit: Optional[int] = None) -> List[ComponentFailure]:
+        stmt = (
+            select(sqlschema.ComponentError)
+            .where(
+                sqlschema.ComponentError.status == sqlschema.ComponentStatusEnum.FAILED,
+                sqlschema.ComponentError.match_id.is_not(None),
+            )
+            .order_by(sqlschema.ComponentError.id)
+            .limit(limit)
+        )
+        with open_session(self.engine) as session:
+            return [
+                ComponentFailure(
+                    match_id=row.match_id,
+                    component=row.component,
+                    error_message=row.error_message or "",
+                    traceback=row.traceback,
+                    payload=row.payload,
+                    retries=row.retries,
+                    attempted_at=row.attempted_at or row.created_at,
+                )
+                for row in session.execute(stmt).scalars()
+            ]
+
+    def resolve(self, failure: ComponentFailure) -> None:
+        with open_session(self.engine) as session:
+            row = self._find(session, failure)
+            if row is None:
+                return
+            row.status = sqlschema.ComponentStatusEnum.SUCCESS
+            row.attempted_at = datetime.now()
+            session.add(row)
+            session.commit()
+
+
+class FileDeadLetterQueue(DeadLetterQueue):
+    """Dead letters as json files, one per (match, component)"""
+
+    def __init__(self, directory: Union[str, Path]) -> None:
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+
+    def _path(self, failure: ComponentFailure) -> Path:
+        return self.directory / f"{failure.match_id}_{failure.component}.json"
+
+    @staticmethod
+    def _read(path: Path) -> ComponentFailure:
+        data = json.loads(path.read_text())
+        data["attempted_at"] = datetime.fromisoformat(data["attempted_at"])
+        return ComponentFailure(**data)
+
+    def put(self, failure: ComponentFailure) -> None:
+        path = self._path(failure)
+        if path.exists():
+            previous = self._read(path)
+            failure.retries = previous.retries + 1
+            failure.payload = failure.payload or previous.payload
+        path.write_text(json.dumps(asdict(failure), default=str))
+
+    def pending(self, limit: Optional[int] = None) -> List[ComponentFailure]:
+        failures = sorted(
+            (self._read(path) for path in self.directory.glob("*.json")),
+            key=lambda f: f.attempted_at,
+        )
+        return failures[:limit] if limit is not None else failures
+
+    def resolve(self, failure: ComponentFailure) -> None:
+        self._path(failure).unlink(missing_ok=True)
+
+
+def retry_dead_letters(
+    queue: DeadLetterQueue,
+    fetch_match: Callable[[int], Any],
+    loader: Any,
+    converter_cls: Optional[Callable[..., Any]] = None,
+    limit: Optional[int] = None,
+) -> Dict[str, int]:
+    """
+    Re-convert and load only the dead-lettered components.
+
+    ``fetch_match`` returns the match data for a match id (from the scrape
+    archive or a fresh scrape). BASE is always rebuilt so the components can
+    link to the event; its rows are keyed, so reloading them is an upsert.
+    Returns the number of resolved and still failing components.
+    """
+    if converter_cls is None:
+        from .football_match_converter import FootballMatchConverter
+
+        converter_cls = FootballMatchConverter
+
+    by_match: Dict[int, List[ComponentFailure]] = {}
+    for failure in queue.pending(limit):
+        by_match.setdefault(failure.match_id, []).append(failure)
+
+    counts = {"resolved": 0, "failed": 0}
+    for match_id, failures in by_match.items():
+        components = [f.component for f in failures]
+        try:
+            converter = converter_cls(fetch_match(match_id), dead_letters=queue)
+            result = converter.convert(components=components)
+        except Exception as e:
+            logger.error(f"Retry of match {match_id} failed: {e}")
+            for failure in failures:
+                queue.put(
+                    ComponentFailure.from_exception(match_id, failure.component, e)
+                )
+            counts["failed"] += len(failures)
+            continue
+
+        loader.load(result)
+        for failure in failures:
+            # Failures during the retry were put back on the queue by the converter
+            if result.processed_components.get(failure.component):
+                queue.resolve(failure)
+                counts["resolved"] += 1
+            else:
+                counts["failed"] += 1
+
+    logger.info(f"Dead-letter retry: {counts}")
+    return counts
@@ -1,15 +1,17 @@
 # sqlsofa/converter/football_detials_converter.py
-import logging
-import pprint
-from typing import Any, Dict, Literal, Optional
+from __future__ import annotations
 
-from sofascrape.schemas import general as sofaschema
+import logging
+from typing import TYPE_CHECKING, Any, Dict, Literal, Optional
 
 from sqlsofa.schema import sqlmodels as sqlschema
 from sqlsofa.utils import converters  # Your existing converter functions!
 
 from .base_converter import BaseComponentBuilder, ConversionResult
 
+if TYPE_CHECKING:
+    from sofascrape.schemas import general as sofaschema
+
 logger = logging.getLogger(__name__)
 
 
@@ -22,14 +24,16 @@ class DetailsComponentBuilder(BaseComponentBuilder):
 
     def process_tournament(self, event_data: sofaschema.FootballDetailsSchema) -> None:
         tournament_result: converters.TournamentResult = converters.tournament(
-            event_data.tournament
+            event_data.tournament, self.parent.reference_cache
         )
         self._store_entity("sport", tournament_result["sport"])
         self._store_entity("category", tournament_result["category"])
         self._store_entity("tournament", tournament_result["tournament"])
 
     def process_season(self, event_data: sofaschema.FootballDetailsSchema) -> None:
-        season_obj: converters.SeasonResult = converters.season(event_data.season)
+        season_obj: converters.SeasonResult = converters.season(
+            event_data.season, self.parent.reference_cache
+        )
         self._store_entity("season", season_obj)
 
     def process_team(
@@ -37,22 +41,10 @@ class DetailsComponentBuilder(BaseComponentBuilder):
         team_schema: sofaschema.FootballTeamSchema,
         home_away: Literal["home", "away"],
     ) -> None:
-
-        # TODO
-        sport_obj = sqlschema.Sport(**team_schema.sport.to_sql_dict())
         country_obj = converters.country(team_schema.country)
         team_colors_obj = converters.team_colors(team_schema.teamColors)
 
-        print("+" * 50)
-        manager_obj = sqlschema.Manager(**team_schema.manager.to_sql_dict())
-        pprint.pprint(manager_obj, indent=8, width=100)
-        print("+" * 50)
-        print("." * 50)
         team_data = team_schema.to_sql_dict()
-        print(team_schema.model_dump_json(indent=8))
-        print("-" * 50)
-        pprint.pprint(team_data, indent=8, width=100)
-        print("." * 50)
         team_obj = sqlschema.Team(**team_data)
         self._store_entity(f"{home_away}_team", team_obj)
         self._store_entity(f"{home_away}_team_colors", team_colors_obj)
@@ -127,9 +119,9 @@ class DetailsComponentBuilder(BaseComponentBuilder):
 
         # Also add to normalized collections
         if isinstance(entity, sqlschema.Sport):
-            self.parent.normalized_entities["sports"].add(entity)
+            self.normalized_entities["sports"].add(entity)
         elif isinstance(entity, sqlschema.Team):
-            self.parent.normalized_entities["teams"].add(entity)
+            self.normalized_entities["teams"].add(entity)
         # ... etc for other types
 
     def _add_to_collection(self, key: str, entity: Any) -> None:
@@ -140,4 +132,4 @@ class DetailsComponentBuilder(BaseComponentBuilder):
         # Use appropriate key for the entity
         if isinstance(entity, sqlschema.Country):
             self.entity_map[key][entity.alpha3] = entity
-            self.parent.normalized_entities["countries"].add(entity)
+            self.normalized_entities["countries"].add(entity)
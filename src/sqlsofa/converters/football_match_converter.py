@@ -1,13 +1,25 @@
 # sqlsofa/converters/football_match_converter.py
+from __future__ import annotations
 
 import logging
-from typing import Any, Dict, Optional
+from concurrent.futures import ThreadPoolExecutor
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, Sequence
 
-from sofascrape.schemas import general as sofaschema
+from sqlsofa.utils.memory import tracked
+from sqlsofa.utils.profiling import profiled
 
-from .base_converter import BaseConverter, ConversionResult
+from .base_converter import BaseConverter, Change, ConversionResult, apply_changes
+from .dead_letter import ComponentFailure
 from .football_detials_converter import DetailsComponentBuilder
 
+if TYPE_CHECKING:
+    from sofascrape.schemas import general as sofaschema
+
+    from sqlsofa.utils.json_input import JsonData
+    from sqlsofa.utils.reference_cache import ReferenceCache
+
+    from .dead_letter import DeadLetterQueue
+
 # from .football_stats_converter import StatsComponentBuilder
 # from .football_lineup_converter import LineupComponentBuilder
 # from .football_incidents_converter import IncidentsComponentBuilder
@@ -15,17 +27,139 @@ from .football_detials_converter import DetailsComponentBuilder
 
 logger = logging.getLogger(__name__)
 
+# Components built after BASE - independent of each other
+COMPONENTS = ["stats", "lineup", "incidents", "graph"]
+# Components that change during play, see convert_live
+LIVE_COMPONENTS = ["incidents", "graph"]
+
 
 class FootballMatchConverter(BaseConverter):
     """Main converter for football match data"""
 
-    def __init__(self, match_data: sofaschema.FootballMatchResultDetailed):
+    # Includes the component builders, see BaseConverter.VERSION
+    VERSION = 1
+
+    def __init__(
+        self,
+        match_data: sofaschema.FootballMatchResultDetailed,
+        reference_cache: Optional[ReferenceCache] = None,
+        executor: Optional[ThreadPoolExecutor] = None,
+        dead_letters: Optional[DeadLetterQueue] = None,
+    ):
         # Initialize parent which sets up entity_map and normalized_entities
-        super().__init__(match_data)
+        super().__init__(match_data, reference_cache)
+        # Runs the components after BASE concurrently when set. Threads only:
+        # builders share entity objects and the reference cache with the
+        # converter, which copies in another process would not
+        if executor is not None and not isinstance(executor, ThreadPoolExecutor):
+            raise ValueError(
+                f"Component builders need a ThreadPoolExecutor, got "
+                f"{type(executor).__name__}"
+            )
+        self.executor = executor
+        # Failed components are recorded here, the rest of the match still converts
+        self.dead_letters = dead_letters
+        self.failures: Dict[str, ComponentFailure] = {}
 
         # Initialize all component builders
         self.builders = self._initialize_builders()
 
+    @classmethod
+    def from_json(cls, data: JsonData, **kwargs: Any) -> FootballMatchConverter:
+        """
+        Converter for a raw JSON match payload.
+
+        The payload is validated straight into FootballMatchResultDetailed
+        with ``model_validate_json``, without building an intermediate dict.
+        """
+        import sofascrape.schemas.general as sofaschema  # type: ignore
+
+        from sqlsofa.utils.json_input import validate_json
+
+        match_data = validate_json(sofaschema.FootballMatchResultDetailed, data)
+        return cls(match_data, **kwargs)
+
+    def _ready_components(self, components: Sequence[str]) -> List[str]:
+        ready = []
+        for component_name in COMPONENTS:
+            if component_name not in components or component_name not in self.builders:
+                continue
+            if self.builders[component_name].can_build():
+                ready.append(component_name)
+            else:
+                logger.info(f"Skipping {component_name} - no data available")
+        return ready
+
+    def _build_components(self, components: Sequence[str]) -> None:
+        """
+        Run the component builders one after another.
+
+        Builders run isolated so a failing component leaves nothing half-built.
+        """
+        for component_name in self._ready_components(components):
+            logger.info(f"Processing {component_name.upper()} component")
+            try:
+                built, entity_updates = self.builders[component_name].build_isolated()
+            except Exception as e:
+                self._record_failure(component_name, e)
+                continue
+            self._merge_component(built, entity_updates)
+            self.entity_map["processed_components"][component_name] = True
+
+    def _build_components_parallel(self, components: Sequence[str]) -> None:
+        """
+        Run the component builders concurrently on ``self.executor``.
+
+        Each builder works on private copies of the collections; they are
+        merged in COMPONENTS order once all have finished, so the result does
+        not depend on scheduling and no builder reads a half-merged map.
+        """
+        futures = {
+            component_name: self.executor.submit(
+                self.builders[component_name].build_isolated
+            )
+            for component_name in self._ready_components(components)
+        }
+        outcomes = {}
+        for component_name, future in futures.items():
+            try:
+                outcomes[component_name] = future.result()
+            except Exception as e:
+                outcomes[component_name] = e
+        for component_name, outcome in outcomes.items():
+            if isinstance(outcome, Exception):
+                self._record_failure(component_name, outcome)
+                continue
+            built, entity_updates = outcome
+            self._merge_component(built, entity_updates)
+            self.entity_map["processed_components"][component_name] = True
+
+    def _record_failure(self, component_name: str, error: Exception) -> None:
+        logger.error(f"Failed to process {component_name}: {str(error)}")
+        failure = ComponentFailure.from_exception(
+            match_id=self.match_data.match_id,
+            component=component_name,
+            error=error,
+            payload=getattr(self.match_data, component_name, None),
+        )
+        self.failures[component_name] = failure
+        if self.dead_letters is None:
+            return
+        try:
+            self.dead_letters.put(failure)
+        except Exception as e:
+            logger.error(f"Could not dead-letter {component_name}: {str(e)}")
+
+    def _merge_component(
+        self, built: Dict[str, Any], entity_updates: Dict[str, Change]
+    ) -> None:
+        apply_changes(self.entity_map, entity_updates)
+        for key, entities in built.items():
+            if isinstance(entities, set):
+                self.normalized_entities[key].update(entities)
+            else:
+                self.normalized_entities[key].extend(entities)
+
     def _initialize_entity_map(self) -> Dict[str, Any]:
         """Initialize the entity map with football-specific structure"""
         return {
@@ -82,9 +216,14 @@ class FootballMatchConverter(BaseConverter):
             # 'graph': GraphComponentBuilder(self),
         }
 
-    def convert(self) -> ConversionResult:
+    @tracked("convert")
+    @profiled("convert")
+    def convert(self, components: Optional[Sequence[str]] = None) -> ConversionResult:
         """
         Main conversion method - orchestrates all component builders
+
+        ``components`` limits the builders run after BASE, e.g. to retry only
+        dead-lettered components.
         """
         logger.info(f"Starting conversion for match {self.match_data.match_id}")
 
@@ -98,18 +237,11 @@ class FootballMatchConverter(BaseConverter):
             raise ValueError("BASE component is required for conversion")
 
         # 2. Process other components (they depend on BASE entities)
-        for component_name in ["stats", "lineup", "incidents", "graph"]:
-            if component_name in self.builders:
-                builder = self.builders[component_name]
-                if builder.can_build():
-                    logger.info(f"Processing {component_name.upper()} component")
-                    try:
-                        builder.build()
-                        self.entity_map["processed_components"][component_name] = True
-                    except Exception as e:
-                        logger.error(f"Failed to process {component_name}: {str(e)}")
-                else:
-                    logger.info(f"Skipping {component_name} - no data available")
+        components = COMPONENTS if components is None else components
+        if self.executor is None:
+            self._build_components(components)
+        else:
+            self._build_components_parallel(components)
 
         # 3. Collect and return results
         result = self._collect_conversion_result()
@@ -119,3 +251,14 @@ class FootballMatchConverter(BaseConverter):
         )
 
         return result
+
+    def convert_live(self) -> ConversionResult:
+        """
+        Convert an in-play refresh - BASE and the LIVE_COMPONENTS only.
+
+        Lineups and statistics are skipped, the result is meant for
+        loaders.LiveLoader which only writes the rows that move during play.
+        """
+        result = self.convert(LIVE_COMPONENTS)
+        result.processed_components["live"] = True
+        return result
@@ -0,0 +1,187 @@
+# sqlsofa/converters/raw_rows.py
+"""
+Raw-dict fast path from scraped JSON to table rows.
+
+The regular route - raw JSON, sofascrape pydantic schemas, ``to_sql_dict``,
+SQLModel objects, CompactResult - builds three object trees per payload.
+For backfills of payloads that were validated when they were scraped, the
+mappings here read the raw dicts and write CompactResult rows directly.
+
+Each table is described declaratively by a RowMapping: its columns read the
+raw key of the same name unless a path says otherwise. Foreign keys to
+surrogate-id rows (countries, statuses, scores) are LocalRefs as usual, so
+the output goes to any loader unchanged. Parity with the pydantic path is
+covered by tests/test_converter/test_raw_rows.py.
+"""
+
+import json
+import logging
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple, Union
+
+from sqlsofa.schema.tables import SPECS_BY_TABLE
+
+from .compact_result import CompactResult, LocalRef, _layout
+
+logger = logging.getLogger(__name__)
+
+Path = Tuple[str, ...]
+RawEvents = Union[bytes, str, Dict[str, Any], List[Dict[str, Any]]]
+
+_MISSING = object()
+
+
+def lookup(raw: Optional[Dict[str, Any]], path: Path) -> Any:
+    """Value at ``path`` in nested dicts, _MISSING when a key is absent"""
+    value: Any = raw
+    for key in path:
+        if not isinstance(value, dict) or key not in value:
+            return _MISSING
+        value = value[key]
+    return value
+
+
+@dataclass(frozen=True)
+class RowMapping:
+    """Where the columns of ``table`` come from in a raw payload object"""
+
+    table: str
+    # column -> key path, for columns not read from the key of the same name
+    paths: Dict[str, Path] = field(default_factory=dict)
+    # Columns never read from the payload - set by the converter, or left to
+    # the model default
+    skip: Tuple[str, ...] = ()
+
+    def __post_init__(self) -> None:
+        spec = SPECS_BY_TABLE[self.table]
+        foreign_keys = {
+            c.name for c in spec.model.__table__.columns if c.foreign_keys
+        } - set(self.paths)
+        skipped = {"created_at", *self.skip, *foreign_keys}
+        if not spec.has_source_id:
+            skipped.add("id")
+        columns = tuple(c for c in spec.columns if c not in skipped)
+        object.__setattr__(
+            self,
+            "_plan",
+            tuple((c, self.paths.get(c, (c,))) for c in columns),
+        )
+
+    def row(self, raw: Dict[str, Any], **values: Any) -> Dict[str, Any]:
+        """Column values of ``raw``, absent keys fall back to the model default"""
+        row = {}
+        for column, path in self._plan:  # type: ignore[attr-defined]
+            value = lookup(raw, path)
+            if value is not _MISSING:
+                row[column] = value
+        row.update(values)
+        return row
+
+
+SPORT = RowMapping("sports")
+CATEGORY = RowMapping("categories", {"sport_id": ("sport", "id")})
+TOURNAMENT = RowMapping("tournaments", {"category_id": ("category", "id")})
+SEASON = RowMapping("seasons")
+COUNTRY = RowMapping("countries")
+TEAM = RowMapping("teams", {"class_": ("class",)})
+STATUS = RowMapping("statuses")
+SCORE = RowMapping("scores")
+EVENT = RowMapping(
+    "events",
+    {
+        "tournament_id": ("tournament", "id"),
+        "season_id": ("season", "id"),
+        "home_team_id": ("homeTeam", "id"),
+        "away_team_id": ("awayTeam", "id"),
+    },
+)
+
+
+def _conflict_key(table: str, row: Dict[str, Any]) -> Tuple[Any, ...]:
+    """Conflict columns of ``row``, absent ones at their model default"""
+    _, _, defaults, _ = _layout(table)
+    return tuple(
+        row[column] if column in row else defaults.get(column)
+        for column in SPECS_BY_TABLE[table].conflict
+    )
+
+
+class RawEventsConverter:
+    """
+    Events lists as raw dicts straight to CompactResults, one per event.
+
+    The counterpart of EventsComponentConverter for backfills - no pydantic
+    validation and no SQLModel objects. ``results`` maps event id to its
+    CompactResult, ready for ``loader.load_batch``.
+    """
+
+    # See BaseConverter.VERSION
+    VERSION = 1
+
+    def __init__(self) -> None:
+        self.results: Dict[int, CompactResult] = {}
+
+    def convert(self, data: RawEvents) -> None:
+        """Convert an events list - JSON, ``{"events": [...]}`` or a list"""
+        if isinstance(data, (bytes, str)):
+            data = json.loads(data)
+        events = data["events"] if isinstance(data, dict) else data
+        self._convert_events(events)
+
+    def convert_json_lines(self, lines: Iterable[Union[bytes, str]]) -> None:
+        """Convert a JSON-lines stream, one event per line"""
+        self._convert_events(json.loads(line) for line in lines if line.strip())
+
+    def _convert_events(self, events: Iterable[Dict[str, Any]]) -> None:
+        self.results = {}
+        for event in events:
+            result = self.convert_event(event)
+            self.results[result.match_id] = result
+        logger.info(f"Converted {len(self.results)} raw events")
+
+    def convert_event(self, event: Dict[str, Any]) -> CompactResult:
+        """A single raw event with its tournament chain, teams, status and scores"""
+        compact = CompactResult(
+            match_id=event["id"], processed_components={"events_list": True}
+        )
+        seen: Dict[Tuple[str, Any], LocalRef] = {}
+
+        def add(mapping: RowMapping, raw: Dict[str, Any], **values: Any) -> LocalRef:
+            # Shared rows are kept once per match on their conflict columns,
+            # as CompactResult.from_conversion_result does
+            row = mapping.row(raw, **values)
+            key = (mapping.table, _conflict_key(mapping.table, row))
+            if None in key[1]:
+                return compact.add(mapping.table, row)
+            if key not in seen:
+                seen[key] = compact.add(mapping.table, row)
+            return seen[key]
+
+        tournament = event["tournament"]
+        sport = tournament["category"]["sport"]
+        add(SPORT, sport)
+        add(CATEGORY, tournament["category"])
+        add(TOURNAMENT, tournament)
+        add(SEASON, event["season"])
+        for side in ("homeTeam", "awayTeam"):
+            team = event[side]
+            country = team.get("country")
+            country_ref = None
+            if country and country.get("slug"):
+                country_ref = add(COUNTRY, country)
+            add(TEAM, team, sport_id=sport["id"], country_id=country_ref)
+
+        links: Dict[str, Any] = {}
+        if event.get("status"):
+            links["status_id"] = add(STATUS, event["status"])
+        for side, column in (
+            ("homeScore", "home_score_id"),
+            ("awayScore", "away_score_id"),
+        ):
+            if event.get(side):
+                links[column] = add(SCORE, event[side])
+        add(EVENT, event, **links)
+        return compact
+
+    def __iter__(self) -> Iterator[CompactResult]:
+        return iter(self.results.values())
@@ -1,5 +1,13 @@
-from .eventConveter import EventFootballComponentConverter
+from typing import TYPE_CHECKING
 
-__all__ = [
-    "EventFootballComponentConverter",
-]
+from sqlsofa.utils.lazy import attach
+
+if TYPE_CHECKING:
+    from .eventConveter import EventFootballComponentConverter
+
+__getattr__, __dir__, __all__ = attach(
+    __name__,
+    {
+        "EventFootballComponentConverter": ".eventConveter",
+    },
+)
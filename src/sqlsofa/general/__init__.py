@@ -1,9 +1,17 @@
-from .eventsConverter import EventsComponentConverter
-from .seasonsConverter import SeasonsComponentConverter
-from .tournamentConvert import TournamentComponentConverter
+from typing import TYPE_CHECKING
 
-__all__ = [
-    "TournamentComponentConverter",
-    "SeasonsComponentConverter",
-    "EventsComponentConverter",
-]
+from sqlsofa.utils.lazy import attach
+
+if TYPE_CHECKING:
+    from .eventsConverter import EventsComponentConverter
+    from .seasonsConverter import SeasonsComponentConverter
+    from .tournamentConvert import TournamentComponentConverter
+
+__getattr__, __dir__, __all__ = attach(
+    __name__,
+    {
+        "TournamentComponentConverter": ".tournamentConvert",
+        "SeasonsComponentConverter": ".seasonsConverter",
+        "EventsComponentConverter": ".eventsConverter",
+    },
+)
@@ -1,11 +1,15 @@
 import json
 import logging
-from typing import List
+from typing import Any, Dict, Iterable, List, Optional
 
 import sofascrape.schemas.general as sofaschema  # type: ignore
 
 import sqlsofa.schema.sqlmodels as sqlschema
 from sqlsofa.abstract import BaseComponenetConverter
+from sqlsofa.converters.base_converter import ConversionResult
+from sqlsofa.utils import converters
+from sqlsofa.utils.json_input import JsonLines, iter_json_lines
+from sqlsofa.utils.reference_cache import ReferenceCache
 
 logger = logging.getLogger(__name__)
 
@@ -14,43 +18,97 @@ class EventsComponentConverter(BaseComponenetConverter):
     """
     Class for processing the list of events for a given seasion.
 
+    Each event is converted together with its embedded tournament chain,
+    season, teams, status and scores in a single pass. Shared entities are
+    built once and reused across the events of the list.
+
     sofaschema.EventsListSchema
     sofaschema.EventSchema
     """
 
-    def __init__(self) -> None:
-        super().__init__()
-
-    def _convert_sport(self, sport: sofaschema.SportSchema) -> sqlschema.Sport:
-        """One-liner conversion for simple models."""
-        return sqlschema.Sport(**sport.to_sql_dict())
-
-    def _convert_country(self, country: sofaschema.CountrySchema) -> sqlschema.Country:
-        """One-liner conversion for simple models."""
-        return sqlschema.Country(**country.to_sql_dict())
-
-    def _convert_category(
-        self, category: sofaschema.CategorySchema
-    ) -> sqlschema.Category:
-        """One-liner conversion - foreign keys handled automatically."""
-        return sqlschema.Category(**category.to_sql_dict())
-
-    def _convert_tournament(
-        self, tournament: sofaschema.TournamentSchema
-    ) -> sqlschema.Tournament:
-        """One-liner conversion - foreign keys handled automatically."""
-        return sqlschema.Tournament(**tournament.to_sql_dict())
-
-    def _convert_season(self, season: sofaschema.SeasonSchema) -> sqlschema.Season:
-        """One-liner conversion for simple models."""
-        return sqlschema.Season(**season.to_sql_dict())
+    schema = sofaschema.EventsListSchema
+    # One event per line of a JSON-lines stream
+    event_schema = sofaschema.EventSchema
 
-    def _convert_event(self, event: sofaschema.EventSchema) -> sqlschema.Event:
-        """One-liner conversion - all complexity handled in Pydantic model."""
-        return sqlschema.Event(**event.to_sql_dict())
-
-    def process_event(self, event: sofaschema.EventSchema):
-        event = self._convert_event(event)
+    def __init__(self, reference_cache: Optional[ReferenceCache] = None) -> None:
+        super().__init__()
+        self.reference_cache = reference_cache
+        # (table, key) -> object built during this pass
+        self._shared: Dict[Any, Any] = {}
+        # event id -> result holding the event and its reference entities
+        self.results: Dict[int, ConversionResult] = {}
+
+    def _shared_entity(self, table: str, key: Any, build) -> Any:
+        """Build an entity once per pass, reusing it for later events"""
+        if key is None:
+            return build()
+        if (table, key) not in self._shared:
+            self._shared[(table, key)] = build()
+        return self._shared[(table, key)]
+
+    def _convert_status(self, status: sofaschema.StatusSchema) -> sqlschema.Status:
+        return self._shared_entity(
+            "statuses", status.code, lambda: converters.status(status)
+        )
+
+    def _convert_team(
+        self, team: sofaschema.TeamSchema, sport: sqlschema.Sport
+    ) -> sqlschema.Team:
+        def build() -> sqlschema.Team:
+            team_obj = sqlschema.Team(**team.to_sql_dict())
+            team_obj.sport_id = sport.id
+            country = getattr(team, "country", None)
+            if country is not None and getattr(country, "slug", None):
+                team_obj.country = self._shared_entity(
+                    "countries", country.slug, lambda: converters.country(country)
+                )
+            return team_obj
+
+        return self._shared_entity("teams", team.id, build)
+
+    def _convert_event(self, event: sofaschema.EventSchema) -> ConversionResult:
+        """Event with its embedded entities, as a ConversionResult of its own"""
+        tournament = self._shared_entity(
+            "tournaments",
+            event.tournament.id,
+            lambda: converters.tournament(event.tournament, self.reference_cache),
+        )
+        season = self._shared_entity(
+            "seasons",
+            event.season.id,
+            lambda: converters.season(event.season, self.reference_cache),
+        )
+        home_team = self._convert_team(event.homeTeam, tournament["sport"])
+        away_team = self._convert_team(event.awayTeam, tournament["sport"])
+
+        event_obj = sqlschema.Event(**event.to_sql_dict())
+        event_obj.tournament_id = tournament["tournament"].id
+        event_obj.season_id = season.id
+        event_obj.home_team_id = home_team.id
+        event_obj.away_team_id = away_team.id
+        if event.status:
+            event_obj.status = self._convert_status(event.status)
+        # Scores belong to the event, never shared
+        if event.homeScore:
+            event_obj.home_score = converters.score(event.homeScore)
+        if event.awayScore:
+            event_obj.away_score = converters.score(event.awayScore)
+
+        return ConversionResult(
+            sports={tournament["sport"]},
+            categories={tournament["category"]},
+            tournaments={tournament["tournament"]},
+            seasons={season},
+            teams={home_team, away_team},
+            countries={t.country for t in (home_team, away_team) if t.country},
+            events={event_obj},
+            match_id=event_obj.id,
+            processed_components={"events_list": True},
+        )
+
+    def process_event(self, event: sofaschema.EventSchema) -> None:
+        result = self._convert_event(event)
+        self.results[result.match_id] = result
 
     def convert(self, pydantic_data: sofaschema.EventsListSchema) -> None:
 
@@ -66,5 +124,26 @@ class EventsComponentConverter(BaseComponenetConverter):
                     indent=2,
                 )
             )
+            return
+
+        self._convert_events(events_list)
+
+    def convert_json_lines(self, source: JsonLines, skip_invalid: bool = False) -> None:
+        """
+        Convert a JSON-lines stream of events, one EventSchema per line.
+
+        Lines are validated and converted as they are read, the list is never
+        held as a whole.
+        """
+        self._convert_events(iter_json_lines(self.event_schema, source, skip_invalid))
+
+    def _convert_events(self, events: Iterable[sofaschema.EventSchema]) -> None:
+        self._shared = {}
+        self.results = {}
+        for event in events:
+            self.process_event(event)
+        self.normilise()
 
-        self.data = [self._convert_event(e) for e in events_list]
+    def normilise(self) -> None:
+        """One entry per event id - the last occurrence in the list wins"""
+        self.data = [next(iter(r.events)) for r in self.results.values()]
@@ -1,25 +1,39 @@
 import json
 import logging
-from typing import List
+from typing import Dict, List, Optional
 
 import sofascrape.schemas.general as sofaschema  # type: ignore
 
 import sqlsofa.schema.sqlmodels as sqlschema
 from sqlsofa.abstract import BaseComponenetConverter
+from sqlsofa.utils.reference_cache import ReferenceCache, build
 
 logger = logging.getLogger(__name__)
 
 
 class SeasonsComponentConverter(BaseComponenetConverter):
     """
-    Details here
+    Converts the seasons list of a tournament.
+
+    ``raw_data`` holds every converted season, ``data`` one season per id and
+    ``seasons`` the same keyed by id - what loaders.sync_seasons diffs against
+    the database.
     """
 
-    def __init__(self) -> None:
+    schema = sofaschema.SeasonsListSchema
+
+    def __init__(self, reference_cache: Optional[ReferenceCache] = None) -> None:
         super().__init__()
+        self.reference_cache = reference_cache
+        self.raw_data: List[sqlschema.Season] = []
+        self.seasons: Dict[int, sqlschema.Season] = {}
 
     def _convert_season(self, s: sofaschema.SeasonSchema) -> sqlschema.Season:
-        return sqlschema.Season(id=s.id, name=s.name, year=s.year)
+        return build(
+            sqlschema.Season,
+            {"id": s.id, "name": s.name, "year": s.year},
+            self.reference_cache,
+        )
 
     def convert(self, pydantic_data: sofaschema.SeasonsListSchema) -> None:
 
@@ -35,8 +49,12 @@ class SeasonsComponentConverter(BaseComponenetConverter):
                     indent=2,
                 )
             )
+            return
 
         self.raw_data = [self._convert_season(s) for s in seasons_list]
+        self.normilise()
 
     def normilise(self) -> None:
-        pass
+        """One season per id - the last occurrence in the list wins"""
+        self.seasons = {season.id: season for season in self.raw_data}
+        self.data = list(self.seasons.values())
@@ -1,10 +1,12 @@
 import json
 import logging
+from typing import Optional
 
 import sofascrape.schemas.general as pydanticschema  # type: ignore
 
 import sqlsofa.schema.sqlmodels as sqlschema
 from sqlsofa.abstract import BaseComponenetConverter
+from sqlsofa.utils.reference_cache import ReferenceCache, build
 
 logger = logging.getLogger(__name__)
 
@@ -14,23 +16,26 @@ class TournamentComponentConverter(BaseComponenetConverter):
     details here
     """
 
-    def __init__(self) -> None:
+    schema = pydanticschema.TournamentData
+
+    def __init__(self, reference_cache: Optional[ReferenceCache] = None) -> None:
         super().__init__()
+        self.reference_cache = reference_cache
 
     def _convert_sport(self, t: pydanticschema.TournamentSchema) -> sqlschema.Sport:
         sport: pydanticschema.SportSchema = t.category.sport
-        return sqlschema.Sport(**sport.to_sql_dict())
+        return build(sqlschema.Sport, sport.to_sql_dict(), self.reference_cache)
 
     def _convert_category(
         self, t: pydanticschema.TournamentSchema
     ) -> sqlschema.Category:
         category: pydanticschema.CategorySchema = t.category
-        return sqlschema.Category(**category.to_sql_dict())
+        return build(sqlschema.Category, category.to_sql_dict(), self.reference_cache)
 
     def _convert_tournament(
         self, t: pydanticschema.TournamentSchema
     ) -> sqlschema.Tournament:
-        return sqlschema.Tournament(**t.to_sql_dict())
+        return build(sqlschema.Tournament, t.to_sql_dict(), self.reference_cache)
 
     def convert(self, pydantic_data: pydanticschema.TournamentData) -> None:
 
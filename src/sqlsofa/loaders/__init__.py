@@ -0,0 +1,31 @@
+from typing import TYPE_CHECKING
+
+from sqlsofa.utils.lazy import attach
+
+if TYPE_CHECKING:
+    from .base_loader import LOAD_ORDER, BaseLoader, LoadResult, TableSpec
+    from .buffered_loader import BufferedLoader
+    from .bulk_loader import BulkLoader
+    from .event_sync import sync_events
+    from .job_queue import JobQueue, run_worker
+    from .live_loader import LiveLoader
+    from .season_sync import sync_seasons
+    from .session_loader import SessionLoader
+
+__getattr__, __dir__, __all__ = attach(
+    __name__,
+    {
+        "BaseLoader": ".base_loader",
+        "BufferedLoader": ".buffered_loader",
+        "BulkLoader": ".bulk_loader",
+        "JobQueue": ".job_queue",
+        "LOAD_ORDER": ".base_loader",
+        "LiveLoader": ".live_loader",
+        "LoadResult": ".base_loader",
+        "SessionLoader": ".session_loader",
+        "TableSpec": ".base_loader",
+        "run_worker": ".job_queue",
+        "sync_events": ".event_sync",
+        "sync_seasons": ".season_sync",
+    },
+)
@@ -0,0 +1,207 @@
+# sqlsofa/loaders/base_loader.py
+
+import logging
+import time
+from abc import ABC, abstractmethod
+from dataclasses import dataclass, field
+from typing import (
+    Any,
+    Dict,
+    Hashable,
+    List,
+    Optional,
+    Sequence,
+    Set,
+    Tuple,
+    Union,
+)
+
+from sqlalchemy import delete, tuple_
+from sqlalchemy.engine import Engine
+from sqlmodel import Session
+
+from sqlsofa.converters.base_converter import ConversionResult
+from sqlsofa.converters.compact_result import CompactResult, LocalRef, RowBuffer
+from sqlsofa.schema import sqlmodels as sqlschema
+from sqlsofa.schema.tables import LOAD_ORDER, SPECS_BY_TABLE, TableSpec
+from sqlsofa.utils.memory import tracked
+from sqlsofa.utils.profiling import profiled
+from sqlsofa.utils.reference_cache import ReferenceCache
+from sqlsofa.utils.sql_stats import StatementStats, batch_statements, phase
+
+from . import summaries
+
+logger = logging.getLogger(__name__)
+
+LoadInput = Union[ConversionResult, CompactResult]
+
+# (scope, table, row index) -> stored primary key, scope separates the
+# results of a batch since LocalRefs are only unique within one result
+IdMap = Dict[Tuple[Hashable, str, int], Any]
+
+
+@dataclass
+class LoadResult:
+    """Summary of a loader call"""
+
+    match_ids: List[int] = field(default_factory=list)
+    rows: Dict[str, int] = field(default_factory=dict)
+    # Rows of ``rows`` the database already held with the same values
+    unchanged: Dict[str, int] = field(default_factory=dict)
+    duration: float = 0.0
+    # SQL issued by the call, when the engine is instrumented (utils.sql_stats)
+    statements: Optional[StatementStats] = None
+
+    @property
+    def total_rows(self) -> int:
+        return sum(self.rows.values())
+
+    @property
+    def changed_rows(self) -> int:
+        return self.total_rows - sum(self.unchanged.values())
+
+    @property
+    def rows_per_second(self) -> float:
+        return self.total_rows / self.duration if self.duration > 0 else 0.0
+
+
+def as_compact(result: LoadInput) -> CompactResult:
+    if isinstance(result, CompactResult):
+        return result
+    return result.compact()
+
+
+def incident_keys(result: CompactResult) -> Optional[Set[Tuple[str, int]]]:
+    """
+    (incidentType, sequence) of every incident of the match, None unless the
+    result carries its complete incidents component
+    """
+    if not result.processed_components.get("incidents"):
+        return None
+    buffer = result.tables.get("incidents")
+    if not buffer:
+        return set()
+    incident_type = buffer.columns.index("incidentType")
+    sequence = buffer.columns.index("sequence")
+    return {(row[incident_type], row[sequence]) for row in buffer.rows}
+
+
+def delete_missing_incidents(
+    session: Session, match_id: int, keys: Set[Tuple[str, int]]
+) -> int:
+    """
+    Delete, in one statement, the stored incidents of a match whose key is not
+    in ``keys`` - incidents removed after a VAR review
+    """
+    Incident = sqlschema.Incident
+    stmt = delete(Incident).where(Incident.event_id == match_id)
+    if keys:
+        stmt = stmt.where(
+            tuple_(Incident.incidentType, Incident.sequence).not_in(sorted(keys))
+        )
+    deleted = session.execute(stmt).rowcount
+    if deleted:
+        logger.info(f"Deleted {deleted} incidents no longer in match {match_id}")
+    return deleted
+
+
+class BaseLoader(ABC):
+    """Abstract base class for all loaders"""
+
+    def __init__(
+        self,
+        engine: Engine,
+        reference_cache: Optional[ReferenceCache] = None,
+        refresh_summaries: bool = False,
+    ) -> None:
+        self.engine = engine
+        # Reference rows already stored unchanged are not written again
+        self.reference_cache = reference_cache
+        # Rebuild standings/form/head-to-head of the loaded seasons after commit
+        self.refresh_summaries = refresh_summaries
+
+    def load(self, result: LoadInput) -> LoadResult:
+        """Persist a single converted match"""
+        return self.load_batch([result])
+
+    @tracked("load")
+    @profiled("load")
+    def load_batch(self, results: Sequence[LoadInput]) -> LoadResult:
+        """Persist a batch of converted matches, full or compact"""
+        compacted = [as_compact(r) for r in results]
+        # A batch of one is attributed to its match, larger batches to none
+        match_id = compacted[0].match_id if len(compacted) == 1 else None
+        with batch_statements(self.engine, type(self).__name__) as statements:
+            start = time.perf_counter()
+            with phase("load", match_id):
+                rows, unchanged = self._load(compacted)
+            load_result = LoadResult(
+                match_ids=[r.match_id for r in compacted],
+                rows=rows,
+                unchanged=unchanged,
+                duration=time.perf_counter() - start,
+            )
+            logger.info(
+                f"{type(self).__name__} loaded {load_result.total_rows} rows "
+                f"({load_result.changed_rows} changed) for {len(compacted)} matches "
+                f"in {load_result.duration:.3f}s"
+            )
+            if self.refresh_summaries:
+                with phase("summaries"):
+                    summaries.refresh_summaries(
+                        self.engine, summaries.affected_seasons(compacted)
+                    )
+        load_result.statements = statements
+        return load_result
+
+    @abstractmethod
+    def _load(
+        self, results: List[CompactResult]
+    ) -> Tuple[Dict[str, int], Dict[str, int]]:
+        """
+        Write the results.
+
+        Returns the rows handled per table, and of those the rows left alone
+        because the database already held them unchanged.
+        """
+        pass
+
+    def _prune_incidents(self, session: Session, results: List[CompactResult]) -> None:
+        """Drop stored incidents that reloaded matches no longer have"""
+        for result in results:
+            keys = incident_keys(result)
+            if keys is not None:
+                delete_missing_incidents(session, result.match_id, keys)
+
+    def _is_stored(self, spec: TableSpec, values: Dict[str, Any]) -> bool:
+        """Row is a reference row the database already holds unchanged"""
+        return (
+            self.reference_cache is not None
+            and spec.has_source_id
+            and self.reference_cache.is_current(spec.tablename, values)
+        )
+
+    def _remember(self, written: List[Tuple[str, Dict[str, Any]]]) -> None:
+        """Record committed reference rows in the cache"""
+        if self.reference_cache is None:
+            return
+        for table, values in written:
+            self.reference_cache.remember(table, values)
+
+    @staticmethod
+    def _row_values(
+        buffer: RowBuffer, row: Tuple[Any, ...], ids: IdMap, scope: Hashable
+    ) -> Dict[str, Any]:
+        """
+        Column values for ``row`` with LocalRef foreign keys resolved.
+
+        Parents come earlier in LOAD_ORDER, so their ids are already in ``ids``.
+        """
+        values = dict(zip(buffer.columns, row))
+        for foreign_key, parent in buffer.refs.items():
+            ref = values[foreign_key]
+            if isinstance(ref, LocalRef):
+                values[foreign_key] = ids[(scope, parent, ref)]
+        if not SPECS_BY_TABLE[buffer.table].has_source_id and values.get("id") is None:
+            values.pop("id", None)
+        return values
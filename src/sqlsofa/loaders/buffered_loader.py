@@ -0,0 +1,157 @@
+# sqlsofa/loaders/buffered_loader.py
+"""
+Write-behind buffering in front of a batch loader.
+
+Live workers convert matches one at a time; loading each on its own costs a
+transaction and a round of statements per table. BufferedLoader collects the
+compact rows and hands them to the wrapped loader in one batch once a row,
+byte or age threshold is reached.
+"""
+
+import logging
+import sys
+import time
+from typing import Callable, List, Optional
+
+from sqlalchemy.engine import Engine
+from sqlalchemy.exc import DBAPIError
+
+from sqlsofa.converters.compact_result import CompactResult
+
+from .base_loader import BaseLoader, LoadInput, LoadResult, as_compact
+from .bulk_loader import BulkLoader
+
+logger = logging.getLogger(__name__)
+
+# serialization_failure, deadlock_detected
+RETRYABLE_SQLSTATES = ("40001", "40P01")
+RETRYABLE_MESSAGES = ("deadlock", "could not serialize", "database is locked")
+
+
+def is_retryable(error: DBAPIError) -> bool:
+    """Serialization failures and deadlocks succeed when the batch is re-run"""
+    orig = error.orig
+    sqlstate = getattr(orig, "pgcode", None) or getattr(orig, "sqlstate", None)
+    if sqlstate in RETRYABLE_SQLSTATES:
+        return True
+    message = str(orig).lower()
+    return any(text in message for text in RETRYABLE_MESSAGES)
+
+
+def estimate_size(result: CompactResult) -> int:
+    """Rough in-memory size of the rows in bytes"""
+    size = 0
+    for buffer in result.tables.values():
+        for row in buffer.rows:
+            size += sys.getsizeof(row) + sum(sys.getsizeof(value) for value in row)
+    return size
+
+
+class BufferedLoader:
+    """
+    Buffers converted matches and loads them in batches.
+
+    A flush happens when ``max_rows`` or ``max_bytes`` is reached on ``add``,
+    or once the oldest buffered match is ``max_seconds`` old - checked on
+    ``add`` and ``poll``, so idle workers should call ``poll`` periodically.
+    Each flush is a single ``load_batch`` on the wrapped loader (one
+    transaction with the default BulkLoader) and is retried on
+    serialization failures and deadlocks.
+    """
+
+    def __init__(
+        self,
+        engine: Engine,
+        loader: Optional[BaseLoader] = None,
+        max_rows: int = 50_000,
+        max_bytes: int = 64 * 1024 * 1024,
+        max_seconds: float = 30.0,
+        max_retries: int = 3,
+        retry_delay: float = 0.1,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.loader = loader or BulkLoader(engine)
+        self.max_rows = max_rows
+        self.max_bytes = max_bytes
+        self.max_seconds = max_seconds
+        self.max_retries = max_retries
+        self.retry_delay = retry_delay
+        self.clock = clock
+
+        self.pending: List[CompactResult] = []
+        self.pending_rows = 0
+        self.pending_bytes = 0
+        self.oldest: Optional[float] = None
+
+    def __enter__(self) -> "BufferedLoader":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        if exc_type is None:
+            self.flush()
+            return
+        # Keep what was buffered before a failure in the caller, without
+        # replacing that failure with one of the flush
+        try:
+            self.flush()
+        except Exception:
+            logger.exception(
+                f"Flush of {len(self.pending)} matches failed after {exc_type.__name__}"
+            )
+
+    def __len__(self) -> int:
+        return len(self.pending)
+
+    def add(self, result: LoadInput) -> Optional[LoadResult]:
+        """
+        Buffer a converted match, flushing if a threshold is reached.
+
+        A newer conversion of an already buffered match replaces it.
+        """
+        compact = as_compact(result)
+        if self.oldest is None:
+            self.oldest = self.clock()
+        for position, buffered in enumerate(self.pending):
+            if buffered.match_id == compact.match_id:
+                del self.pending[position]
+                self.pending_rows -= buffered.row_count
+                self.pending_bytes -= estimate_size(buffered)
+                break
+        self.pending.append(compact)
+        self.pending_rows += compact.row_count
+        self.pending_bytes += estimate_size(compact)
+
+        if self.pending_rows >= self.max_rows or self.pending_bytes >= self.max_bytes:
+            return self.flush()
+        return self.poll()
+
+    def poll(self) -> Optional[LoadResult]:
+        """Flush if the oldest buffered match has waited ``max_seconds``"""
+        if self.oldest is not None and self.clock() - self.oldest >= self.max_seconds:
+            return self.flush()
+        return None
+
+    def flush(self) -> Optional[LoadResult]:
+        """Load everything buffered in one batch"""
+        if not self.pending:
+            return None
+
+        for attempt in range(self.max_retries + 1):
+            try:
+                result = self.loader.load_batch(self.pending)
+                break
+            except DBAPIError as e:
+                if attempt == self.max_retries or not is_retryable(e):
+                    raise
+                delay = self.retry_delay * 2**attempt
+                logger.warning(
+                    f"Flush of {len(self.pending)} matches failed ({e.orig}), "
+                    f"retrying in {delay:.2f}s"
+                )
+                time.sleep(delay)
+
+        self.pending = []
+        self.pending_rows = 0
+        self.pending_bytes = 0
+        self.oldest = None
+        return result
@@ -0,0 +1,319 @@
+# sqlsofa/loaders/bulk_loader.py
+
+import logging
+from typing import Any, Dict, List, Optional, Tuple
+
+from sqlalchemy import Table, bindparam, or_, select, tuple_, update
+from sqlalchemy.engine import Engine
+from sqlmodel import Session
+
+from sqlsofa.conf.database import open_session
+from sqlsofa.converters.compact_result import CompactResult, RowBuffer
+from sqlsofa.utils.reference_cache import ReferenceCache
+from sqlsofa.utils.sql_stats import phase
+
+from .base_loader import LOAD_ORDER, BaseLoader, IdMap, TableSpec
+from .id_blocks import IdAllocator
+
+logger = logging.getLogger(__name__)
+
+
+def dialect_insert(engine: Engine, table: Table) -> Any:
+    """Dialect specific INSERT supporting ON CONFLICT (postgresql and sqlite)"""
+    if engine.dialect.name == "postgresql":
+        from sqlalchemy.dialects.postgresql import insert
+    elif engine.dialect.name == "sqlite":
+        from sqlalchemy.dialects.sqlite import insert
+    else:
+        raise ValueError(f"Unsupported dialect for bulk loading: {engine.dialect.name}")
+    return insert(table)
+
+
+class BulkLoader(BaseLoader):
+    """
+    Core loader - one multi-row statement per table level, one transaction per batch.
+
+    Keyed rows are upserted with ON CONFLICT, surrogate-id rows are inserted
+    with RETURNING so children can pick up their parent ids. Match child rows
+    are keyed on their natural key, so re-ingesting a match updates them in
+    place. Conflicting rows are only updated when a column IS DISTINCT FROM
+    the stored value, so reloading unchanged data leaves the stored rows (and
+    their tuples) alone.
+
+    With ``preallocate_ids`` the surrogate ids of the whole batch are reserved
+    up front (see loaders.id_blocks) and no statement uses RETURNING: the
+    stored rows of the batch's keys are read with one SELECT per table, new
+    natural-key rows are plain-inserted with their reserved id and changed
+    ones updated by their stored id. A concurrent writer inserting the same
+    natural key in between makes the batch fail with an IntegrityError, so
+    use it where batches do not race on new shared rows (or retry them).
+    """
+
+    def __init__(
+        self,
+        engine: Engine,
+        reference_cache: Optional[ReferenceCache] = None,
+        refresh_summaries: bool = False,
+        preallocate_ids: bool = False,
+    ) -> None:
+        super().__init__(engine, reference_cache, refresh_summaries)
+        self.preallocate_ids = preallocate_ids
+
+    def _load(
+        self, results: List[CompactResult]
+    ) -> Tuple[Dict[str, int], Dict[str, int]]:
+        ids: IdMap = {}
+        counts: Dict[str, int] = {}
+        unchanged: Dict[str, int] = {}
+        written: List[Tuple[str, Dict[str, Any]]] = []
+
+        with open_session(self.engine, bulk=True) as session:
+            self._prune_incidents(session, results)
+            if self.preallocate_ids:
+                with phase("allocate_ids"):
+                    IdAllocator(self.engine).assign(session, results, ids)
+            for spec in LOAD_ORDER:
+                buffers = [
+                    (scope, result.tables[spec.tablename])
+                    for scope, result in enumerate(results)
+                    if result.tables.get(spec.tablename)
+                ]
+                if not buffers:
+                    continue
+                if spec.conflict:
+                    rows, skipped = self._upsert(session, spec, buffers, ids)
+                    if self.reference_cache is not None:
+                        written.extend((spec.tablename, values) for values in rows)
+                    if skipped:
+                        unchanged[spec.tablename] = skipped
+                else:
+                    rows = self._insert(session, spec, self._prepare(buffers, ids), ids)
+                counts[spec.tablename] = len(rows)
+            session.commit()
+        self._remember(written)
+
+        return counts, unchanged
+
+    def _prepare(
+        self, buffers: List[Tuple[int, RowBuffer]], ids: IdMap
+    ) -> List[Tuple[int, int, Dict[str, Any]]]:
+        """(scope, row index, resolved values) of every row of ``buffers``"""
+        return [
+            (scope, index, self._row_values(buffer, row, ids, scope))
+            for scope, buffer in buffers
+            for index, row in enumerate(buffer.rows)
+        ]
+
+    def _upsert(
+        self,
+        session: Session,
+        spec: TableSpec,
+        buffers: List[Tuple[int, RowBuffer]],
+        ids: IdMap,
+    ) -> Tuple[List[Dict[str, Any]], int]:
+        """
+        Upsert the distinct rows of ``buffers``.
+
+        Returns the rows sent, and how many of them the database already held
+        unchanged.
+        """
+        # Shared entities repeat across the batch, ON CONFLICT can only touch a
+        # row once per statement so keep the last (newest) occurrence
+        latest: Dict[Tuple[Any, ...], Dict[str, Any]] = {}
+        positions: List[Tuple[int, int, Tuple[Any, ...]]] = []
+        # NULL never conflicts, rows with an incomplete key are plain inserts
+        incomplete: List[Tuple[int, int, Dict[str, Any]]] = []
+        for scope, index, row_values in self._prepare(buffers, ids):
+            key = tuple(row_values[name] for name in spec.conflict)
+            if None in key:
+                incomplete.append((scope, index, row_values))
+                continue
+            positions.append((scope, index, key))
+            reserved = ids.get((scope, spec.tablename, index))
+            if reserved is not None:
+                row_values["id"] = latest.get(key, {}).get("id", reserved)
+            latest[key] = row_values
+        values = [
+            row_values
+            for row_values in latest.values()
+            if not self._is_stored(spec, row_values)
+        ]
+
+        unchanged = 0
+        if values and self.preallocate_ids:
+            unchanged = self._write_resolved(session, spec, values, positions, ids)
+        elif values:
+            unchanged = self._upsert_rows(session, spec, values, positions, ids)
+        if incomplete:
+            values.extend(self._insert(session, spec, incomplete, ids))
+        return values, unchanged
+
+    def _upsert_rows(
+        self,
+        session: Session,
+        spec: TableSpec,
+        values: List[Dict[str, Any]],
+        positions: List[Tuple[int, int, Tuple[Any, ...]]],
+        ids: IdMap,
+    ) -> int:
+        """Run the upsert, returning how many rows were left unchanged"""
+        table = spec.model.__table__
+        stmt = dialect_insert(self.engine, table)
+        update_columns = {
+            name: stmt.excluded[name]
+            for name in values[0]
+            if name not in spec.conflict and name not in ("id", "created_at")
+        }
+        if update_columns:
+            stmt = stmt.on_conflict_do_update(
+                index_elements=list(spec.conflict),
+                set_=update_columns,
+                where=or_(
+                    *(
+                        table.c[name].is_distinct_from(excluded)
+                        for name, excluded in update_columns.items()
+                    )
+                ),
+            )
+        else:
+            stmt = stmt.on_conflict_do_nothing(index_elements=list(spec.conflict))
+        # Only inserted and actually updated rows come back
+        key_columns = [table.c[name] for name in spec.conflict]
+        if spec.has_source_id:
+            changed = session.execute(stmt.returning(*key_columns), values).all()
+            return len(values) - len(changed)
+
+        # Natural key on a surrogate-id table - inserted and updated rows
+        # return their stored id, only unchanged rows need a lookup
+        stored = {
+            tuple(row[1:]): row[0]
+            for row in session.execute(stmt.returning(table.c.id, *key_columns), values)
+        }
+        changed = len(stored)
+        missing = {key for _, _, key in positions if key not in stored}
+        if missing:
+            stored.update(
+                (tuple(row[1:]), row[0])
+                for row in session.execute(
+                    select(table.c.id, *key_columns).where(
+                        tuple_(*key_columns).in_(missing)
+                    )
+                )
+            )
+        for scope, index, key in positions:
+            ids[(scope, spec.tablename, index)] = stored[key]
+        return len(values) - changed
+
+    def _write_resolved(
+        self,
+        session: Session,
+        spec: TableSpec,
+        values: List[Dict[str, Any]],
+        positions: List[Tuple[int, int, Tuple[Any, ...]]],
+        ids: IdMap,
+    ) -> int:
+        """
+        Write keyed rows without RETURNING, returning how many were unchanged.
+
+        The stored id and values of every key are read in one SELECT. Source
+        id rows are upserted as usual, natural-key rows are split into plain
+        inserts (reserved ids) and updates by stored id.
+        """
+        table = spec.model.__table__
+        key_columns = [table.c[name] for name in spec.conflict]
+        compared = [
+            name
+            for name in values[0]
+            if name not in spec.conflict and name not in ("id", "created_at")
+        ]
+        keys = [
+            tuple(row_values[name] for name in spec.conflict) for row_values in values
+        ]
+        key_filter = (
+            key_columns[0].in_([key[0] for key in keys])
+            if len(key_columns) == 1
+            else tuple_(*key_columns).in_(keys)
+        )
+        stored = {
+            tuple(row[1 : 1 + len(key_columns)]): (
+                row[0],
+                tuple(row[1 + len(key_columns) :]),
+            )
+            for row in session.execute(
+                select(
+                    table.c.id, *key_columns, *(table.c[name] for name in compared)
+                ).where(key_filter)
+            )
+        }
+
+        new: List[Dict[str, Any]] = []
+        changed: List[Dict[str, Any]] = []
+        resolved: Dict[Tuple[Any, ...], Any] = {}
+        for key, row_values in zip(keys, values):
+            if key not in stored:
+                new.append(row_values)
+            else:
+                stored_id, stored_values = stored[key]
+                row_values["id"] = stored_id
+                if tuple(row_values[name] for name in compared) != stored_values:
+                    changed.append(row_values)
+            resolved[key] = row_values.get("id")
+
+        if spec.has_source_id:
+            if new or changed:
+                stmt = dialect_insert(self.engine, table)
+                stmt = (
+                    stmt.on_conflict_do_update(
+                        index_elements=list(spec.conflict),
+                        set_={name: stmt.excluded[name] for name in compared},
+                    )
+                    if compared
+                    else stmt.on_conflict_do_nothing(index_elements=list(spec.conflict))
+                )
+                session.execute(stmt, new + changed)
+            return len(values) - len(new) - len(changed)
+
+        if new:
+            session.execute(table.insert(), new)
+        if changed:
+            # Bound names may not shadow the SET columns
+            stmt = (
+                update(table)
+                .where(table.c.id == bindparam("b_id"))
+                .values({name: bindparam(f"b_{name}") for name in compared})
+            )
+            session.execute(
+                stmt,
+                [
+                    {f"b_{name}": row_values[name] for name in ["id", *compared]}
+                    for row_values in changed
+                ],
+            )
+        for scope, index, key in positions:
+            ids[(scope, spec.tablename, index)] = resolved[key]
+        return len(values) - len(new) - len(changed)
+
+    def _insert(
+        self,
+        session: Session,
+        spec: TableSpec,
+        rows: List[Tuple[int, int, Dict[str, Any]]],
+        ids: IdMap,
+    ) -> List[Dict[str, Any]]:
+        """
+        Plain insert of surrogate-id rows, with their reserved ids or
+        RETURNING the generated ones.
+        """
+        values = [row_values for _, _, row_values in rows]
+        table = spec.model.__table__
+        if self.preallocate_ids and not spec.has_source_id:
+            for scope, index, row_values in rows:
+                row_values["id"] = ids[(scope, spec.tablename, index)]
+            session.execute(table.insert(), values)
+            return values
+
+        stmt = table.insert().returning(table.c.id, sort_by_parameter_order=True)
+        new_ids = session.execute(stmt, values).scalars().all()
+        for (scope, index, _), new_id in zip(rows, new_ids):
+            ids[(scope, spec.tablename, index)] = new_id
+        return values
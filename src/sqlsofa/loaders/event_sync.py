@@ -0,0 +1,188 @@
+# sqlsofa/loaders/event_sync.py
+"""
+Incremental sync of season fixture lists.
+
+The events list is converted in one pass by EventsComponentConverter, then
+compared with a snapshot of the stored events - event id and a content hash
+over the event row, its status code and both scores. Only new and changed
+events are handed to the loader, so refreshing an unchanged season costs the
+snapshot query and nothing else.
+"""
+
+import hashlib
+import logging
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Any, Dict, Iterable, List, Optional, Sequence
+
+from sqlalchemy import select
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import aliased
+from sqlalchemy.sql import Select
+
+from sqlsofa.conf.database import open_session
+from sqlsofa.converters.base_converter import ConversionResult
+from sqlsofa.schema import sqlmodels as sqlschema
+
+from .base_loader import BaseLoader, LoadResult
+
+if TYPE_CHECKING:
+    from sqlsofa.general.eventsConverter import EventsComponentConverter
+
+logger = logging.getLogger(__name__)
+
+# Surrogate ids change on every write and say nothing about the content
+HASH_EXCLUDED = (
+    "created_at",
+    "status_id",
+    "time_id",
+    "round_info_id",
+    "home_score_id",
+    "away_score_id",
+)
+EVENT_COLUMNS = tuple(
+    c.name for c in sqlschema.Event.__table__.columns if c.name not in HASH_EXCLUDED
+)
+SCORE_COLUMNS = tuple(
+    c.name
+    for c in sqlschema.Score.__table__.columns
+    if c.name not in ("id", "created_at")
+)
+
+
+def _canonical(value: Any) -> Any:
+    # Unvalidated SQLModel tables keep 1/0 where the database returns booleans
+    return int(value) if isinstance(value, bool) else value
+
+
+def content_hash(
+    event: Sequence[Any],
+    status_code: Optional[int],
+    home_score: Optional[Sequence[Any]],
+    away_score: Optional[Sequence[Any]],
+) -> str:
+    """Hash of an event's EVENT_COLUMNS values, status code and score values"""
+    payload = (
+        tuple(_canonical(v) for v in event),
+        status_code,
+        None if home_score is None else tuple(home_score),
+        None if away_score is None else tuple(away_score),
+    )
+    return hashlib.blake2b(repr(payload).encode(), digest_size=16).hexdigest()
+
+
+def event_hash(event: sqlschema.Event) -> str:
+    """content_hash of a converted event"""
+
+    def score(obj: Optional[sqlschema.Score]) -> Optional[List[Any]]:
+        return None if obj is None else [getattr(obj, c) for c in SCORE_COLUMNS]
+
+    return content_hash(
+        [getattr(event, c) for c in EVENT_COLUMNS],
+        event.status.code if event.status is not None else None,
+        score(event.home_score),
+        score(event.away_score),
+    )
+
+
+def snapshot_query(season_ids: Iterable[int]) -> Select:
+    Event = sqlschema.Event
+    home = aliased(sqlschema.Score)
+    away = aliased(sqlschema.Score)
+    return (
+        select(
+            *(Event.__table__.c[c] for c in EVENT_COLUMNS),
+            sqlschema.Status.code,
+            home.id,
+            *(getattr(home, c) for c in SCORE_COLUMNS),
+            away.id,
+            *(getattr(away, c) for c in SCORE_COLUMNS),
+        )
+        .outerjoin(sqlschema.Status, Event.status_id == sqlschema.Status.id)
+        .outerjoin(home, Event.home_score_id == home.id)
+        .outerjoin(away, Event.away_score_id == away.id)
+        .where(Event.season_id.in_(sorted(set(season_ids))))
+    )
+
+
+def load_snapshot(engine: Engine, season_ids: Iterable[int]) -> Dict[int, str]:
+    """Stored event id -> content hash for ``season_ids``, in one query"""
+    n_event, n_score = len(EVENT_COLUMNS), len(SCORE_COLUMNS)
+    id_column = EVENT_COLUMNS.index("id")
+    snapshot = {}
+    with open_session(engine) as session:
+        for row in session.execute(snapshot_query(season_ids)):
+            event = row[:n_event]
+            status_code = row[n_event]
+            home = row[n_event + 1 : n_event + 2 + n_score]
+            away = row[n_event + 2 + n_score :]
+            snapshot[event[id_column]] = content_hash(
+                event,
+                status_code,
+                home[1:] if home[0] is not None else None,
+                away[1:] if away[0] is not None else None,
+            )
+    return snapshot
+
+
+@dataclass
+class EventDiff:
+    """Event ids of a converted list by what the database holds"""
+
+    new: List[int] = field(default_factory=list)
+    changed: List[int] = field(default_factory=list)
+    unchanged: List[int] = field(default_factory=list)
+
+    @property
+    def to_write(self) -> List[int]:
+        return self.new + self.changed
+
+
+def diff_events(
+    results: Dict[int, ConversionResult], snapshot: Dict[int, str]
+) -> EventDiff:
+    diff = EventDiff()
+    for event_id, result in results.items():
+        stored = snapshot.get(event_id)
+        if stored is None:
+            diff.new.append(event_id)
+        elif stored != event_hash(next(iter(result.events))):
+            diff.changed.append(event_id)
+        else:
+            diff.unchanged.append(event_id)
+    return diff
+
+
+@dataclass
+class SyncResult:
+    diff: EventDiff
+    load: Optional[LoadResult] = None
+
+
+def sync_events(
+    engine: Engine,
+    converter: "EventsComponentConverter",
+    loader: Optional[BaseLoader] = None,
+) -> SyncResult:
+    """Write the new and changed events of a converted events list"""
+    results = converter.results
+    season_ids = {
+        event.season_id
+        for result in results.values()
+        for event in result.events
+        if event.season_id is not None
+    }
+    snapshot = load_snapshot(engine, season_ids) if season_ids else {}
+    diff = diff_events(results, snapshot)
+    logger.info(
+        f"Events sync for seasons {sorted(season_ids)}: {len(diff.new)} new, "
+        f"{len(diff.changed)} changed, {len(diff.unchanged)} unchanged"
+    )
+    if not diff.to_write:
+        return SyncResult(diff)
+
+    if loader is None:
+        from .bulk_loader import BulkLoader
+
+        loader = BulkLoader(engine, reference_cache=converter.reference_cache)
+    load = loader.load_batch([results[event_id] for event_id in diff.to_write])
+    return SyncResult(diff, load)
@@ -0,0 +1,92 @@
+# sqlsofa/loaders/id_blocks.py
+"""
+Surrogate ids reserved in blocks before writing.
+
+Child rows of the statistics and lineup hierarchies need their parent's id,
+so with database-generated ids every level waits for the RETURNING of the
+level above. Reserving a block of ids per table up front - one
+``nextval`` over ``generate_series`` on PostgreSQL - lets the loader assign
+every id client-side and write each table with a plain multi-row INSERT.
+"""
+
+import logging
+from typing import Dict, List, Sequence
+
+from sqlalchemy import Table, func, select
+from sqlalchemy.engine import Engine
+from sqlmodel import Session
+
+from sqlsofa.converters.compact_result import CompactResult
+from sqlsofa.schema.tables import LOAD_ORDER
+
+from .base_loader import IdMap
+
+logger = logging.getLogger(__name__)
+
+
+class IdAllocator:
+    """
+    Reserves primary keys of surrogate-id tables.
+
+    Rows with a natural key get ids too; when the key is already stored the
+    loader keeps the stored id and the reserved one is unused.
+
+    On PostgreSQL ids come from the table's sequence and are never handed out
+    twice. SQLite has no sequences - ids continue from the current maximum,
+    which is safe because SQLite allows a single writer and the reservation
+    is made inside the write transaction. Use one allocator per transaction.
+    """
+
+    def __init__(self, engine: Engine) -> None:
+        if engine.dialect.name not in ("postgresql", "sqlite"):
+            raise ValueError(
+                f"Unsupported dialect for id blocks: {engine.dialect.name}"
+            )
+        self.dialect = engine.dialect.name
+        # sqlite: last id handed out per table in this transaction
+        self._issued: Dict[str, int] = {}
+
+    def reserve(self, session: Session, table: Table, n: int) -> List[int]:
+        """``n`` unused ids of ``table`` in one statement"""
+        if n <= 0:
+            return []
+        if self.dialect == "postgresql":
+            sequence = func.pg_get_serial_sequence(table.name, "id")
+            stmt = select(func.nextval(sequence)).select_from(
+                func.generate_series(1, n)
+            )
+            return sorted(session.execute(stmt).scalars())
+
+        stored = session.execute(
+            select(func.coalesce(func.max(table.c.id), 0))
+        ).scalar_one()
+        start = max(stored, self._issued.get(table.name, 0)) + 1
+        self._issued[table.name] = start + n - 1
+        return list(range(start, start + n))
+
+    def assign(
+        self, session: Session, results: Sequence[CompactResult], ids: IdMap
+    ) -> Dict[str, int]:
+        """
+        Reserve ids for every row of ``results`` not keyed on a source id.
+
+        Fills ``ids`` ((scope, table, row index) -> id, scope being the
+        position in ``results``) and returns the ids reserved per table.
+        """
+        reserved = {}
+        for spec in LOAD_ORDER:
+            if spec.has_source_id:
+                continue
+            positions = [
+                (scope, index)
+                for scope, result in enumerate(results)
+                for index in range(len(result.tables.get(spec.tablename) or ()))
+            ]
+            if not positions:
+                continue
+            block = self.reserve(session, spec.model.__table__, len(positions))
+            for (scope, index), new_id in zip(positions, block):
+                ids[(scope, spec.tablename, index)] = new_id
+            reserved[spec.tablename] = len(block)
+        logger.debug(f"Reserved ids {reserved}")
+        return reserved
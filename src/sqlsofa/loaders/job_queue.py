@@ -0,0 +1,291 @@
+# sqlsofa/loaders/job_queue.py
+"""
+Match ingestion queue shared by workers on several hosts.
+
+Jobs are ``IngestJob`` rows, one per match id. A worker claims a batch with
+a single ``UPDATE ... WHERE id IN (SELECT ... FOR UPDATE SKIP LOCKED)``, so
+concurrent workers never wait on each other or claim the same match. Claims
+are leases: a worker that dies stops heart-beating and its jobs become
+claimable again once the lease runs out. Match rows are upserted on their
+keys, so a match loaded twice after a lost lease is harmless.
+
+Lease times are taken from the database clock, in UTC, so workers on hosts
+with skewed clocks or other time zones agree on which leases ran out.
+"""
+
+import logging
+import os
+import socket
+import threading
+from contextlib import contextmanager
+from datetime import timedelta
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from sqlalchemy import DateTime, and_, case, func, literal, or_, select, update
+from sqlalchemy.engine import Connection, Engine
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.sql import ColumnElement, Update
+from sqlalchemy.sql.functions import FunctionElement
+
+from sqlsofa.conf.database import open_session
+from sqlsofa.schema import sqlmodels as sqlschema
+
+from .base_loader import BaseLoader
+from .bulk_loader import dialect_insert
+
+logger = logging.getLogger(__name__)
+
+Job = sqlschema.IngestJob
+JobStatus = sqlschema.JobStatusEnum
+
+
+def status(value: JobStatus) -> ColumnElement:
+    """``value`` bound as the stored enum, for use inside SQL expressions"""
+    return literal(value, Job.__table__.c.status.type)
+
+
+class utc_now(FunctionElement):
+    """Database time in UTC plus a number of seconds, see ``db_now``"""
+
+    type = DateTime()
+    inherit_cache = True
+
+
+def db_now(offset: timedelta = timedelta(0)) -> utc_now:
+    return utc_now(literal(offset.total_seconds()))
+
+
+@compiles(utc_now)
+def _utc_now(element, compiler, **kw):
+    seconds = compiler.process(element.clauses, **kw)
+    return f"timezone('utc', now()) + make_interval(secs => {seconds})"
+
+
+@compiles(utc_now, "sqlite")
+def _utc_now_sqlite(element, compiler, **kw):
+    seconds = compiler.process(element.clauses, **kw)
+    return f"datetime('now', {seconds} || ' seconds')"
+
+
+def default_worker_id() -> str:
+    return f"{socket.gethostname()}-{os.getpid()}"
+
+
+class JobQueue:
+    """Claims, heartbeats and completes ingestion jobs in the database"""
+
+    def __init__(
+        self,
+        engine: Engine,
+        lease: timedelta = timedelta(minutes=5),
+        max_attempts: int = 3,
+    ) -> None:
+        self.engine = engine
+        self.lease = lease
+        # Jobs failing this often are parked as FAILED instead of retried
+        self.max_attempts = max_attempts
+
+    @contextmanager
+    def _transaction(self) -> Iterator[Connection]:
+        """A connection in its own short transaction, committed on success"""
+        with open_session(self.engine) as session, session.begin():
+            yield session.connection()
+
+    def enqueue(self, match_ids: Iterable[int]) -> int:
+        """Add jobs for ``match_ids``, already queued matches are left alone"""
+        values = [{"match_id": match_id} for match_id in dict.fromkeys(match_ids)]
+        if not values:
+            return 0
+        stmt = (
+            dialect_insert(self.engine, Job.__table__)
+            .on_conflict_do_nothing(index_elements=["match_id"])
+            .returning(Job.match_id)
+        )
+        with self._transaction() as conn:
+            added = len(conn.execute(stmt, values).all())
+        logger.info(f"Queued {added} of {len(values)} matches")
+        return added
+
+    def claim_statement(self, worker: str, n: int) -> Update:
+        claimable = (
+            select(Job.id)
+            .where(
+                or_(
+                    Job.status == JobStatus.PENDING,
+                    and_(Job.status == JobStatus.RUNNING, Job.leased_until < db_now()),
+                )
+            )
+            .order_by(Job.id)
+            .limit(n)
+            .with_for_update(skip_locked=True)
+        )
+        return (
+            update(Job)
+            .where(Job.id.in_(claimable))
+            .values(
+                status=JobStatus.RUNNING,
+                worker=worker,
+                attempts=Job.attempts + 1,
+                leased_until=db_now(self.lease),
+                heartbeat_at=db_now(),
+            )
+            .returning(Job.match_id)
+        )
+
+    def claim(self, worker: str, n: int) -> List[int]:
+        """Lease up to ``n`` pending or abandoned jobs, returns their match ids"""
+        with self._transaction() as conn:
+            match_ids = sorted(conn.execute(self.claim_statement(worker, n)).scalars())
+        logger.debug(f"Worker {worker} claimed {len(match_ids)} jobs")
+        return match_ids
+
+    def _owned(self, worker: str, match_ids: Iterable[int]) -> Update:
+        return update(Job).where(
+            Job.match_id.in_(list(match_ids)),
+            Job.worker == worker,
+            Job.status == JobStatus.RUNNING,
+        )
+
+    def heartbeat(self, worker: str, match_ids: Iterable[int]) -> int:
+        """Extend the lease of jobs ``worker`` still holds, returns how many"""
+        stmt = self._owned(worker, match_ids).values(
+            leased_until=db_now(self.lease), heartbeat_at=db_now()
+        )
+        with self._transaction() as conn:
+            return conn.execute(stmt).rowcount
+
+    def complete(self, worker: str, match_ids: Iterable[int]) -> int:
+        """Mark jobs done, returns how many ``worker`` still held"""
+        stmt = self._owned(worker, match_ids).values(
+            status=JobStatus.DONE,
+            leased_until=None,
+            finished_at=db_now(),
+            error_message=None,
+        )
+        with self._transaction() as conn:
+            return conn.execute(stmt).rowcount
+
+    def fail(self, worker: str, match_id: int, error: BaseException) -> None:
+        """Release a job for retry, or park it once it used its attempts"""
+        stmt = self._owned(worker, [match_id]).values(
+            status=case(
+                (Job.attempts >= self.max_attempts, status(JobStatus.FAILED)),
+                else_=status(JobStatus.PENDING),
+            ),
+            leased_until=None,
+            error_message=f"{type(error).__name__}: {error}",
+        )
+        with self._transaction() as conn:
+            conn.execute(stmt)
+
+    def counts(self) -> Dict[str, int]:
+        """Number of jobs per status"""
+        stmt = select(Job.status, func.count()).group_by(Job.status)
+        with self._transaction() as conn:
+            return {JobStatus(status).value: n for status, n in conn.execute(stmt)}
+
+
+@contextmanager
+def keep_alive(
+    queue: JobQueue, worker: str, match_ids: List[int], every: float
+) -> Iterator[None]:
+    """Heartbeat ``match_ids`` every ``every`` seconds while the block runs"""
+    if every <= 0:
+        yield
+        return
+    stop = threading.Event()
+
+    def beat() -> None:
+        while not stop.wait(every):
+            try:
+                queue.heartbeat(worker, match_ids)
+            except Exception as e:
+                logger.warning(f"Worker {worker} could not heartbeat its jobs: {e}")
+
+    thread = threading.Thread(target=beat, name=f"{worker}-heartbeat", daemon=True)
+    thread.start()
+    try:
+        yield
+    finally:
+        stop.set()
+        thread.join()
+
+
+def run_worker(
+    queue: JobQueue,
+    fetch_match: Callable[[int], Any],
+    loader: BaseLoader,
+    converter_cls: Optional[Callable[..., Any]] = None,
+    worker: Optional[str] = None,
+    batch_size: int = 50,
+    max_batches: Optional[int] = None,
+) -> Dict[str, int]:
+    """
+    Claim, convert and load batches until the queue is drained.
+
+    ``fetch_match`` returns the match data for a match id. A match failing to
+    fetch or convert is released on its own, a failing load releases the
+    whole batch. Returns the number of done, failed and lost jobs - lost
+    jobs were loaded after their lease had passed to another worker.
+
+    Leases are extended from a background thread while a batch converts and
+    loads, so a slow load does not lose its jobs.
+    """
+    if converter_cls is None:
+        from sqlsofa.converters.football_match_converter import FootballMatchConverter
+
+        converter_cls = FootballMatchConverter
+    worker = worker or default_worker_id()
+    # Heartbeat well before the lease runs out
+    heartbeat_every = queue.lease.total_seconds() / 3
+
+    counts = {"done": 0, "failed": 0, "lost": 0}
+    batches = 0
+    while max_batches is None or batches < max_batches:
+        match_ids = queue.claim(worker, batch_size)
+        if not match_ids:
+            break
+        batches += 1
+        with keep_alive(queue, worker, match_ids, heartbeat_every):
+            done, failed = _process(
+                queue, fetch_match, loader, converter_cls, worker, match_ids
+            )
+        counts["failed"] += failed
+        if done:
+            completed = queue.complete(worker, done)
+            counts["done"] += completed
+            counts["lost"] += len(done) - completed
+
+    logger.info(f"Worker {worker} finished after {batches} batches: {counts}")
+    return counts
+
+
+def _process(
+    queue: JobQueue,
+    fetch_match: Callable[[int], Any],
+    loader: BaseLoader,
+    converter_cls: Callable[..., Any],
+    worker: str,
+    match_ids: List[int],
+) -> Tuple[List[int], int]:
+    """Convert and load one claimed batch, returns the loaded ids and failures"""
+    results, converted, failed = [], [], 0
+    for match_id in match_ids:
+        try:
+            results.append(converter_cls(fetch_match(match_id)).convert())
+            converted.append(match_id)
+        except Exception as e:
+            logger.error(f"Worker {worker} could not convert match {match_id}: {e}")
+            queue.fail(worker, match_id, e)
+            failed += 1
+
+    if not converted:
+        return [], failed
+    try:
+        loader.load_batch(results)
+    except Exception as e:
+        logger.error(f"Worker {worker} could not load {len(converted)} matches: {e}")
+        for match_id in converted:
+            queue.fail(worker, match_id, e)
+        return [], failed + len(converted)
+    return converted, failed
@@ -0,0 +1,146 @@
+# sqlsofa/loaders/live_loader.py
+"""
+Incremental loading of in-play matches.
+
+Live matches are re-scraped every minute, and a full load would rewrite the
+whole match each time. For matches whose event is already stored LiveLoader
+only writes what moves during play:
+
+- the event row, its status and both scores - upserted, so an unchanged
+  event is not written at all
+- incidents whose natural key (event, type, sequence) is not stored yet -
+  the sequence is the sofascore incident id where there is one, so late
+  incidents do not move the others. Stored incidents missing from a
+  complete incidents component (removed after a VAR review) are deleted,
+  one DELETE per match that lost any
+- graph points after the last stored minute
+
+Teams, venue, lineups and statistics are left alone once stored. Matches not
+stored yet are loaded in full. The stored state of a batch is read in two
+queries, so a refresh costs a handful of small statements per batch.
+"""
+
+import logging
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Sequence, Set, Tuple
+
+from sqlalchemy import func, select
+from sqlmodel import Session
+
+from sqlsofa.conf.database import open_session
+from sqlsofa.converters.compact_result import CompactResult, RowBuffer
+from sqlsofa.schema import sqlmodels as sqlschema
+
+from .base_loader import delete_missing_incidents, incident_keys
+from .bulk_loader import BulkLoader
+
+logger = logging.getLogger(__name__)
+
+# Tables refreshed as a whole, the event row and the rows it links to
+LIVE_TABLES = ("statuses", "scores", "events")
+
+
+@dataclass
+class StoredMatch:
+    """What the database already holds of a live match"""
+
+    last_minute: Optional[float] = None
+    # (incidentType, sequence) of the stored incidents
+    incidents: Set[Tuple[str, int]] = field(default_factory=set)
+
+
+def load_stored(session: Session, match_ids: Sequence[int]) -> Dict[int, StoredMatch]:
+    """StoredMatch per stored event of ``match_ids``"""
+    Event, GraphPoint, Incident = (
+        sqlschema.Event,
+        sqlschema.GraphPoint,
+        sqlschema.Incident,
+    )
+    last_minute = (
+        select(func.max(GraphPoint.minute))
+        .where(GraphPoint.event_id == Event.id)
+        .scalar_subquery()
+    )
+    stored = {
+        event_id: StoredMatch(last_minute=minute)
+        for event_id, minute in session.execute(
+            select(Event.id, last_minute).where(Event.id.in_(sorted(set(match_ids))))
+        )
+    }
+    if stored:
+        for event_id, incident_type, sequence in session.execute(
+            select(Incident.event_id, Incident.incidentType, Incident.sequence).where(
+                Incident.event_id.in_(sorted(stored))
+            )
+        ):
+            stored[event_id].incidents.add((incident_type, sequence))
+    return stored
+
+
+def _filtered(buffer: Optional[RowBuffer], keep) -> Optional[RowBuffer]:
+    if not buffer:
+        return None
+    filtered = RowBuffer(buffer.table)
+    filtered.rows = [row for row in buffer.rows if keep(dict(zip(buffer.columns, row)))]
+    return filtered if filtered.rows else None
+
+
+def live_rows(result: CompactResult, stored: StoredMatch) -> CompactResult:
+    """The rows of ``result`` a live refresh writes, see the module docstring"""
+    live = CompactResult(
+        match_id=result.match_id,
+        processed_components=dict(result.processed_components),
+    )
+    # Only the new incidents are sent, stored ones must not be pruned as gone
+    live.processed_components.pop("incidents", None)
+    # Whole buffers, the event row refers to status and score rows by index
+    for table in LIVE_TABLES:
+        if result.tables.get(table):
+            live.tables[table] = result.tables[table]
+
+    incidents = _filtered(
+        result.tables.get("incidents"),
+        lambda row: (row["incidentType"], row["sequence"]) not in stored.incidents,
+    )
+    graph_points = _filtered(
+        result.tables.get("graph_points"),
+        lambda row: stored.last_minute is None or row["minute"] > stored.last_minute,
+    )
+    if incidents is not None:
+        live.tables["incidents"] = incidents
+    if graph_points is not None:
+        live.tables["graph_points"] = graph_points
+    return live
+
+
+class LiveLoader(BulkLoader):
+    """BulkLoader for in-play refreshes, stored matches only get their live rows"""
+
+    def _load(
+        self, results: List[CompactResult]
+    ) -> Tuple[Dict[str, int], Dict[str, int]]:
+        with open_session(self.engine) as session:
+            stored = load_stored(session, [r.match_id for r in results])
+            for result in results:
+                keys = incident_keys(result)
+                if (
+                    result.match_id in stored
+                    and keys is not None
+                    and stored[result.match_id].incidents - keys
+                ):
+                    delete_missing_incidents(session, result.match_id, keys)
+            session.commit()
+        logger.info(
+            f"Live refresh of {len(stored)} stored matches, "
+            f"{len(results) - len(stored)} loaded in full"
+        )
+        return super()._load(
+            [
+                (
+                    live_rows(result, stored[result.match_id])
+                    if result.match_id in stored
+                    else result
+                )
+                for result in results
+            ]
+        )
@@ -0,0 +1,146 @@
+# sqlsofa/loaders/season_sync.py
+"""
+Set-based sync of converted seasons lists.
+
+The converted seasons are compared with the stored rows in one query and
+split into insert, update and unchanged sets, which are then written with
+one executemany each. A poll where nothing changed costs the single read,
+or nothing at all when a warm ReferenceCache already knows every season.
+"""
+
+import logging
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import TYPE_CHECKING, Any, Dict, List, Optional
+
+from sqlalchemy import bindparam, select, update
+from sqlalchemy.engine import Connection, Engine
+
+from sqlsofa.conf.database import open_session
+from sqlsofa.schema import sqlmodels as sqlschema
+from sqlsofa.utils.reference_cache import IGNORED_COLUMNS, ReferenceCache
+
+from .bulk_loader import dialect_insert
+
+if TYPE_CHECKING:
+    from sqlsofa.general.seasonsConverter import SeasonsComponentConverter
+
+logger = logging.getLogger(__name__)
+
+SEASON_COLUMNS = tuple(
+    c.name for c in sqlschema.Season.__table__.columns if c.name not in IGNORED_COLUMNS
+)
+
+
+@dataclass
+class SeasonDiff:
+    """Season ids of a converted list by what the database holds"""
+
+    insert: List[int] = field(default_factory=list)
+    update: List[int] = field(default_factory=list)
+    unchanged: List[int] = field(default_factory=list)
+
+    @property
+    def has_changes(self) -> bool:
+        return bool(self.insert or self.update)
+
+
+def season_rows(converter: "SeasonsComponentConverter") -> Dict[int, Dict[str, Any]]:
+    """Converted seasons as id -> column values"""
+    return {
+        season_id: {c: getattr(season, c) for c in SEASON_COLUMNS}
+        for season_id, season in converter.seasons.items()
+    }
+
+
+def diff_seasons(
+    conn: Connection, rows: Dict[int, Dict[str, Any]], ids: Optional[List[int]] = None
+) -> SeasonDiff:
+    """Split ``rows`` against the stored seasons, reading ``ids`` (default all)"""
+    ids = sorted(rows) if ids is None else ids
+    diff = SeasonDiff()
+    if not ids:
+        return diff
+    table = sqlschema.Season.__table__
+    stored = {
+        row["id"]: dict(row)
+        for row in conn.execute(
+            select(*(table.c[c] for c in SEASON_COLUMNS)).where(table.c.id.in_(ids))
+        ).mappings()
+    }
+    for season_id in ids:
+        current = stored.get(season_id)
+        if current is None:
+            diff.insert.append(season_id)
+        elif current != rows[season_id]:
+            diff.update.append(season_id)
+        else:
+            diff.unchanged.append(season_id)
+    return diff
+
+
+def apply_season_diff(
+    conn: Connection, rows: Dict[int, Dict[str, Any]], diff: SeasonDiff
+) -> None:
+    """One executemany for the inserts and one for the updates"""
+    table = sqlschema.Season.__table__
+    if diff.insert:
+        now = datetime.now()
+        # Upserted - a concurrent poller may have inserted them since the diff
+        stmt = dialect_insert(conn, table)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=["id"],
+            set_={c: stmt.excluded[c] for c in SEASON_COLUMNS if c != "id"},
+        )
+        conn.execute(stmt, [{**rows[i], "created_at": now} for i in diff.insert])
+    if diff.update:
+        columns = [c for c in SEASON_COLUMNS if c != "id"]
+        stmt = (
+            update(table)
+            .where(table.c.id == bindparam("season_id"))
+            .values({c: bindparam(f"new_{c}") for c in columns})
+        )
+        conn.execute(
+            stmt,
+            [
+                {"season_id": i, **{f"new_{c}": rows[i][c] for c in columns}}
+                for i in diff.update
+            ],
+        )
+
+
+def sync_seasons(
+    engine: Engine,
+    converter: "SeasonsComponentConverter",
+    reference_cache: Optional[ReferenceCache] = None,
+) -> SeasonDiff:
+    """Write the new and changed seasons of a converted seasons list"""
+    table = sqlschema.Season.__tablename__
+    reference_cache = reference_cache or converter.reference_cache
+    rows = season_rows(converter)
+
+    # Seasons the cache knows to be stored unchanged are not read again
+    known, to_check = [], []
+    for season_id in sorted(rows):
+        if reference_cache is not None and reference_cache.is_current(
+            table, rows[season_id]
+        ):
+            known.append(season_id)
+        else:
+            to_check.append(season_id)
+
+    with open_session(engine, bulk=True) as session:
+        conn = session.connection()
+        diff = diff_seasons(conn, rows, to_check)
+        diff.unchanged = sorted(diff.unchanged + known)
+        if diff.has_changes:
+            apply_season_diff(conn, rows, diff)
+            session.commit()
+
+    if reference_cache is not None:
+        reference_cache.remember_all(table, rows.values())
+    logger.info(
+        f"Seasons sync: {len(diff.insert)} inserted, {len(diff.update)} updated, "
+        f"{len(diff.unchanged)} unchanged"
+    )
+    return diff
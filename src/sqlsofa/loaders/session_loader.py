@@ -0,0 +1,88 @@
+# sqlsofa/loaders/session_loader.py
+
+import logging
+from typing import Any, Dict, List, Tuple
+
+from sqlmodel import Session
+
+from sqlsofa.conf.database import open_session
+from sqlsofa.converters.compact_result import CompactResult
+from sqlsofa.utils.entity_helper import EntityHelper
+from sqlsofa.utils.sql_stats import phase
+
+from .base_loader import LOAD_ORDER, BaseLoader, IdMap
+
+logger = logging.getLogger(__name__)
+
+
+class SessionLoader(BaseLoader):
+    """
+    ORM loader - get-or-create every entity through a session.
+
+    One transaction per match. Simple and safe, but issues a lookup per keyed
+    row and flushes child tables level by level. Stored rows whose values did
+    not change are not flushed as updates.
+    """
+
+    def _load(
+        self, results: List[CompactResult]
+    ) -> Tuple[Dict[str, int], Dict[str, int]]:
+        counts: Dict[str, int] = {spec.tablename: 0 for spec in LOAD_ORDER}
+        unchanged: Dict[str, int] = {}
+        for result in results:
+            written: List[Tuple[str, Dict[str, Any]]] = []
+            with phase("load", result.match_id), open_session(
+                self.engine, bulk=True
+            ) as session:
+                match_counts, match_unchanged = self._load_match(
+                    session, result, written
+                )
+                for table, rows in match_counts.items():
+                    counts[table] += rows
+                for table, rows in match_unchanged.items():
+                    unchanged[table] = unchanged.get(table, 0) + rows
+                session.commit()
+            self._remember(written)
+        return counts, unchanged
+
+    def _load_match(
+        self,
+        session: Session,
+        result: CompactResult,
+        written: List[Tuple[str, Dict[str, Any]]],
+    ) -> Tuple[Dict[str, int], Dict[str, int]]:
+        helper = EntityHelper(session)
+        ids: IdMap = {}
+        counts: Dict[str, int] = {}
+        unchanged: Dict[str, int] = {}
+
+        self._prune_incidents(session, [result])
+        for spec in LOAD_ORDER:
+            buffer = result.tables.get(spec.tablename)
+            if not buffer:
+                continue
+            stored = []
+            for index, row in enumerate(buffer.rows):
+                values = self._row_values(buffer, row, ids, scope=None)
+                if self._is_stored(spec, values):
+                    continue
+                # A key with NULLs never matches a stored row
+                if spec.conflict and None not in (values[k] for k in spec.conflict):
+                    obj = helper.get_or_create(spec.model, values, spec.conflict)
+                    # Equal values leave no attribute history, nothing to flush
+                    if obj not in session.new and not session.is_modified(obj):
+                        unchanged[spec.tablename] = unchanged.get(spec.tablename, 0) + 1
+                else:
+                    obj = spec.model(**values)
+                    session.add(obj)
+                stored.append((index, obj))
+                if spec.has_source_id:
+                    written.append((spec.tablename, values))
+
+            # Flush so generated ids are available to the next level
+            session.flush()
+            for index, obj in stored:
+                ids[(None, spec.tablename, index)] = obj.id
+            counts[spec.tablename] = len(stored)
+
+        return counts, unchanged
@@ -0,0 +1,266 @@
+# sqlsofa/loaders/summaries.py
+"""
+Summary tables derived from events and scores - season standings, team form
+and head-to-head records.
+
+Plain tables instead of materialized views so they work on every backend
+and can be rebuilt for one season at a time. The loaders call
+``refresh_summaries`` for the seasons touched by a batch once it commits.
+"""
+
+import logging
+from collections import defaultdict
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+
+from sqlalchemy import and_, delete, insert, or_, select, tuple_
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import aliased
+from sqlmodel import Session
+
+from sqlsofa.conf.database import open_session
+from sqlsofa.converters.compact_result import CompactResult
+from sqlsofa.schema import sqlmodels as sqlschema
+
+logger = logging.getLogger(__name__)
+
+# Number of most recent matches in TeamForm
+FORM_LENGTH = 5
+POINTS = {"W": 3, "D": 1, "L": 0}
+# Event.winnerCode: 1 home win, 2 away win, 3 draw
+OUTCOMES = {1: ("W", "L"), 2: ("L", "W"), 3: ("D", "D")}
+
+
+@dataclass
+class FinishedMatch:
+    event_id: int
+    tournament_id: Optional[int]
+    home_team_id: int
+    away_team_id: int
+    home_goals: int
+    away_goals: int
+    winner_code: int
+
+
+def finished_matches(session: Session, *criteria: Any) -> List[FinishedMatch]:
+    """Decided events matching ``criteria`` in kick-off order"""
+    Event = sqlschema.Event
+    home_score = aliased(sqlschema.Score)
+    away_score = aliased(sqlschema.Score)
+    stmt = (
+        select(
+            Event.id,
+            Event.tournament_id,
+            Event.home_team_id,
+            Event.away_team_id,
+            home_score.current,
+            away_score.current,
+            Event.winnerCode,
+        )
+        .outerjoin(home_score, Event.home_score_id == home_score.id)
+        .outerjoin(away_score, Event.away_score_id == away_score.id)
+        .where(
+            Event.winnerCode.in_(list(OUTCOMES)),
+            Event.home_team_id.is_not(None),
+            Event.away_team_id.is_not(None),
+            *criteria,
+        )
+        .order_by(Event.startTimestamp, Event.id)
+    )
+    return [
+        FinishedMatch(
+            event_id=row[0],
+            tournament_id=row[1],
+            home_team_id=row[2],
+            away_team_id=row[3],
+            home_goals=row[4] or 0,
+            away_goals=row[5] or 0,
+            winner_code=row[6],
+        )
+        for row in session.execute(stmt)
+    ]
+
+
+def season_pairs(session: Session, season_id: int) -> Set[Tuple[int, int]]:
+    """
+    (low id, high id) team pairs of every event of a season, decided or not,
+    so records of pairs whose matches became undecided are rebuilt too
+    """
+    Event = sqlschema.Event
+    stmt = (
+        select(Event.home_team_id, Event.away_team_id)
+        .where(
+            Event.season_id == season_id,
+            Event.home_team_id.is_not(None),
+            Event.away_team_id.is_not(None),
+        )
+        .distinct()
+    )
+    return {tuple(sorted(row)) for row in session.execute(stmt)}  # type: ignore
+
+
+def refresh_season(session: Session, season_id: int) -> Set[Tuple[int, int]]:
+    """Rebuild standings and form of a season, returns its team pairs"""
+    matches = finished_matches(session, sqlschema.Event.season_id == season_id)
+
+    totals: Dict[int, Dict[str, int]] = defaultdict(
+        lambda: {k: 0 for k in ("played", "won", "drawn", "lost", "gf", "ga")}
+    )
+    results: Dict[int, List[Tuple[str, int, int, int]]] = defaultdict(list)
+    tournament_id = None
+    for match in matches:
+        tournament_id = match.tournament_id or tournament_id
+        home_outcome, away_outcome = OUTCOMES[match.winner_code]
+        for team_id, outcome, gf, ga in (
+            (match.home_team_id, home_outcome, match.home_goals, match.away_goals),
+            (match.away_team_id, away_outcome, match.away_goals, match.home_goals),
+        ):
+            team = totals[team_id]
+            team["played"] += 1
+            team[{"W": "won", "D": "drawn", "L": "lost"}[outcome]] += 1
+            team["gf"] += gf
+            team["ga"] += ga
+            results[team_id].append((outcome, gf, ga, match.event_id))
+
+    table = []
+    for team_id, team in totals.items():
+        table.append(
+            {
+                "season_id": season_id,
+                "team_id": team_id,
+                "tournament_id": tournament_id,
+                "played": team["played"],
+                "won": team["won"],
+                "drawn": team["drawn"],
+                "lost": team["lost"],
+                "goals_for": team["gf"],
+                "goals_against": team["ga"],
+                "goal_difference": team["gf"] - team["ga"],
+                "points": 3 * team["won"] + team["drawn"],
+            }
+        )
+    table.sort(
+        key=lambda r: (
+            -r["points"],
+            -r["goal_difference"],
+            -r["goals_for"],
+            r["team_id"],
+        )
+    )
+    for position, row in enumerate(table, start=1):
+        row["position"] = position
+
+    form = []
+    for team_id, team_results in results.items():
+        recent = team_results[-FORM_LENGTH:]
+        form.append(
+            {
+                "season_id": season_id,
+                "team_id": team_id,
+                "form": "".join(outcome for outcome, _, _, _ in recent),
+                "points": sum(POINTS[outcome] for outcome, _, _, _ in recent),
+                "goals_for": sum(gf for _, gf, _, _ in recent),
+                "goals_against": sum(ga for _, _, ga, _ in recent),
+                "last_event_id": recent[-1][3],
+            }
+        )
+
+    _replace(session, sqlschema.SeasonStanding, table, season_id=season_id)
+    _replace(session, sqlschema.TeamForm, form, season_id=season_id)
+    return season_pairs(session, season_id)
+
+
+def refresh_head_to_head(session: Session, pairs: Iterable[Tuple[int, int]]) -> None:
+    """Rebuild the all-time records of the given (low id, high id) team pairs"""
+    pairs = sorted(set(pairs))
+    if not pairs:
+        return
+    Event = sqlschema.Event
+    matches = finished_matches(
+        session,
+        or_(
+            tuple_(Event.home_team_id, Event.away_team_id).in_(pairs),
+            tuple_(Event.away_team_id, Event.home_team_id).in_(pairs),
+        ),
+    )
+
+    records: Dict[Tuple[int, int], Dict[str, Any]] = {}
+    for match in matches:
+        team_a, team_b = sorted((match.home_team_id, match.away_team_id))
+        record = records.setdefault(
+            (team_a, team_b),
+            {
+                "team_a_id": team_a,
+                "team_b_id": team_b,
+                "played": 0,
+                "team_a_wins": 0,
+                "team_b_wins": 0,
+                "draws": 0,
+                "team_a_goals": 0,
+                "team_b_goals": 0,
+            },
+        )
+        a_is_home = match.home_team_id == team_a
+        a_goals, b_goals = (
+            (match.home_goals, match.away_goals)
+            if a_is_home
+            else (match.away_goals, match.home_goals)
+        )
+        a_outcome = OUTCOMES[match.winner_code][0 if a_is_home else 1]
+        record["played"] += 1
+        record["team_a_goals"] += a_goals
+        record["team_b_goals"] += b_goals
+        if a_outcome == "D":
+            record["draws"] += 1
+        elif a_outcome == "W":
+            record["team_a_wins"] += 1
+        else:
+            record["team_b_wins"] += 1
+        record["last_event_id"] = match.event_id
+
+    model = sqlschema.HeadToHead
+    session.execute(
+        delete(model).where(tuple_(model.team_a_id, model.team_b_id).in_(pairs))
+    )
+    _insert(session, model, list(records.values()))
+
+
+def _replace(session: Session, model: Any, rows: List[Dict[str, Any]], **key) -> None:
+    session.execute(
+        delete(model).where(and_(*(getattr(model, k) == v for k, v in key.items())))
+    )
+    _insert(session, model, rows)
+
+
+def _insert(session: Session, model: Any, rows: List[Dict[str, Any]]) -> None:
+    if not rows:
+        return
+    now = datetime.now()
+    session.execute(insert(model), [{**row, "updated_at": now} for row in rows])
+
+
+def refresh_summaries(engine: Engine, season_ids: Iterable[int]) -> None:
+    """Rebuild the summary tables of ``season_ids`` in one transaction"""
+    season_ids = sorted(set(season_ids))
+    if not season_ids:
+        return
+    with open_session(engine, bulk=True) as session:
+        pairs: Set[Tuple[int, int]] = set()
+        for season_id in season_ids:
+            pairs |= refresh_season(session, season_id)
+        refresh_head_to_head(session, pairs)
+        session.commit()
+    logger.info(f"Refreshed summaries for seasons {season_ids}")
+
+
+def affected_seasons(results: Iterable[CompactResult]) -> Set[int]:
+    """Seasons of the events in ``results``"""
+    seasons = set()
+    for result in results:
+        events = result.tables.get(sqlschema.Event.__tablename__)
+        if events is None:
+            continue
+        column = events.columns.index("season_id")
+        seasons.update(row[column] for row in events.rows if row[column] is not None)
+    return seasons
@@ -0,0 +1,25 @@
+from typing import TYPE_CHECKING
+
+from sqlsofa.utils.lazy import attach
+
+if TYPE_CHECKING:
+    from .cache import TTLCache
+    from .queries import (
+        MatchReader,
+        match_options,
+        match_query,
+        player_history_query,
+        season_fixtures_query,
+    )
+
+__getattr__, __dir__, __all__ = attach(
+    __name__,
+    {
+        "MatchReader": ".queries",
+        "TTLCache": ".cache",
+        "match_options": ".queries",
+        "match_query": ".queries",
+        "player_history_query": ".queries",
+        "season_fixtures_query": ".queries",
+    },
+)
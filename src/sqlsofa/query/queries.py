@@ -0,0 +1,147 @@
+# sqlsofa/query/queries.py
+"""
+Eager-loading query builders for the common read shapes.
+
+To-one relationships are joined into the main query, collections are
+fetched with one ``selectinload`` query per level. A full match page is a
+fixed handful of statements however many players, stats or incidents it has.
+"""
+
+import logging
+from typing import List, Optional
+
+from sqlalchemy import or_, select
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import contains_eager, joinedload, selectinload
+from sqlalchemy.sql import Select
+from sqlmodel import Session
+
+from sqlsofa.conf.database import open_session
+from sqlsofa.schema import sqlmodels as sqlschema
+
+from .cache import TTLCache
+
+logger = logging.getLogger(__name__)
+
+Event = sqlschema.Event
+
+
+def fixture_options() -> list:
+    """Teams, scores and status of an event - the fixture list shape"""
+    return [
+        joinedload(Event.home_team),
+        joinedload(Event.away_team),
+        joinedload(Event.home_score),
+        joinedload(Event.away_score),
+        joinedload(Event.status),
+    ]
+
+
+def match_options() -> list:
+    """Everything shown on a match page"""
+    lineup_entries = (
+        selectinload(Event.football_lineups)
+        .selectinload(sqlschema.FootballLineup.lineups)
+        .selectinload(sqlschema.TeamLineup.players)
+    )
+    return fixture_options() + [
+        joinedload(Event.tournament),
+        joinedload(Event.season),
+        joinedload(Event.venue),
+        joinedload(Event.round_info),
+        selectinload(Event.football_stats)
+        .selectinload(sqlschema.FootballStatisticPeriod.groups)
+        .selectinload(sqlschema.StatisticGroup.statistics_items),
+        selectinload(Event.football_lineups)
+        .selectinload(sqlschema.FootballLineup.lineups)
+        .joinedload(sqlschema.TeamLineup.team),
+        lineup_entries.joinedload(sqlschema.LineupPlayerEntry.player),
+        lineup_entries.joinedload(sqlschema.LineupPlayerEntry.statistics),
+        selectinload(Event.incidents),
+    ]
+
+
+def match_query(event_id: int) -> Select:
+    return select(Event).where(Event.id == event_id).options(*match_options())
+
+
+def season_fixtures_query(season_id: int, team_id: Optional[int] = None) -> Select:
+    stmt = select(Event).where(Event.season_id == season_id)
+    if team_id is not None:
+        stmt = stmt.where(
+            or_(Event.home_team_id == team_id, Event.away_team_id == team_id)
+        )
+    return stmt.options(*fixture_options()).order_by(Event.startTimestamp, Event.id)
+
+
+def player_history_query(player_id: int, limit: Optional[int] = None) -> Select:
+    """A player's lineup entries with their match, newest first"""
+    Entry = sqlschema.LineupPlayerEntry
+    # The joins needed for ordering double as the eager load of the event
+    event = (
+        contains_eager(Entry.team_lineup)
+        .contains_eager(sqlschema.TeamLineup.football_lineup)
+        .contains_eager(sqlschema.FootballLineup.event)
+    )
+    return (
+        select(Entry)
+        .join(Entry.team_lineup)
+        .join(sqlschema.TeamLineup.football_lineup)
+        .join(sqlschema.FootballLineup.event)
+        .where(Entry.player_id == player_id)
+        .options(
+            joinedload(Entry.team),
+            joinedload(Entry.statistics),
+            event.joinedload(Event.home_team),
+            event.joinedload(Event.away_team),
+            event.joinedload(Event.home_score),
+            event.joinedload(Event.away_score),
+        )
+        .order_by(Event.startTimestamp.desc(), Event.id.desc())
+        .limit(limit)
+    )
+
+
+class MatchReader:
+    """
+    Read API over a sqlsofa database.
+
+    Results are detached ORM objects with the relationships above already
+    loaded. Full matches are cached by event id; call ``invalidate`` after
+    (re)loading a match.
+    """
+
+    def __init__(self, engine: Engine, cache: Optional[TTLCache] = None) -> None:
+        self.engine = engine
+        self.cache = cache if cache is not None else TTLCache()
+
+    def _session(self) -> Session:
+        # Objects outlive the session, never expire what was loaded
+        return open_session(self.engine, expire_on_commit=False)
+
+    def match(self, event_id: int) -> Optional[sqlschema.Event]:
+        """A match with teams, score, stats, lineups and incidents"""
+        return self.cache.get_or_load(event_id, lambda: self._load_match(event_id))
+
+    def _load_match(self, event_id: int) -> Optional[sqlschema.Event]:
+        with self._session() as session:
+            return session.execute(match_query(event_id)).unique().scalars().first()
+
+    def season_fixtures(
+        self, season_id: int, team_id: Optional[int] = None
+    ) -> List[sqlschema.Event]:
+        """A season's events in kick-off order, optionally for one team"""
+        with self._session() as session:
+            stmt = season_fixtures_query(season_id, team_id)
+            return list(session.execute(stmt).unique().scalars())
+
+    def player_history(
+        self, player_id: int, limit: Optional[int] = None
+    ) -> List[sqlschema.LineupPlayerEntry]:
+        """A player's appearances, newest first"""
+        with self._session() as session:
+            stmt = player_history_query(player_id, limit)
+            return list(session.execute(stmt).unique().scalars())
+
+    def invalidate(self, event_id: Optional[int] = None) -> None:
+        self.cache.invalidate(event_id)
@@ -3,6 +3,7 @@ from datetime import datetime
 from enum import Enum
 from typing import Any, List, Optional, Tuple
 
+from sqlalchemy import UniqueConstraint
 from sqlmodel import Field, Relationship, SQLModel
 
 logger = logging.getLogger(__name__)
@@ -216,6 +217,10 @@ class Venue(HashBaseSQLModel, table=True):  # type: ignore
 
 class TeamColors(HashBaseSQLModel, table=True):  # type: ignore
     __tablename__ = "team_colors"
+    # Value rows - teams with the same colours share one row
+    __table_args__ = (
+        UniqueConstraint("primary", "secondary", "text", name="uq_team_colors_value"),
+    )
 
     id: Optional[int] = Field(default=None, primary_key=True)
     primary: str
@@ -363,6 +368,17 @@ class TimeFootball(HashBaseSQLModel, table=True):  # type: ignore
 
 class Score(HashBaseSQLModel, table=True):  # type: ignore
     __tablename__ = "scores"
+    # Value rows - an unchanged score keeps its id across reloads
+    __table_args__ = (
+        UniqueConstraint(
+            "current",
+            "display",
+            "period1",
+            "period2",
+            "normaltime",
+            name="uq_scores_value",
+        ),
+    )
 
     id: Optional[int] = Field(default=None, primary_key=True)
     current: int = 0
@@ -496,6 +512,9 @@ class Event(HashBaseSQLModel, table=True):  # type: ignore
 
 class PlayerStatistics(HashBaseSQLModel, table=True):  # type: ignore
     __tablename__ = "player_statistics"
+    __table_args__ = (
+        UniqueConstraint("event_id", "player_id", name="uq_player_statistics_key"),
+    )
 
     id: Optional[int] = Field(default=None, primary_key=True)
     # Passing stats
@@ -555,6 +574,10 @@ class PlayerStatistics(HashBaseSQLModel, table=True):  # type: ignore
 
     created_at: datetime = Field(default_factory=datetime.now)
 
+    # Natural key - filled from the lineup when the match is compacted
+    event_id: Optional[int] = Field(default=None, foreign_key="events.id")
+    player_id: Optional[int] = Field(default=None, foreign_key="lineup_players.id")
+
     # Relationships
     lineup_entries: List["LineupPlayerEntry"] = Relationship(
         back_populates="statistics"
@@ -563,6 +586,11 @@ class PlayerStatistics(HashBaseSQLModel, table=True):  # type: ignore
 
 class LineupPlayerEntry(HashBaseSQLModel, table=True):  # type: ignore
     __tablename__ = "lineup_player_entries"
+    __table_args__ = (
+        UniqueConstraint(
+            "team_lineup_id", "player_id", name="uq_lineup_player_entries_key"
+        ),
+    )
 
     id: Optional[int] = Field(default=None, primary_key=True)
     shirtNumber: Optional[int] = None
@@ -591,6 +619,12 @@ class LineupPlayerEntry(HashBaseSQLModel, table=True):  # type: ignore
 
 class PlayerColor(HashBaseSQLModel, table=True):  # type: ignore
     __tablename__ = "player_colors"
+    # Value rows - kits with the same colours share one row
+    __table_args__ = (
+        UniqueConstraint(
+            "primary", "number", "outline", "fancyNumber", name="uq_player_colors_value"
+        ),
+    )
 
     id: Optional[int] = Field(default=None, primary_key=True)
     primary: Optional[str] = None
@@ -612,6 +646,9 @@ class PlayerColor(HashBaseSQLModel, table=True):  # type: ignore
 
 class TeamLineup(HashBaseSQLModel, table=True):  # type: ignore
     __tablename__ = "team_lineups"
+    __table_args__ = (
+        UniqueConstraint("football_lineup_id", "is_home", name="uq_team_lineups_key"),
+    )
 
     id: Optional[int] = Field(default=None, primary_key=True)
     formation: Optional[str] = None
@@ -644,6 +681,7 @@ class TeamLineup(HashBaseSQLModel, table=True):  # type: ignore
 
 class FootballLineup(HashBaseSQLModel, table=True):  # type: ignore
     __tablename__ = "football_lineups"
+    __table_args__ = (UniqueConstraint("event_id", name="uq_football_lineups_key"),)
 
     id: Optional[int] = Field(default=None, primary_key=True)
     confirmed: bool = False
@@ -664,6 +702,11 @@ class FootballLineup(HashBaseSQLModel, table=True):  # type: ignore
 
 class FootballStatisticItem(HashBaseSQLModel, table=True):  # type: ignore
     __tablename__ = "football_statistic_items"
+    __table_args__ = (
+        UniqueConstraint(
+            "statistic_group_id", "key", name="uq_football_statistic_items_key"
+        ),
+    )
 
     id: Optional[int] = Field(default=None, primary_key=True)
     key: str
@@ -693,6 +736,11 @@ class FootballStatisticItem(HashBaseSQLModel, table=True):  # type: ignore
 
 class StatisticGroup(HashBaseSQLModel, table=True):  # type: ignore
     __tablename__ = "statistic_groups"
+    __table_args__ = (
+        UniqueConstraint(
+            "statistic_period_id", "groupName", name="uq_statistic_groups_key"
+        ),
+    )
 
     id: Optional[int] = Field(default=None, primary_key=True)
     groupName: str
@@ -714,6 +762,11 @@ class StatisticGroup(HashBaseSQLModel, table=True):  # type: ignore
 
 class FootballStatisticPeriod(HashBaseSQLModel, table=True):  # type: ignore
     __tablename__ = "football_statistic_periods"
+    __table_args__ = (
+        UniqueConstraint(
+            "event_id", "period", name="uq_football_statistic_periods_key"
+        ),
+    )
 
     id: Optional[int] = Field(default=None, primary_key=True)
     period: str  # "ALL", "1ST", "2ND"
@@ -743,6 +796,11 @@ class Coordinates(HashBaseSQLModel, table=True):  # type: ignore
 
 class Incident(HashBaseSQLModel, table=True):  # type: ignore
     __tablename__ = "incidents"
+    __table_args__ = (
+        UniqueConstraint(
+            "event_id", "incidentType", "sequence", name="uq_incidents_key"
+        ),
+    )
 
     id: Optional[int] = Field(default=None, primary_key=True)
     incidentType: str
@@ -754,6 +812,11 @@ class Incident(HashBaseSQLModel, table=True):  # type: ignore
     periodTimeSeconds: Optional[int] = None
     isHome: Optional[bool] = None
     isLive: Optional[bool] = None
+    # Sofascore id of the typed incident, period and injury time have none
+    source_id: Optional[int] = None
+    # Key within the match and type, filled when the match is compacted: the
+    # source id, or for id-less incidents -1, -2, .. in match-time order
+    sequence: Optional[int] = None
     created_at: datetime = Field(default_factory=datetime.now)
 
     # Foreign keys
@@ -923,6 +986,9 @@ class VarDecisionIncident(HashBaseSQLModel, table=True):  # type: ignore
 class GraphPoint(HashBaseSQLModel, table=True):  # type: ignore
     _hash_attrs = ["id", "minute"]
     __tablename__ = "graph_points"
+    __table_args__ = (
+        UniqueConstraint("event_id", "minute", name="uq_graph_points_key"),
+    )
 
     id: Optional[int] = Field(default=None, primary_key=True)
     minute: float  # Can be decimal like 45.5, 90.5 for added time
@@ -957,6 +1023,12 @@ class ComponentError(HashBaseSQLModel, table=True):  # type: ignore
     attempted_at: Optional[datetime] = None
     created_at: datetime = Field(default_factory=datetime.now)
 
+    # Dead-letter details, set for conversion failures
+    match_id: Optional[int] = Field(default=None, index=True)
+    traceback: Optional[str] = None
+    payload: Optional[str] = None  # component payload as json
+    retries: int = 0
+
     # Foreign keys
     match_result_id: Optional[int] = Field(
         default=None, foreign_key="match_scraping_results.id"
@@ -1018,6 +1090,124 @@ class SeasonScrapingResult(HashBaseSQLModel, table=True):  # type: ignore
     )
 
 
+class JobStatusEnum(str, Enum):  # type: ignore
+    PENDING = "pending"
+    RUNNING = "running"
+    DONE = "done"
+    FAILED = "failed"
+
+
+class IngestJob(HashBaseSQLModel, table=True):  # type: ignore
+    """A match to convert and load, claimed by workers via sqlsofa.loaders.job_queue"""
+
+    __tablename__ = "ingest_jobs"
+    _hash_attrs: List[str] = ["match_id"]
+
+    id: Optional[int] = Field(default=None, primary_key=True)
+    match_id: int = Field(unique=True)
+    status: JobStatusEnum = Field(default=JobStatusEnum.PENDING, index=True)
+    attempts: int = 0
+    worker: Optional[str] = None
+    # Running jobs whose lease ran out are handed to the next worker
+    leased_until: Optional[datetime] = Field(default=None, index=True)
+    heartbeat_at: Optional[datetime] = None
+    finished_at: Optional[datetime] = None
+    error_message: Optional[str] = None
+    created_at: datetime = Field(default_factory=datetime.now)
+
+
+##############################
+# Summary Tables
+##############################
+# Derived from events/scores, rebuilt per season by sqlsofa.loaders.summaries
+
+
+class SeasonStanding(HashBaseSQLModel, table=True):  # type: ignore
+    __tablename__ = "season_standings"
+    _hash_attrs: List[str] = ["season_id", "team_id"]
+
+    season_id: int = Field(primary_key=True, foreign_key="seasons.id")
+    team_id: int = Field(primary_key=True, foreign_key="teams.id")
+    tournament_id: Optional[int] = Field(default=None, foreign_key="tournaments.id")
+    position: int
+    played: int = 0
+    won: int = 0
+    drawn: int = 0
+    lost: int = 0
+    goals_for: int = 0
+    goals_against: int = 0
+    goal_difference: int = 0
+    points: int = 0
+    updated_at: datetime = Field(default_factory=datetime.now)
+
+
+class TeamForm(HashBaseSQLModel, table=True):  # type: ignore
+    __tablename__ = "team_form"
+    _hash_attrs: List[str] = ["season_id", "team_id"]
+
+    season_id: int = Field(primary_key=True, foreign_key="seasons.id")
+    team_id: int = Field(primary_key=True, foreign_key="teams.id")
+    form: str = ""  # last results, oldest first, e.g. "WDLWW"
+    points: int = 0
+    goals_for: int = 0
+    goals_against: int = 0
+    last_event_id: Optional[int] = Field(default=None, foreign_key="events.id")
+    updated_at: datetime = Field(default_factory=datetime.now)
+
+
+class HeadToHead(HashBaseSQLModel, table=True):  # type: ignore
+    """All-time record between two teams, team_a_id < team_b_id"""
+
+    __tablename__ = "head_to_head"
+    _hash_attrs: List[str] = ["team_a_id", "team_b_id"]
+
+    team_a_id: int = Field(primary_key=True, foreign_key="teams.id")
+    team_b_id: int = Field(primary_key=True, foreign_key="teams.id")
+    played: int = 0
+    team_a_wins: int = 0
+    team_b_wins: int = 0
+    draws: int = 0
+    team_a_goals: int = 0
+    team_b_goals: int = 0
+    last_event_id: Optional[int] = Field(default=None, foreign_key="events.id")
+    updated_at: datetime = Field(default_factory=datetime.now)
+
+
+class PlayerSeasonSummary(HashBaseSQLModel, table=True):  # type: ignore
+    """Season aggregates of PlayerStatistics, built by sqlsofa.analytics"""
+
+    __tablename__ = "player_season_summaries"
+    _hash_attrs: List[str] = ["season_id", "player_id"]
+
+    season_id: int = Field(primary_key=True, foreign_key="seasons.id")
+    player_id: int = Field(primary_key=True, foreign_key="lineup_players.id")
+    team_id: Optional[int] = Field(default=None, foreign_key="teams.id")
+    appearances: int = 0
+    minutes: int = 0
+    rating: Optional[float] = None
+    # Mean rating over the last appearances
+    form_rating: Optional[float] = None
+
+    # Per 90 minutes, and percentile rank among qualifying players
+    goals_p90: Optional[float] = None
+    goals_pct: Optional[float] = None
+    assists_p90: Optional[float] = None
+    assists_pct: Optional[float] = None
+    xg_p90: Optional[float] = None
+    xg_pct: Optional[float] = None
+    xa_p90: Optional[float] = None
+    xa_pct: Optional[float] = None
+    key_passes_p90: Optional[float] = None
+    key_passes_pct: Optional[float] = None
+    tackles_p90: Optional[float] = None
+    tackles_pct: Optional[float] = None
+    interceptions_p90: Optional[float] = None
+    interceptions_pct: Optional[float] = None
+    duels_won_p90: Optional[float] = None
+    duels_won_pct: Optional[float] = None
+    updated_at: datetime = Field(default_factory=datetime.now)
+
+
 # Create all tables function
 def create_all_tables(engine):
     """Create all tables in the database"""
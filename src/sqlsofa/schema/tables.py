@@ -0,0 +1,172 @@
+# sqlsofa/schema/tables.py
+"""
+Write plan for the sqlmodels - which tables the converters produce, how rows
+are identified and how children link to their parents.
+
+Shared by the compact conversion result and the loaders.
+"""
+
+import logging
+from dataclasses import dataclass
+from typing import Dict, List, Tuple, Type
+
+from sqlmodel import SQLModel
+
+from sqlsofa.schema import sqlmodels as sqlschema
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class TableSpec:
+    """How a table is written by the loaders"""
+
+    model: Type[SQLModel]
+    # Columns identifying an existing row - the source id, a natural key over
+    # other columns, or empty for rows that are always inserted
+    conflict: Tuple[str, ...] = ()
+    # (relationship attribute, foreign key column) pairs resolved at load time
+    links: Tuple[Tuple[str, str], ...] = ()
+    # Row belongs to a single match, its surrogate id may be reserved up front
+    match_scoped: bool = False
+
+    @property
+    def tablename(self) -> str:
+        return self.model.__tablename__
+
+    @property
+    def is_surrogate(self) -> bool:
+        return not self.conflict
+
+    @property
+    def has_natural_key(self) -> bool:
+        """Surrogate id table with unique key columns"""
+        return bool(self.conflict) and not self.has_source_id
+
+    @property
+    def has_source_id(self) -> bool:
+        """Rows carry the sofascore id as primary key"""
+        return self.conflict == ("id",)
+
+    @property
+    def columns(self) -> Tuple[str, ...]:
+        return tuple(column.name for column in self.model.__table__.columns)
+
+
+# Parents always come before their children
+LOAD_ORDER: List[TableSpec] = [
+    # Core entities
+    TableSpec(sqlschema.Sport, conflict=("id",)),
+    TableSpec(sqlschema.Category, conflict=("id",), links=(("sport", "sport_id"),)),
+    TableSpec(
+        sqlschema.Tournament, conflict=("id",), links=(("category", "category_id"),)
+    ),
+    TableSpec(sqlschema.Season, conflict=("id",)),
+    # Teams and related
+    TableSpec(sqlschema.Country, conflict=("slug",)),
+    TableSpec(sqlschema.TeamColors, conflict=("primary", "secondary", "text")),
+    TableSpec(sqlschema.Venue, conflict=("id",), links=(("country", "country_id"),)),
+    TableSpec(
+        sqlschema.Team,
+        conflict=("id",),
+        links=(
+            ("sport", "sport_id"),
+            ("country", "country_id"),
+            ("team_colors", "team_colors_id"),
+            ("venue", "venue_id"),
+        ),
+    ),
+    TableSpec(
+        sqlschema.Score,
+        conflict=("current", "display", "period1", "period2", "normaltime"),
+    ),
+    TableSpec(sqlschema.Status, conflict=("code",)),
+    TableSpec(
+        sqlschema.Event,
+        conflict=("id",),
+        links=(
+            ("status", "status_id"),
+            ("tournament", "tournament_id"),
+            ("season", "season_id"),
+            ("home_team", "home_team_id"),
+            ("away_team", "away_team_id"),
+            ("venue", "venue_id"),
+            ("home_score", "home_score_id"),
+            ("away_score", "away_score_id"),
+        ),
+    ),
+    TableSpec(
+        sqlschema.LineupPlayer, conflict=("id",), links=(("country", "country_id"),)
+    ),
+    TableSpec(
+        sqlschema.PlayerStatistics,
+        conflict=("event_id", "player_id"),
+        match_scoped=True,
+    ),
+    TableSpec(
+        sqlschema.PlayerColor, conflict=("primary", "number", "outline", "fancyNumber")
+    ),
+    # Statistics component
+    TableSpec(
+        sqlschema.FootballStatisticPeriod,
+        conflict=("event_id", "period"),
+        links=(("event", "event_id"),),
+        match_scoped=True,
+    ),
+    TableSpec(
+        sqlschema.StatisticGroup,
+        conflict=("statistic_period_id", "groupName"),
+        links=(("statistic_period", "statistic_period_id"),),
+        match_scoped=True,
+    ),
+    TableSpec(
+        sqlschema.FootballStatisticItem,
+        conflict=("statistic_group_id", "key"),
+        links=(("statistic_group", "statistic_group_id"),),
+        match_scoped=True,
+    ),
+    # Lineup component
+    TableSpec(
+        sqlschema.FootballLineup,
+        conflict=("event_id",),
+        links=(("event", "event_id"),),
+        match_scoped=True,
+    ),
+    TableSpec(
+        sqlschema.TeamLineup,
+        conflict=("football_lineup_id", "is_home"),
+        match_scoped=True,
+        links=(
+            ("football_lineup", "football_lineup_id"),
+            ("team", "team_id"),
+            ("player_color", "player_color_id"),
+            ("goalkeeper_color", "goalkeeper_color_id"),
+        ),
+    ),
+    TableSpec(
+        sqlschema.LineupPlayerEntry,
+        conflict=("team_lineup_id", "player_id"),
+        match_scoped=True,
+        links=(
+            ("team_lineup", "team_lineup_id"),
+            ("player", "player_id"),
+            ("team", "team_id"),
+            ("statistics", "statistics_id"),
+        ),
+    ),
+    # Incidents and graph components
+    TableSpec(
+        sqlschema.Incident,
+        conflict=("event_id", "incidentType", "sequence"),
+        links=(("event", "event_id"),),
+        match_scoped=True,
+    ),
+    TableSpec(
+        sqlschema.GraphPoint,
+        conflict=("event_id", "minute"),
+        links=(("event", "event_id"),),
+        match_scoped=True,
+    ),
+]
+
+SPECS_BY_TABLE: Dict[str, TableSpec] = {spec.tablename: spec for spec in LOAD_ORDER}
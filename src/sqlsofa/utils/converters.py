@@ -3,6 +3,7 @@ from typing import Any, Dict, List, Optional, TypedDict, Union
 import sofascrape.schemas.general as sofaschema  # type: ignore
 
 import sqlsofa.schema.sqlmodels as sqlschema
+from sqlsofa.utils.reference_cache import ReferenceCache, build
 
 ##############################
 # Type Definitions for Return Values
@@ -149,9 +150,11 @@ class FootballStatsResult(TypedDict):
 ##############################
 
 
-def sport(sport: sofaschema.SportSchema) -> sqlschema.Sport:
+def sport(
+    sport: sofaschema.SportSchema, cache: Optional[ReferenceCache] = None
+) -> sqlschema.Sport:
     """Convert single sport schema to SQLModel."""
-    return sqlschema.Sport(**sport.to_sql_dict())
+    return build(sqlschema.Sport, sport.to_sql_dict(), cache)
 
 
 def country(country: sofaschema.CountrySchema) -> sqlschema.Country:
@@ -164,9 +167,11 @@ def team_colors(colors: sofaschema.TeamColorsSchema) -> sqlschema.TeamColors:
     return sqlschema.TeamColors(**colors.to_sql_dict())
 
 
-def season(season: sofaschema.SeasonSchema) -> sqlschema.Season:
+def season(
+    season: sofaschema.SeasonSchema, cache: Optional[ReferenceCache] = None
+) -> sqlschema.Season:
     """Convert season schema to SQLModel."""
-    return sqlschema.Season(**season.to_sql_dict())
+    return build(sqlschema.Season, season.to_sql_dict(), cache)
 
 
 def status(status: sofaschema.StatusSchema) -> sqlschema.Status:
@@ -231,28 +236,32 @@ def venue(venue: sofaschema.VenueSchema) -> VenueResult:
     )
 
 
-def category(category: sofaschema.CategorySchema) -> CategoryResult:
+def category(
+    category: sofaschema.CategorySchema, cache: Optional[ReferenceCache] = None
+) -> CategoryResult:
     """
     Convert category with all dependencies.
     Returns: dict with 'sport' and 'category' keys
     """
     return CategoryResult(
-        sport=sport(category.sport),
-        category=sqlschema.Category(**category.to_sql_dict()),
+        sport=sport(category.sport, cache),
+        category=build(sqlschema.Category, category.to_sql_dict(), cache),
     )
 
 
-def tournament(tournament: sofaschema.TournamentSchema) -> TournamentResult:
+def tournament(
+    tournament: sofaschema.TournamentSchema, cache: Optional[ReferenceCache] = None
+) -> TournamentResult:
     """
     Convert tournament with all dependencies.
     Returns: dict with 'sport', 'category', and 'tournament' keys
     """
-    category_result = category(tournament.category)
+    category_result = category(tournament.category, cache)
 
     return TournamentResult(
         sport=category_result["sport"],
         category=category_result["category"],
-        tournament=sqlschema.Tournament(**tournament.to_sql_dict()),
+        tournament=build(sqlschema.Tournament, tournament.to_sql_dict(), cache),
     )
 
 
@@ -1254,6 +1263,7 @@ def football_incidents(
             time=getattr(inc, "time", None),
             addedTime=getattr(inc, "addedTime", None),
             isHome=getattr(inc, "isHome", None),
+            source_id=getattr(inc, "id", None),
             event=event,
             event_id=event.id,
         )
@@ -1,7 +1,9 @@
 import logging
-from typing import Dict, List, Union
+from typing import Any, Dict, Optional, Sequence, Type
 
-from sqlmodel import Session
+from sqlmodel import Session, SQLModel, select
+
+logger = logging.getLogger(__name__)
 
 
 class EntityHelper:
@@ -9,5 +11,39 @@ class EntityHelper:
     Utility methods for get-or create patterns with sqlmodels
     """
 
-    def __init(self, session: Session) -> None:
+    def __init__(self, session: Session) -> None:
         self.session: Session = session
+
+    def get(self, model: Type[SQLModel], keys: Dict[str, Any]) -> Optional[SQLModel]:
+        """Fetch a row by its key columns, primary key lookups go through the identity map"""
+        if list(keys) == ["id"]:
+            return self.session.get(model, keys["id"])
+        statement = select(model)
+        for column, value in keys.items():
+            statement = statement.where(getattr(model, column) == value)
+        return self.session.exec(statement).first()
+
+    def get_or_create(
+        self,
+        model: Type[SQLModel],
+        values: Dict[str, Any],
+        keys: Sequence[str],
+        update: bool = True,
+    ) -> SQLModel:
+        """
+        Return the stored row matching ``keys``, creating it from ``values`` if missing.
+
+        When ``update`` is set the existing row is refreshed with ``values``.
+        """
+        existing = self.get(model, {k: values[k] for k in keys})
+        if existing is None:
+            obj = model(**values)
+            self.session.add(obj)
+            return obj
+
+        if update:
+            for column, value in values.items():
+                if column in ("id", "created_at"):
+                    continue
+                setattr(existing, column, value)
+        return existing
@@ -0,0 +1,59 @@
+# sqlsofa/utils/json_input.py
+"""
+Raw JSON straight into pydantic schemas.
+
+``json.loads`` followed by ``Schema.model_validate`` builds the whole payload
+as Python dicts and then walks it again. ``model_validate_json`` parses and
+validates in one pass inside pydantic-core, which is several times faster and
+never materialises the intermediate dicts.
+"""
+
+import logging
+from pathlib import Path
+from typing import IO, Iterable, Iterator, Type, TypeVar, Union
+
+from pydantic import BaseModel, ValidationError
+
+logger = logging.getLogger(__name__)
+
+Schema = TypeVar("Schema", bound=BaseModel)
+JsonData = Union[bytes, bytearray, memoryview, str]
+JsonLines = Union[str, Path, IO[bytes], Iterable[bytes]]
+
+
+def validate_json(schema: Type[Schema], data: JsonData) -> Schema:
+    """``data`` validated into ``schema`` without an intermediate dict"""
+    if isinstance(data, memoryview):
+        data = data.tobytes()
+    return schema.model_validate_json(data)
+
+
+def iter_json_lines(
+    schema: Type[Schema], source: JsonLines, skip_invalid: bool = False
+) -> Iterator[Schema]:
+    """
+    Validate a JSON-lines stream one line at a time.
+
+    ``source`` is a path, a binary file or any iterable of lines. Blank lines
+    are ignored. Invalid lines raise with their line number, or are logged
+    and skipped with ``skip_invalid``.
+    """
+    if isinstance(source, (str, Path)):
+        with open(source, "rb") as f:
+            yield from iter_json_lines(schema, f, skip_invalid)
+        return
+
+    for number, line in enumerate(source, start=1):
+        if not line.strip():
+            continue
+        try:
+            yield schema.model_validate_json(line)
+        except ValidationError as e:
+            if not skip_invalid:
+                raise ValueError(
+                    f"Line {number} is not a valid {schema.__name__}"
+                ) from e
+            logger.warning(
+                f"Skipping line {number}, not a valid {schema.__name__}: "
+                f"{e.error_count()} errors"
+            )
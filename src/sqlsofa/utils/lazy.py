@@ -0,0 +1,37 @@
+"""
+Lazy attribute loading for packages.
+
+Keeps ``import sqlsofa`` and the subpackage imports cheap, submodules (and the
+sqlmodel / sofascrape imports they carry) are only loaded on first access.
+"""
+
+import importlib
+import sys
+from typing import Any, Callable, Dict, List, Tuple
+
+
+def attach(
+    package: str, exports: Dict[str, str]
+) -> Tuple[Callable[[str], Any], Callable[[], List[str]], List[str]]:
+    """
+    Build ``__getattr__``, ``__dir__`` and ``__all__`` for ``package``.
+
+    ``exports`` maps an attribute name to the relative module providing it,
+    a name mapped to its own submodule (``{"loaders": ".loaders"}``) returns
+    the submodule itself.
+    """
+
+    def __getattr__(name: str) -> Any:
+        if name not in exports:
+            raise AttributeError(f"module {package!r} has no attribute {name!r}")
+        module_name = exports[name]
+        module = importlib.import_module(module_name, package)
+        value = module if module_name == f".{name}" else getattr(module, name)
+        # Cache on the package so __getattr__ is only hit once per name
+        setattr(sys.modules[package], name, value)
+        return value
+
+    def __dir__() -> List[str]:
+        return sorted(set(vars(sys.modules[package])) | set(exports))
+
+    return __getattr__, __dir__, list(exports)
@@ -0,0 +1,174 @@
+# sqlsofa/utils/match_archive.py
+"""
+Append-only archive of scraped match payloads.
+
+Pickled scrape dumps have to be unpickled whole to read a single match, and
+unpickling runs arbitrary code. An archive is instead a data file of
+length-prefixed JSON records plus a sidecar index of fixed-size
+(match_id, offset, length) entries. Readers memory-map the data file, so a
+match is one dict lookup and a slice of the mapping - no parsing of the rest
+of the season, and processes reading the same archive share its pages.
+
+A match appended again (a re-scrape) supersedes its earlier record.
+"""
+
+import json
+import logging
+import mmap
+import struct
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, Iterator, Optional, Type, Union
+
+from .json_input import validate_json
+
+logger = logging.getLogger(__name__)
+
+MAGIC = b"SOFAARC1"
+# Record header in the data file: match id, payload length
+RECORD = struct.Struct("<qI")
+# Index entry: match id, payload offset, payload length
+INDEX_ENTRY = struct.Struct("<qQI")
+
+
+def index_path(path: Path) -> Path:
+    return path.with_name(path.name + ".idx")
+
+
+def encode_payload(payload: Any) -> bytes:
+    """JSON bytes of a pydantic model, dict or raw json"""
+    if isinstance(payload, bytes):
+        return payload
+    if isinstance(payload, str):
+        return payload.encode()
+    if hasattr(payload, "model_dump_json"):
+        return payload.model_dump_json().encode()
+    return json.dumps(payload, separators=(",", ":")).encode()
+
+
+class ArchiveWriter:
+    """Appends match payloads to an archive, creating it if needed"""
+
+    def __init__(self, path: Union[str, Path]) -> None:
+        self.path = Path(path)
+        new = not self.path.exists() or self.path.stat().st_size == 0
+        self._data = open(self.path, "ab")
+        self._index = open(index_path(self.path), "ab")
+        if new:
+            self._data.write(MAGIC)
+        self.written = 0
+
+    def append(self, match_id: int, payload: Any) -> None:
+        data = encode_payload(payload)
+        offset = self._data.tell() + RECORD.size
+        self._data.write(RECORD.pack(match_id, len(data)))
+        self._data.write(data)
+        self._index.write(INDEX_ENTRY.pack(match_id, offset, len(data)))
+        self.written += 1
+
+    def extend(self, payloads: Iterable[Any]) -> None:
+        """Append payloads carrying their own ``match_id``"""
+        for payload in payloads:
+            match_id = (
+                payload["match_id"] if isinstance(payload, dict) else payload.match_id
+            )
+            self.append(match_id, payload)
+
+    def close(self) -> None:
+        # Data first - an index entry never points past the data file
+        self._data.close()
+        self._index.close()
+        logger.info(f"Appended {self.written} matches to {self.path}")
+
+    def __enter__(self) -> "ArchiveWriter":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.close()
+
+
+class MatchArchive:
+    """
+    Random-access, read-only view of an archive.
+
+    ``raw`` returns a zero-copy memoryview of a match's JSON, ``load``
+    parses it - into a dict, or a pydantic model via ``model_validate_json``.
+    """
+
+    def __init__(self, path: Union[str, Path]) -> None:
+        self.path = Path(path)
+        self._file = open(self.path, "rb")
+        self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        if self._map[: len(MAGIC)] != MAGIC:
+            self.close()
+            raise ValueError(f"{self.path} is not a sqlsofa match archive")
+        self.index = self._read_index()
+
+    def _read_index(self) -> Dict[int, slice]:
+        size = len(self._map)
+        index = {}
+        if not index_path(self.path).exists():
+            logger.warning(f"No index for {self.path}, rebuilding it from the data")
+            return self.rebuild_index()
+        entries = index_path(self.path).read_bytes()
+        usable = len(entries) - len(entries) % INDEX_ENTRY.size
+        for match_id, offset, length in INDEX_ENTRY.iter_unpack(entries[:usable]):
+            if offset + length > size:
+                # Written while the data file was still being appended to
+                continue
+            index[match_id] = slice(offset, offset + length)
+        return index
+
+    def rebuild_index(self) -> Dict[int, slice]:
+        """Index from a scan of the data file, for archives whose sidecar is lost"""
+        index = {}
+        position = len(MAGIC)
+        size = len(self._map)
+        while position + RECORD.size <= size:
+            match_id, length = RECORD.unpack_from(self._map, position)
+            start = position + RECORD.size
+            if start + length > size:
+                break
+            index[match_id] = slice(start, start + length)
+            position = start + length
+        with open(index_path(self.path), "wb") as f:
+            for match_id, span in index.items():
+                f.write(INDEX_ENTRY.pack(match_id, span.start, span.stop - span.start))
+        self.index = index
+        return index
+
+    def __len__(self) -> int:
+        return len(self.index)
+
+    def __contains__(self, match_id: int) -> bool:
+        return match_id in self.index
+
+    def __iter__(self) -> Iterator[int]:
+        return iter(self.index)
+
+    def raw(self, match_id: int) -> memoryview:
+        """JSON bytes of a match, without copying"""
+        return memoryview(self._map)[self.index[match_id]]
+
+    def load(self, match_id: int, schema: Optional[Type[Any]] = None) -> Any:
+        """A match as a dict, or validated into ``schema``"""
+        data = self.raw(match_id)
+        try:
+            if schema is not None:
+                return validate_json(schema, data)
+            return json.loads(data.tobytes())
+        finally:
+            data.release()
+
+    def fetcher(self, schema: Optional[Type[Any]] = None) -> Callable[[int], Any]:
+        """``load`` bound to ``schema``, e.g. as the ``fetch_match`` of a worker"""
+        return lambda match_id: self.load(match_id, schema)
+
+    def close(self) -> None:
+        self._map.close()
+        self._file.close()
+
+    def __enter__(self) -> "MatchArchive":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.close()
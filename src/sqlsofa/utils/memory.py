@@ -0,0 +1,338 @@
+# sqlsofa/utils/memory.py
+"""
+Opt-in memory accounting of conversion and loading batches.
+
+Functions wrapped with ``tracked`` - ``FootballMatchConverter.convert`` and
+``BaseLoader.load_batch`` - are measured between two tracemalloc snapshots.
+Each call produces a MemoryReport with
+
+- the bytes still allocated by the call, per converter function of
+  ``utils/converters.py`` (innermost converter frame of each allocation)
+- live objects and their shallow bytes per SQLModel table class
+- leak suspects: tables, or the traced total, that kept growing across the
+  last ``leak_batches`` calls of the same name
+
+Tracking is off unless ``SQLSOFA_MEMORY_DIR`` is set or ``enable`` is called,
+reports then go to ``<directory>/memory.<pid>.jsonl``. Tracing slows
+allocations down considerably, it is meant for diagnosing batch jobs rather
+than running them.
+"""
+
+import ast
+import functools
+import gc
+import json
+import logging
+import os
+import sys
+import threading
+import time
+from collections import defaultdict, deque
+from dataclasses import asdict, dataclass, field
+from functools import lru_cache
+from pathlib import Path
+from typing import (
+    Any,
+    Callable,
+    Deque,
+    Dict,
+    List,
+    Optional,
+    Sequence,
+    Tuple,
+    TypeVar,
+    Union,
+)
+
+logger = logging.getLogger(__name__)
+
+F = TypeVar("F", bound=Callable[..., Any])
+
+CONVERTERS_FILE = str(Path(__file__).with_name("converters.py"))
+
+
+@dataclass
+class MemoryReport:
+    """Memory of one tracked call"""
+
+    name: str
+    call: int
+    duration: float
+    # Traced bytes after the call, and allocated by it and still alive
+    traced_bytes: int
+    retained_bytes: int
+    # converter function -> (bytes, blocks) allocated during the call, still alive
+    functions: Dict[str, Tuple[int, int]] = field(default_factory=dict)
+    # table -> (live objects, shallow bytes) after the call
+    tables: Dict[str, Tuple[int, int]] = field(default_factory=dict)
+    suspects: List[str] = field(default_factory=list)
+
+
+@lru_cache(maxsize=None)
+def real_path(filename: str) -> str:
+    return os.path.realpath(filename)
+
+
+@lru_cache(maxsize=None)
+def function_spans(filename: str) -> Tuple[Tuple[int, int, str], ...]:
+    """(first line, last line, name) of the top-level functions of a module"""
+    tree = ast.parse(Path(filename).read_text(), filename)
+    return tuple(
+        (node.lineno, node.end_lineno or node.lineno, node.name)
+        for node in tree.body
+        if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef))
+    )
+
+
+def function_at(filename: str, lineno: int) -> Optional[str]:
+    for first, last, name in function_spans(filename):
+        if first <= lineno <= last:
+            return name
+    return None
+
+
+def table_census() -> Dict[str, Tuple[int, int]]:
+    """Live SQLModel instances and their shallow size, per table"""
+    from sqlmodel import SQLModel
+
+    tables = {
+        mapper.class_: mapper.local_table.name
+        for mapper in SQLModel._sa_registry.mappers
+    }
+    census: Dict[str, List[int]] = defaultdict(lambda: [0, 0])
+    for obj in gc.get_objects():
+        table = tables.get(type(obj))
+        if table is None:
+            continue
+        size = sys.getsizeof(obj) + sys.getsizeof(obj.__dict__)
+        state = obj.__dict__.get("_sa_instance_state")
+        if state is not None:
+            size += sys.getsizeof(state)
+        census[table][0] += 1
+        census[table][1] += size
+    return {table: (n, size) for table, (n, size) in sorted(census.items())}
+
+
+def growing(values: Sequence[int], min_growth: int = 1) -> bool:
+    """Each value exceeds the previous by at least ``min_growth``"""
+    return len(values) > 1 and all(
+        later - earlier >= min_growth for earlier, later in zip(values, values[1:])
+    )
+
+
+class MemoryTracker:
+    """Measures ``tracked`` calls with tracemalloc, see MemoryReport"""
+
+    def __init__(
+        self,
+        directory: Optional[Union[str, Path]] = None,
+        frames: int = 25,
+        leak_batches: int = 3,
+        min_growth_bytes: int = 1 << 20,
+        attribute_files: Sequence[str] = (CONVERTERS_FILE,),
+        keep: int = 100,
+    ) -> None:
+        self.directory = Path(directory) if directory is not None else None
+        if self.directory is not None:
+            self.directory.mkdir(parents=True, exist_ok=True)
+        self.frames = frames
+        self.leak_batches = max(2, leak_batches)
+        self.min_growth_bytes = min_growth_bytes
+        self.attribute_files = {real_path(f) for f in attribute_files}
+        self.calls: Dict[str, int] = defaultdict(int)
+        self.reports: Deque[MemoryReport] = deque(maxlen=keep)
+        self._history: Dict[str, Deque[MemoryReport]] = {}
+        self._active = False
+        # Tracing was started by this tracker, and is stopped with it
+        self.started_tracing = False
+        self._lock = threading.Lock()
+
+    @property
+    def path(self) -> Optional[Path]:
+        if self.directory is None:
+            return None
+        return self.directory / f"memory.{os.getpid()}.jsonl"
+
+    def start(self) -> None:
+        import tracemalloc
+
+        if not tracemalloc.is_tracing():
+            tracemalloc.start(self.frames)
+            self.started_tracing = True
+
+    def run(self, name: str, func: Callable, args: Tuple, kwargs: Dict) -> Any:
+        """Call ``func`` between two snapshots, nested calls are not measured"""
+        with self._lock:
+            nested = self._active
+            self._active = True
+        if nested:
+            return func(*args, **kwargs)
+
+        import tracemalloc
+
+        try:
+            self.start()
+            before = tracemalloc.take_snapshot()
+            start = time.perf_counter()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                duration = time.perf_counter() - start
+                try:
+                    self._report(name, before, duration)
+                except Exception as e:
+                    logger.warning(f"Failed to account memory of {name}: {e}")
+        finally:
+            self._active = False
+
+    def _report(self, name: str, before: Any, duration: float) -> MemoryReport:
+        import tracemalloc
+
+        gc.collect()
+        after = tracemalloc.take_snapshot()
+        self.calls[name] += 1
+        # Leave out the snapshots and reports themselves
+        ignored = {tracemalloc.__file__, __file__}
+        diffs = [
+            diff
+            for diff in after.compare_to(before, "traceback")
+            if diff.traceback[-1].filename not in ignored
+        ]
+        report = MemoryReport(
+            name=name,
+            call=self.calls[name],
+            duration=duration,
+            traced_bytes=tracemalloc.get_traced_memory()[0],
+            retained_bytes=sum(d.size_diff for d in diffs),
+            functions=self._attribute(diffs),
+            tables=table_census(),
+        )
+        history = self._history.setdefault(name, deque(maxlen=self.leak_batches))
+        history.append(report)
+        report.suspects = self._suspects(history)
+
+        self.reports.append(report)
+        logger.info(
+            f"{name} #{report.call}: {report.retained_bytes / 1e6:+.1f} MB retained, "
+            f"{report.traced_bytes / 1e6:.1f} MB traced"
+        )
+        for suspect in report.suspects:
+            logger.warning(f"Leak suspect after {name} #{report.call}: {suspect}")
+        if self.path is not None:
+            with open(self.path, "a") as f:
+                f.write(json.dumps(asdict(report)) + "\n")
+        return report
+
+    def _attribute(self, diffs: Sequence[Any]) -> Dict[str, Tuple[int, int]]:
+        """Grown allocations per innermost function of the attributed files"""
+        functions: Dict[str, List[int]] = defaultdict(lambda: [0, 0])
+        for diff in diffs:
+            if diff.size_diff <= 0:
+                continue
+            # Frames run from the oldest to the most recent call
+            for frame in reversed(diff.traceback):
+                filename = real_path(frame.filename)
+                if filename not in self.attribute_files:
+                    continue
+                function = function_at(filename, frame.lineno)
+                if function is not None:
+                    module = Path(filename).stem
+                    functions[f"{module}.{function}"][0] += diff.size_diff
+                    functions[f"{module}.{function}"][1] += diff.count_diff
+                break
+        return {
+            function: (size, count)
+            for function, (size, count) in sorted(
+                functions.items(), key=lambda item: -item[1][0]
+            )
+        }
+
+    def _suspects(self, history: Sequence[MemoryReport]) -> List[str]:
+        if len(history) < self.leak_batches:
+            return []
+        suspects = []
+        traced = [r.traced_bytes for r in history]
+        if growing(traced, self.min_growth_bytes):
+            suspects.append(
+                f"traced memory grew {traced[0] / 1e6:.1f} -> "
+                f"{traced[-1] / 1e6:.1f} MB over {len(history)} calls"
+            )
+        for table in history[-1].tables:
+            counts = [r.tables.get(table, (0, 0))[0] for r in history]
+            if growing(counts):
+                suspects.append(
+                    f"{table} grew {counts[0]} -> {counts[-1]} live objects "
+                    f"over {len(history)} calls"
+                )
+        return suspects
+
+
+_tracker: Optional[MemoryTracker] = None
+
+
+def enable(
+    directory: Optional[Union[str, Path]] = None, **kwargs: Any
+) -> MemoryTracker:
+    """Account the memory of the ``tracked`` functions, see MemoryTracker"""
+    global _tracker
+    disable()
+    tracker = MemoryTracker(directory, **kwargs)
+    tracker.start()
+    _tracker = tracker
+    logger.info(f"Memory accounting enabled, reports to {_tracker.path}")
+    return _tracker
+
+
+def disable() -> None:
+    """Stop accounting, and tracing if it was started for it"""
+    global _tracker
+    if _tracker is None:
+        return
+    import tracemalloc
+
+    tracker, _tracker = _tracker, None
+    if tracker.started_tracing:
+        tracemalloc.stop()
+
+
+def active_tracker() -> Optional[MemoryTracker]:
+    return _tracker
+
+
+def enable_from_env() -> Optional[MemoryTracker]:
+    """
+    Enable accounting when SQLSOFA_MEMORY_DIR is set.
+
+    Runs on import, so bad settings only log a warning and leave accounting off.
+    """
+    directory = os.environ.get("SQLSOFA_MEMORY_DIR")
+    if not directory:
+        return None
+    try:
+        return enable(
+            directory,
+            frames=int(os.environ.get("SQLSOFA_MEMORY_FRAMES", 25)),
+            leak_batches=int(os.environ.get("SQLSOFA_MEMORY_LEAK_BATCHES", 3)),
+        )
+    except (ValueError, OSError) as e:
+        logger.warning(f"Memory accounting disabled, bad SQLSOFA_MEMORY_* value: {e}")
+        return None
+
+
+def tracked(name: str) -> Callable[[F], F]:
+    """Account the memory of calls of the decorated function when enabled"""
+
+    def decorate(func: F) -> F:
+        @functools.wraps(func)
+        def wrapper(*args: Any, **kwargs: Any) -> Any:
+            tracker = _tracker
+            if tracker is None:
+                return func(*args, **kwargs)
+            return tracker.run(name, func, args, kwargs)
+
+        return wrapper  # type: ignore[return-value]
+
+    return decorate
+
+
+enable_from_env()
@@ -0,0 +1,284 @@
+# sqlsofa/utils/profiling.py
+"""
+Sampled profiling of conversion and loading in production workers.
+
+Functions wrapped with ``profiled`` - ``FootballMatchConverter.convert`` and
+``BaseLoader.load_batch`` - run under a profiler for one in ``sample_every``
+calls. Profiles are aggregated per name and hour and written to
+``directory`` after every sample:
+
+- ``cprofile`` mode: ``<name>.<hour>.<pid>.pstats`` and a top-N table of
+  cumulative time in ``<name>.<hour>.<pid>.txt``
+- ``stack`` mode: a SIGPROF stack sampler, collapsed stacks for flamegraph
+  tools in ``<name>.<hour>.<pid>.folded`` and a top-N table of samples
+
+Profiling is off unless ``SQLSOFA_PROFILE_DIR`` is set or ``enable`` is
+called. Disabled, a wrapped call costs one global lookup.
+
+Environment: SQLSOFA_PROFILE_DIR, SQLSOFA_PROFILE_EVERY (default 100),
+SQLSOFA_PROFILE_MODE (cprofile or stack), SQLSOFA_PROFILE_TOP (default 30).
+"""
+
+import functools
+import io
+import logging
+import os
+import threading
+import time
+from collections import Counter
+from pathlib import Path
+from types import FrameType
+from typing import Any, Callable, Dict, Optional, Tuple, TypeVar, Union
+
+logger = logging.getLogger(__name__)
+
+F = TypeVar("F", bound=Callable[..., Any])
+
+MODES = ("cprofile", "stack")
+
+
+def hour_stamp() -> str:
+    return time.strftime("%Y%m%d-%H")
+
+
+def frame_label(frame: FrameType) -> str:
+    code = frame.f_code
+    name = getattr(code, "co_qualname", code.co_name)
+    return f"{frame.f_globals.get('__name__', '?')}.{name}"
+
+
+class StackSampler:
+    """
+    Collapsed stacks of the main thread, sampled on SIGPROF.
+
+    Only frames below ``root`` (the frame that started the sampler) are
+    recorded, so the stacks start at the profiled function.
+    """
+
+    def __init__(self, interval: float = 0.005) -> None:
+        self.interval = interval
+        self.stacks: Counter = Counter()
+        self._root: Optional[FrameType] = None
+        self._previous: Any = None
+
+    @staticmethod
+    def available() -> bool:
+        import signal
+
+        return (
+            hasattr(signal, "setitimer")
+            and threading.current_thread() is threading.main_thread()
+        )
+
+    def _sample(self, signum: int, frame: Optional[FrameType]) -> None:
+        labels = []
+        while frame is not None and frame is not self._root:
+            labels.append(frame_label(frame))
+            frame = frame.f_back
+        if frame is self._root and labels:
+            self.stacks[";".join(reversed(labels))] += 1
+
+    def __enter__(self) -> "StackSampler":
+        import signal
+        import sys
+
+        self._root = sys._getframe(1)
+        self._previous = signal.signal(signal.SIGPROF, self._sample)
+        signal.setitimer(signal.ITIMER_PROF, self.interval, self.interval)
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        import signal
+
+        signal.setitimer(signal.ITIMER_PROF, 0, 0)
+        signal.signal(signal.SIGPROF, self._previous)
+        self._root = None
+
+
+class Profiler:
+    """Samples one in ``sample_every`` calls per name into ``directory``"""
+
+    def __init__(
+        self,
+        directory: Union[str, Path],
+        sample_every: int = 100,
+        mode: str = "cprofile",
+        top_n: int = 30,
+        keep_hours: int = 48,
+        interval: float = 0.005,
+    ) -> None:
+        if mode not in MODES:
+            raise ValueError(f"Unknown profiling mode {mode!r}, expected {MODES}")
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.sample_every = max(1, sample_every)
+        self.mode = mode
+        self.top_n = top_n
+        self.keep_hours = keep_hours
+        self.interval = interval
+        self.calls: Counter = Counter()
+        self.samples: Counter = Counter()
+        self._hour = hour_stamp()
+        # name -> pstats.Stats or stack Counter of the current hour
+        self._profiles: Dict[str, Any] = {}
+        self._active = False
+        self._lock = threading.Lock()
+
+    def run(self, name: str, func: Callable, args: Tuple, kwargs: Dict) -> Any:
+        """Call ``func``, under the profiler when this call is sampled"""
+        with self._lock:
+            self.calls[name] += 1
+            # The first call is sampled, so short-lived workers still report.
+            # Nested and concurrent calls run unprofiled while one is sampled.
+            sampled = (
+                not self._active and (self.calls[name] - 1) % self.sample_every == 0
+            )
+            if sampled:
+                self._active = True
+        if not sampled:
+            return func(*args, **kwargs)
+
+        mode = self.mode
+        if mode == "stack" and not StackSampler.available():
+            mode = "cprofile"
+        if mode == "stack":
+            sampler = StackSampler(self.interval)
+            profile: Any = sampler.stacks
+            context: Any = sampler
+        else:
+            import cProfile
+
+            profile = context = cProfile.Profile()
+        try:
+            with context:
+                return func(*args, **kwargs)
+        finally:
+            try:
+                self._record(name, mode, profile)
+            except Exception as e:
+                logger.warning(f"Failed to write profile of {name}: {e}")
+            self._active = False
+
+    def _path(self, name: str, suffix: str) -> Path:
+        return self.directory / f"{name}.{self._hour}.{os.getpid()}.{suffix}"
+
+    def _rotate(self) -> None:
+        hour = hour_stamp()
+        if hour == self._hour:
+            return
+        self._hour = hour
+        self._profiles = {}
+        cutoff = time.time() - self.keep_hours * 3600
+        for path in self.directory.iterdir():
+            if path.suffix in (".pstats", ".txt", ".folded"):
+                if path.stat().st_mtime < cutoff:
+                    path.unlink(missing_ok=True)
+
+    def _record(self, name: str, mode: str, profile: Any) -> None:
+        self._rotate()
+        self.samples[name] += 1
+        header = (
+            f"# {name}: {self.samples[name]} sampled of {self.calls[name]} calls "
+            f"in this process ({mode}, 1 in {self.sample_every})\n"
+        )
+        if mode == "stack":
+            stacks = self._profiles.setdefault(name, Counter())
+            stacks.update(profile)
+            self._path(name, "folded").write_text(
+                "".join(f"{stack} {n}\n" for stack, n in stacks.items())
+            )
+            self._path(name, "txt").write_text(header + self._stack_table(stacks))
+            return
+
+        import pstats
+
+        if name in self._profiles:
+            self._profiles[name].add(profile)
+        else:
+            self._profiles[name] = pstats.Stats(profile)
+        stats = self._profiles[name]
+        stats.dump_stats(self._path(name, "pstats"))
+        table = io.StringIO()
+        stats.stream = table
+        stats.sort_stats("cumulative").print_stats(self.top_n)
+        self._path(name, "txt").write_text(header + table.getvalue())
+
+    def _stack_table(self, stacks: Counter) -> str:
+        total = sum(stacks.values()) or 1
+        own: Counter = Counter()
+        inclusive: Counter = Counter()
+        for stack, n in stacks.items():
+            frames = stack.split(";")
+            own[frames[-1]] += n
+            for label in set(frames):
+                inclusive[label] += n
+        lines = [f"{'self':>8} {'self%':>6} {'total':>8} {'total%':>6}  function"]
+        for label, n in own.most_common(self.top_n):
+            lines.append(
+                f"{n:>8} {100 * n / total:>6.1f} {inclusive[label]:>8} "
+                f"{100 * inclusive[label] / total:>6.1f}  {label}"
+            )
+        return "\n".join(lines) + "\n"
+
+
+_profiler: Optional[Profiler] = None
+
+
+def enable(directory: Union[str, Path], **kwargs: Any) -> Profiler:
+    """Profile the ``profiled`` functions of this process, see Profiler"""
+    global _profiler
+    _profiler = Profiler(directory, **kwargs)
+    logger.info(
+        f"Profiling 1 in {_profiler.sample_every} calls ({_profiler.mode}) "
+        f"to {_profiler.directory}"
+    )
+    return _profiler
+
+
+def disable() -> None:
+    global _profiler
+    _profiler = None
+
+
+def active_profiler() -> Optional[Profiler]:
+    return _profiler
+
+
+def enable_from_env() -> Optional[Profiler]:
+    """
+    Enable profiling when SQLSOFA_PROFILE_DIR is set.
+
+    Runs on import, so bad settings only log a warning and leave profiling off.
+    """
+    directory = os.environ.get("SQLSOFA_PROFILE_DIR")
+    if not directory:
+        return None
+    try:
+        return enable(
+            directory,
+            sample_every=int(os.environ.get("SQLSOFA_PROFILE_EVERY", 100)),
+            mode=os.environ.get("SQLSOFA_PROFILE_MODE", "cprofile"),
+            top_n=int(os.environ.get("SQLSOFA_PROFILE_TOP", 30)),
+        )
+    except (ValueError, OSError) as e:
+        logger.warning(f"Profiling disabled, bad SQLSOFA_PROFILE_* setting: {e}")
+        return None
+
+
+def profiled(name: str) -> Callable[[F], F]:
+    """Sample calls of the decorated function when profiling is enabled"""
+
+    def decorate(func: F) -> F:
+        @functools.wraps(func)
+        def wrapper(*args: Any, **kwargs: Any) -> Any:
+            profiler = _profiler
+            if profiler is None:
+                return func(*args, **kwargs)
+            return profiler.run(name, func, args, kwargs)
+
+        return wrapper  # type: ignore[return-value]
+
+    return decorate
+
+
+enable_from_env()
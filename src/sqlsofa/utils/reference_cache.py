@@ -0,0 +1,159 @@
+# sqlsofa/utils/reference_cache.py
+"""
+Cache of the slow-changing reference hierarchy - sports, categories,
+tournaments and seasons.
+
+Every event carries the full tournament chain. With a cache shared across
+matches (and runs, via ``save``/``load`` or ``from_engine``) the converters
+reuse the objects they already built and the loaders skip upserting rows the
+database already holds unchanged. The cache is shared by the component
+builders of a converter running on a thread pool, so access is locked.
+"""
+
+import json
+import logging
+import threading
+from pathlib import Path
+from typing import Any, Dict, Iterable, Optional, Tuple, Type, Union
+
+from sqlalchemy import select
+from sqlalchemy.engine import Engine
+from sqlmodel import SQLModel
+
+from sqlsofa.conf.database import open_session
+from sqlsofa.schema import sqlmodels as sqlschema
+
+logger = logging.getLogger(__name__)
+
+REFERENCE_MODELS: Tuple[Type[SQLModel], ...] = (
+    sqlschema.Sport,
+    sqlschema.Category,
+    sqlschema.Tournament,
+    sqlschema.Season,
+)
+REFERENCE_TABLES: Tuple[str, ...] = tuple(m.__tablename__ for m in REFERENCE_MODELS)
+
+# Bookkeeping columns that never count as a change
+IGNORED_COLUMNS = ("created_at", "updated_at")
+
+
+class ReferenceCache:
+    """Known reference rows by table and source id"""
+
+    def __init__(self) -> None:
+        # Rows known to be stored in the database, without bookkeeping columns
+        self.rows: Dict[str, Dict[int, Dict[str, Any]]] = {
+            table: {} for table in REFERENCE_TABLES
+        }
+        # Objects already built by the converters, with the values used
+        self._models: Dict[Tuple[str, int], Tuple[Dict[str, Any], SQLModel]] = {}
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+
+    def __repr__(self) -> str:
+        counts = {table: len(rows) for table, rows in self.rows.items()}
+        return f"ReferenceCache(rows={counts}, hits={self.hits}, misses={self.misses})"
+
+    @staticmethod
+    def handles(table: str) -> bool:
+        return table in REFERENCE_TABLES
+
+    @staticmethod
+    def _strip(values: Dict[str, Any]) -> Dict[str, Any]:
+        return {k: v for k, v in values.items() if k not in IGNORED_COLUMNS}
+
+    ##############################
+    # Converter side
+    ##############################
+
+    def model(self, model: Type[SQLModel], values: Dict[str, Any]) -> SQLModel:
+        """
+        Build ``model`` from ``values``, reusing the previous object for the same
+        id when the values have not changed.
+        """
+        key = (model.__tablename__, values.get("id"))
+        with self._lock:
+            cached = self._models.get(key)
+            if cached is not None and cached[0] == values:
+                self.hits += 1
+                return cached[1]
+
+            self.misses += 1
+            obj = model(**values)
+            self._models[key] = (dict(values), obj)
+            return obj
+
+    ##############################
+    # Loader side
+    ##############################
+
+    def is_current(self, table: str, values: Dict[str, Any]) -> bool:
+        """True when the database already holds this row with these values"""
+        with self._lock:
+            stored = self.rows.get(table, {}).get(values.get("id"))
+        if stored is None:
+            return False
+        return all(
+            stored.get(column) == value
+            for column, value in values.items()
+            if column not in IGNORED_COLUMNS
+        )
+
+    def remember(self, table: str, values: Dict[str, Any]) -> None:
+        """Record a row as stored, call once the transaction has committed"""
+        if self.handles(table):
+            with self._lock:
+                self.rows[table][values["id"]] = self._strip(values)
+
+    def remember_all(self, table: str, rows: Iterable[Dict[str, Any]]) -> None:
+        for values in rows:
+            self.remember(table, values)
+
+    ##############################
+    # Persistence
+    ##############################
+
+    @classmethod
+    def from_engine(cls, engine: Engine) -> "ReferenceCache":
+        """Warm a cache with every reference row in the database"""
+        cache = cls()
+        with open_session(engine) as session:
+            for model in REFERENCE_MODELS:
+                table = model.__table__
+                for row in session.execute(select(table)).mappings():
+                    cache.remember(model.__tablename__, dict(row))
+        logger.info(f"Loaded {cache!r} from the database")
+        return cache
+
+    def save(self, path: Union[str, Path]) -> None:
+        """Write the stored rows to a json file"""
+        with self._lock:
+            data = {
+                table: list(rows.values()) for table, rows in self.rows.items() if rows
+            }
+        Path(path).write_text(json.dumps(data, default=str))
+
+    @classmethod
+    def load(cls, path: Union[str, Path]) -> "ReferenceCache":
+        """Read a cache written by ``save``, an empty cache if the file is missing"""
+        cache = cls()
+        path = Path(path)
+        if not path.exists():
+            logger.info(f"No reference cache at {path}, starting empty")
+            return cache
+        for table, rows in json.loads(path.read_text()).items():
+            if cache.handles(table):
+                cache.remember_all(table, rows)
+        return cache
+
+
+def build(
+    model: Type[SQLModel],
+    values: Dict[str, Any],
+    cache: Optional[ReferenceCache] = None,
+) -> SQLModel:
+    """Build ``model`` through ``cache`` when one is given"""
+    if cache is None:
+        return model(**values)
+    return cache.model(model, values)
@@ -0,0 +1,293 @@
+# sqlsofa/utils/sql_stats.py
+"""
+SQL statement counting and latency per table, statement type and load phase.
+
+``instrument(engine)`` attaches cursor event listeners to an engine. While a
+``record`` block is open, every statement is added to its StatementStats,
+bucketed by the current phase and match id (set by the loaders with
+``phase``), the table it targets and its type. Loaders attach the stats of
+each batch to ``LoadResult.statements`` when their engine is instrumented.
+
+``max_statements`` turns that into a test assertion, so N+1 regressions in
+the loaders or the query layer fail CI::
+
+    with max_statements(engine, 3):
+        reader.match(match_id)
+"""
+
+import json
+import logging
+import re
+import time
+import weakref
+from collections import defaultdict
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+logger = logging.getLogger(__name__)
+
+# phase, match id, table, statement type
+BucketKey = Tuple[str, Optional[int], str, str]
+FIELDS = ("phase", "match_id", "table", "kind")
+
+_PHASE: ContextVar[str] = ContextVar("sqlsofa_phase", default="")
+_MATCH_ID: ContextVar[Optional[int]] = ContextVar("sqlsofa_match_id", default=None)
+# Open record blocks of the current thread (or task), with their recorder
+_RECORDING: ContextVar[Tuple[Tuple["StatementRecorder", "StatementStats"], ...]] = (
+    ContextVar("sqlsofa_recording", default=())
+)
+
+_TABLE = re.compile(
+    r"""\b(?:INTO|UPDATE|FROM)\s+["`]?(?:\w+["`]?\.["`]?)?(\w+)""", re.IGNORECASE
+)
+
+
+def statement_kind(statement: str) -> str:
+    words = statement.lstrip(" (\n").split(None, 1)
+    return words[0].upper() if words else ""
+
+
+def statement_table(statement: str) -> str:
+    """Target table of a DML statement, first FROM table of a query"""
+    match = _TABLE.search(statement)
+    return match.group(1) if match else ""
+
+
+def written_rows(
+    kind: str, cursor: Any, parameters: Any, context: Any, executemany: bool
+) -> int:
+    """
+    Rows written by a DML statement, 0 for queries.
+
+    RETURNING statements report no rowcount before their rows are fetched,
+    they count their parameter sets instead. insertmanyvalues runs such a
+    statement one page at a time in the same context, its parameter sets are
+    counted once, with the first page.
+    """
+    if kind not in ("INSERT", "UPDATE", "DELETE"):
+        return 0
+    if cursor.rowcount > 0:
+        return cursor.rowcount
+    compiled = getattr(context, "compiled_parameters", None)
+    if not compiled:
+        return len(parameters) if executemany else 1
+    if getattr(context, "_sqlsofa_rows_counted", False):
+        return 0
+    context._sqlsofa_rows_counted = True
+    return len(compiled)
+
+
+@contextmanager
+def phase(name: str, match_id: Optional[int] = None) -> Iterator[None]:
+    """Attribute the statements of the block to ``name`` (and ``match_id``)"""
+    phase_token = _PHASE.set(name)
+    match_token = _MATCH_ID.set(match_id)
+    try:
+        yield
+    finally:
+        _PHASE.reset(phase_token)
+        _MATCH_ID.reset(match_token)
+
+
+@dataclass
+class StatementTotals:
+    statements: int = 0
+    rows: int = 0
+    seconds: float = 0.0
+
+    def add(self, other: "StatementTotals") -> None:
+        self.statements += other.statements
+        self.rows += other.rows
+        self.seconds += other.seconds
+
+
+class StatementStats:
+    """Statements, rows and time per (phase, match id, table, type) bucket"""
+
+    def __init__(self) -> None:
+        self.buckets: Dict[BucketKey, StatementTotals] = defaultdict(StatementTotals)
+        # Statement texts in execution order, for assertion messages
+        self.statements: List[str] = []
+
+    def add(self, key: BucketKey, statement: str, rows: int, seconds: float) -> None:
+        totals = self.buckets[key]
+        totals.statements += 1
+        totals.rows += rows
+        totals.seconds += seconds
+        self.statements.append(statement)
+
+    def total(self, **filters: Any) -> StatementTotals:
+        """Totals of the buckets matching ``filters``, e.g. ``kind="SELECT"``"""
+        unknown = set(filters) - set(FIELDS)
+        if unknown:
+            raise ValueError(f"Unknown statement fields {sorted(unknown)}")
+        totals = StatementTotals()
+        for key, bucket in self.buckets.items():
+            values = dict(zip(FIELDS, key))
+            if all(values[name] == value for name, value in filters.items()):
+                totals.add(bucket)
+        return totals
+
+    def count(self, **filters: Any) -> int:
+        return self.total(**filters).statements
+
+    def group(self, field: str) -> Dict[Any, StatementTotals]:
+        """Totals per value of one of FIELDS"""
+        position = FIELDS.index(field)
+        groups: Dict[Any, StatementTotals] = defaultdict(StatementTotals)
+        for key, bucket in self.buckets.items():
+            groups[key[position]].add(bucket)
+        return dict(groups)
+
+    def to_dict(self) -> Dict[str, Any]:
+        def totals(t: StatementTotals) -> Dict[str, Any]:
+            return {
+                "statements": t.statements,
+                "rows": t.rows,
+                "ms": round(t.seconds * 1000, 3),
+            }
+
+        summary = totals(self.total())
+        for field in FIELDS:
+            summary[f"by_{field}"] = {
+                str(value): totals(t) for value, t in self.group(field).items()
+            }
+        return summary
+
+    def __repr__(self) -> str:
+        total = self.total()
+        return (
+            f"StatementStats(statements={total.statements}, rows={total.rows}, "
+            f"seconds={total.seconds:.3f})"
+        )
+
+
+class StatementRecorder:
+    """Cursor listeners of one engine, feeding the open ``record`` blocks"""
+
+    def __init__(self, engine: Engine, log_json: bool = False) -> None:
+        # No reference to the engine, it keys the weak registry of recorders
+        # Log the summary of every loader batch as a JSON line
+        self.log_json = log_json
+        event.listen(engine, "before_cursor_execute", self._before)
+        event.listen(engine, "after_cursor_execute", self._after)
+        event.listen(engine, "handle_error", self._error)
+
+    def remove(self, engine: Engine) -> None:
+        event.remove(engine, "before_cursor_execute", self._before)
+        event.remove(engine, "after_cursor_execute", self._after)
+        event.remove(engine, "handle_error", self._error)
+
+    def _before(self, conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault("sqlsofa_statement_start", []).append(time.perf_counter())
+
+    def _after(self, conn, cursor, statement, parameters, context, executemany):
+        starts = conn.info.get("sqlsofa_statement_start")
+        if not starts:
+            return
+        seconds = time.perf_counter() - starts.pop()
+        # Only the blocks opened by the thread executing the statement
+        active = [stats for recorder, stats in _RECORDING.get() if recorder is self]
+        if not active:
+            return
+        kind = statement_kind(statement)
+        key = (_PHASE.get(), _MATCH_ID.get(), statement_table(statement), kind)
+        rows = written_rows(kind, cursor, parameters, context, executemany)
+        for stats in active:
+            stats.add(key, statement, rows, seconds)
+
+    def _error(self, exception_context) -> None:
+        # Failed statements never reach after_cursor_execute
+        connection = exception_context.connection
+        if connection is not None:
+            starts = connection.info.get("sqlsofa_statement_start")
+            if starts:
+                starts.pop()
+
+    @contextmanager
+    def record(self) -> Iterator[StatementStats]:
+        """
+        Collect the statements executed on the engine within the block.
+
+        Statements of other threads using the engine meanwhile are not counted.
+        """
+        stats = StatementStats()
+        token = _RECORDING.set(_RECORDING.get() + ((self, stats),))
+        try:
+            yield stats
+        finally:
+            _RECORDING.reset(token)
+
+
+_RECORDERS: "weakref.WeakKeyDictionary[Engine, StatementRecorder]" = (
+    weakref.WeakKeyDictionary()
+)
+
+
+def instrument(engine: Engine, log_json: bool = False) -> StatementRecorder:
+    """Attach statement listeners to ``engine``, once"""
+    recorder = _RECORDERS.get(engine)
+    if recorder is None:
+        recorder = _RECORDERS[engine] = StatementRecorder(engine, log_json)
+    recorder.log_json = recorder.log_json or log_json
+    return recorder
+
+
+def uninstrument(engine: Engine) -> None:
+    recorder = _RECORDERS.pop(engine, None)
+    if recorder is not None:
+        recorder.remove(engine)
+
+
+def recorder_for(engine: Engine) -> Optional[StatementRecorder]:
+    return _RECORDERS.get(engine)
+
+
+@contextmanager
+def batch_statements(engine: Engine, name: str) -> Iterator[Optional[StatementStats]]:
+    """Stats of a loader batch when ``engine`` is instrumented, else None"""
+    recorder = _RECORDERS.get(engine)
+    if recorder is None:
+        yield None
+        return
+    with recorder.record() as stats:
+        yield stats
+    if recorder.log_json:
+        logger.info(json.dumps({"batch": name, **stats.to_dict()}))
+
+
+@contextmanager
+def max_statements(
+    engine: Engine, limit: int, **filters: Any
+) -> Iterator[StatementStats]:
+    """
+    Assert the block issues at most ``limit`` statements on ``engine``.
+
+    ``filters`` narrow what is counted, e.g. ``kind="SELECT"`` or
+    ``table="events"``. The failure message lists the statements issued.
+    """
+    instrumented = engine in _RECORDERS
+    try:
+        with instrument(engine).record() as stats:
+            yield stats
+    finally:
+        if not instrumented:
+            uninstrument(engine)
+    issued = stats.count(**filters)
+    if issued > limit:
+        listing = "\n".join(f"  {s.splitlines()[0][:120]}" for s in stats.statements)
+        raise AssertionError(
+            f"Expected at most {limit} statements{_describe(filters)}, "
+            f"{issued} were issued:\n{listing}"
+        )
+
+
+def _describe(filters: Dict[str, Any]) -> str:
+    if not filters:
+        return ""
+    return " (" + ", ".join(f"{k}={v!r}" for k, v in filters.items()) + ")"
@@ -0,0 +1,366 @@
+# tests/conftest.py
+"""
+Throwaway database harness and synthetic seasons for the database tests.
+
+A local PostgreSQL is started with initdb/pg_ctl in a temp dir when the server
+binaries and a driver are available, otherwise the tests fall back to SQLite.
+Set SQLSOFA_TEST_DATABASE_URL to run against an existing database instead.
+"""
+
+import importlib.util
+import json
+import logging
+import os
+import shutil
+import socket
+import subprocess
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+import pytest  # type: ignore
+from sqlalchemy import create_engine, event
+from sqlmodel import SQLModel
+
+import sqlsofa.schema.sqlmodels as sqlschema
+from sqlsofa.converters.base_converter import ConversionResult
+from sqlsofa.converters.compact_result import CompactResult, LocalRef
+
+logger = logging.getLogger(__name__)
+
+
+##############################
+# database
+##############################
+
+
+def _pg_bindir() -> Optional[Path]:
+    initdb = shutil.which("initdb")
+    if initdb:
+        return Path(initdb).parent
+    pg_config = shutil.which("pg_config")
+    if pg_config:
+        out = subprocess.run(
+            [pg_config, "--bindir"], capture_output=True, text=True, check=False
+        )
+        bindir = Path(out.stdout.strip())
+        if (bindir / "initdb").exists():
+            return bindir
+    return None
+
+
+def _pg_driver() -> Optional[str]:
+    if importlib.util.find_spec("psycopg") is not None:
+        return "postgresql+psycopg"
+    if importlib.util.find_spec("psycopg2") is not None:
+        return "postgresql+psycopg2"
+    return None
+
+
+def _free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+@pytest.fixture(scope="session")
+def database_url(tmp_path_factory) -> Iterator[Optional[str]]:
+    """URL of a throwaway PostgreSQL server, or None to use SQLite"""
+    env_url = os.environ.get("SQLSOFA_TEST_DATABASE_URL")
+    if env_url:
+        yield env_url
+        return
+
+    bindir, driver = _pg_bindir(), _pg_driver()
+    if bindir is None or driver is None:
+        logger.warning("PostgreSQL not available, loader tests fall back to SQLite")
+        yield None
+        return
+
+    root = tmp_path_factory.mktemp("postgres")
+    datadir, sockdir = root / "data", root / "sock"
+    sockdir.mkdir()
+    port = _free_port()
+    pg_ctl = str(bindir / "pg_ctl")
+    try:
+        subprocess.run(
+            [str(bindir / "initdb"), "-D", str(datadir), "-U", "sqlsofa"]
+            + ["--auth=trust", "-E", "UTF8"],
+            capture_output=True,
+            check=True,
+        )
+        subprocess.run(
+            [pg_ctl, "-D", str(datadir), "-l", str(root / "postgres.log"), "-w"]
+            + ["-o", f"-p {port} -k {sockdir} -c listen_addresses='' -c fsync=off"]
+            + ["start"],
+            capture_output=True,
+            check=True,
+        )
+    except subprocess.CalledProcessError as e:
+        logger.warning(f"Could not start PostgreSQL ({e.stderr!r}), using SQLite")
+        yield None
+        return
+
+    try:
+        yield f"{driver}://sqlsofa@/postgres?host={sockdir}&port={port}"
+    finally:
+        subprocess.run(
+            [pg_ctl, "-D", str(datadir), "-m", "fast", "stop"], capture_output=True
+        )
+
+
+@pytest.fixture
+def engine(database_url, tmp_path):
+    """Engine on an empty schema, recreated for every test"""
+    url = database_url or f"sqlite:///{tmp_path / 'sqlsofa.db'}"
+    engine = create_engine(url)
+    SQLModel.metadata.drop_all(engine)
+    SQLModel.metadata.create_all(engine)
+    yield engine
+    SQLModel.metadata.drop_all(engine)
+    engine.dispose()
+
+
+@contextmanager
+def statement_count(engine):
+    """Collect the SQL statements executed on ``engine``"""
+    statements = []
+
+    def count(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    event.listen(engine, "before_cursor_execute", count)
+    try:
+        yield statements
+    finally:
+        event.remove(engine, "before_cursor_execute", count)
+
+
+##############################
+# synthetic data
+##############################
+
+STAT_PERIODS = ["ALL", "1ST", "2ND"]
+STAT_GROUPS = 4
+STAT_ITEMS = 5
+PLAYERS_PER_TEAM = 11
+INCIDENTS_PER_MATCH = 6
+GRAPH_POINTS_PER_MATCH = 90
+
+
+def match_score(home_id: int, away_id: int, season_id: int) -> Tuple[int, int]:
+    """Deterministic full-time score of a synthetic fixture"""
+    return (home_id + 2 * away_id + season_id) % 4, (3 * away_id + season_id) % 3
+
+
+def synthetic_season(
+    n_teams: int = 6, season_id: int = 1, tournament_id: int = 17
+) -> List[ConversionResult]:
+    """
+    A double round-robin season of fully populated matches.
+
+    Entities are linked the same way utils.converters links them, relationships
+    for the component hierarchies and source ids for the core entities.
+    """
+    sport = sqlschema.Sport(id=1, name="Football", slug="football")
+    category = sqlschema.Category(id=1, name="England", slug="england", sport_id=1)
+    tournament = sqlschema.Tournament(
+        id=tournament_id,
+        name=f"League {tournament_id}",
+        slug=f"league-{tournament_id}",
+        category_id=category.id,
+    )
+    season = sqlschema.Season(id=season_id, name=f"Season {season_id}", year="24/25")
+    country = sqlschema.Country(
+        name="England", slug="england", alpha2="EN", alpha3="ENG"
+    )
+
+    teams = [
+        sqlschema.Team(
+            id=1000 + i,
+            name=f"Team {i}",
+            slug=f"team-{i}",
+            shortName=f"T{i}",
+            nameCode=f"T{i:02d}"[:3],
+            gender="M",
+            sport_id=sport.id,
+        )
+        for i in range(n_teams)
+    ]
+    players = {
+        team.id: [
+            sqlschema.LineupPlayer(
+                id=team.id * 100 + n, name=f"Player {team.id}-{n}", country=country
+            )
+            for n in range(PLAYERS_PER_TEAM)
+        ]
+        for team in teams
+    }
+
+    results = []
+    fixtures = [(h, a) for h in teams for a in teams if h is not a]
+    for n, (home, away) in enumerate(fixtures):
+        match_id = season_id * 1_000_000 + n
+        home_goals, away_goals = match_score(home.id, away.id, season_id)
+        event = sqlschema.Event(
+            id=match_id,
+            slug=f"{home.slug}-{away.slug}-{season_id}",
+            startTimestamp=1_700_000_000 + n * 3600,
+            winnerCode=(
+                3 if home_goals == away_goals else 1 if home_goals > away_goals else 2
+            ),
+            tournament_id=tournament.id,
+            season_id=season.id,
+            home_team_id=home.id,
+            away_team_id=away.id,
+        )
+        event.home_score = sqlschema.Score(current=home_goals, display=home_goals)
+        event.away_score = sqlschema.Score(current=away_goals, display=away_goals)
+
+        periods = []
+        for period_name in STAT_PERIODS:
+            period = sqlschema.FootballStatisticPeriod(
+                period=period_name, event_id=match_id
+            )
+            for g in range(STAT_GROUPS):
+                group = sqlschema.StatisticGroup(groupName=f"Group {g}")
+                group.statistic_period = period
+                for i in range(STAT_ITEMS):
+                    item = sqlschema.FootballStatisticItem(
+                        key=f"stat{g}_{i}",
+                        name=f"Stat {g}.{i}",
+                        home=str(i),
+                        away=str(g),
+                        compareCode=1,
+                        statisticsType="positive",
+                        valueType="event",
+                        homeValue=float(i),
+                        awayValue=float(g),
+                        renderType=1,
+                    )
+                    item.statistic_group = group
+            periods.append(period)
+
+        lineup = sqlschema.FootballLineup(confirmed=True, event_id=match_id)
+        for is_home, team in ((True, home), (False, away)):
+            team_lineup = sqlschema.TeamLineup(formation="4-4-2", is_home=is_home)
+            team_lineup.football_lineup = lineup
+            team_lineup.team = team
+            for p, player in enumerate(players[team.id]):
+                entry = sqlschema.LineupPlayerEntry(
+                    shirtNumber=p + 1, position="M", substitute=False
+                )
+                entry.team_lineup = team_lineup
+                entry.player = player
+                entry.team_id = team.id
+                entry.statistics = sqlschema.PlayerStatistics(
+                    minutesPlayed=60 + (n + p) % 31,
+                    touches=40 + p,
+                    rating=6.0 + (n + 2 * p) % 20 / 10,
+                    goals=int((n + p) % 4 == 0),
+                    keyPass=(n * p) % 4,
+                    expectedGoals=(n + p) % 5 / 10,
+                    totalTackle=None if p == 0 else (n + team.id) % 3,
+                )
+
+        incidents = [
+            sqlschema.Incident(
+                incidentType="goal", time=10 * i, isHome=bool(i % 2), event_id=match_id
+            )
+            for i in range(INCIDENTS_PER_MATCH)
+        ]
+        graph_points = [
+            sqlschema.GraphPoint(minute=float(m), value=(m % 7) - 3, event_id=match_id)
+            for m in range(1, GRAPH_POINTS_PER_MATCH + 1)
+        ]
+
+        results.append(
+            ConversionResult(
+                sports={sport},
+                categories={category},
+                tournaments={tournament},
+                seasons={season},
+                events={event},
+                teams={home, away},
+                countries={country},
+                statistic_periods=periods,
+                lineups=[lineup],
+                incidents=incidents,
+                graph_points=graph_points,
+                match_id=match_id,
+            )
+        )
+    return results
+
+
+@pytest.fixture(scope="module")
+def season_results() -> List[ConversionResult]:
+    # Loaders only read the converted objects, so one season serves the module
+    return synthetic_season()
+
+
+##############################
+# raw payloads
+##############################
+
+
+def raw_events(n_teams: int = 4) -> List[Dict[str, Any]]:
+    """Events list entries as scraped, every pair of teams playing twice"""
+    sport = {"id": 1, "name": "Football", "slug": "football"}
+    category = {"id": 1, "name": "England", "slug": "england", "sport": sport}
+    tournament = {"id": 17, "name": "League", "slug": "league", "category": category}
+    country = {"name": "England", "slug": "england", "alpha2": "EN", "alpha3": "ENG"}
+    teams = [
+        {
+            "id": 2000 + i,
+            "name": f"Team {i}",
+            "slug": f"team-{i}",
+            "shortName": f"Team {i}",
+            "nameCode": f"T{i}",
+            "gender": "M",
+            "class": i % 2,
+            "country": country,
+        }
+        for i in range(n_teams)
+    ]
+    fixtures = [(h, a) for h in teams for a in teams if h is not a]
+    return [
+        {
+            "id": 7_000_000 + n,
+            "slug": f"{home['slug']}-{away['slug']}",
+            "startTimestamp": 1_700_000_000 + n * 3600,
+            "tournament": tournament,
+            "season": {"id": 7, "name": "Season", "year": "24/25"},
+            "homeTeam": home,
+            "awayTeam": away,
+            "status": {"code": 100, "description": "Ended", "type": "finished"},
+            "homeScore": {"current": n % 3, "display": n % 3},
+            "awayScore": {"current": 1, "display": 1},
+        }
+        for n, (home, away) in enumerate(fixtures)
+    ]
+
+
+def json_lines(items: Iterable[Dict[str, Any]]) -> bytes:
+    return b"\n".join(json.dumps(item).encode() for item in items) + b"\n"
+
+
+def compact_rows(result: CompactResult) -> Dict[str, List[Dict[str, Any]]]:
+    """Rows per table in a stable order, local refs replaced by the row they point at"""
+
+    def resolve(buffer, row):
+        values = {}
+        for column, value in zip(buffer.columns, row):
+            if column == "created_at":
+                continue
+            if isinstance(value, LocalRef):
+                parent = result.tables[buffer.refs[column]]
+                value = resolve(parent, parent.rows[value])
+            values[column] = value
+        return values
+
+    return {
+        table: sorted((resolve(buffer, row) for row in buffer.rows), key=repr)
+        for table, buffer in result.tables.items()
+        if len(buffer)
+    }
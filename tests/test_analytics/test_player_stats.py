@@ -0,0 +1,122 @@
+# tests/test_analytics/test_player_stats.py
+import math
+from collections import defaultdict
+
+import numpy as np
+import pytest  # type: ignore
+from sqlalchemy import select
+from sqlmodel import Session
+
+import sqlsofa.schema.sqlmodels as sqlschema
+from sqlsofa.analytics import (
+    load_season_stats,
+    percentile_ranks,
+    player_stats,
+    refresh_player_summaries,
+    rolling_mean,
+    season_player_summary,
+)
+from sqlsofa.analytics.player_stats import FORM_WINDOW, group_index
+from sqlsofa.conf.database import open_session
+from sqlsofa.loaders import BulkLoader
+
+from ..conftest import PLAYERS_PER_TEAM
+
+
+@pytest.fixture
+def loaded(engine, season_results):
+    BulkLoader(engine).load_batch(season_results)
+    return engine
+
+
+def appearances_by_player(season_results):
+    """Reference data straight from the ORM objects"""
+    appearances = defaultdict(list)
+    for result in season_results:
+        (event,) = result.events
+        for team_lineup in result.lineups[0].lineups:
+            for entry in team_lineup.players:
+                appearances[entry.player.id].append((event.startTimestamp, entry))
+    return {
+        p: [e for _, e in sorted(a, key=lambda x: x[0])] for p, a in appearances.items()
+    }
+
+
+def test_load_season_stats_one_record_per_appearance(loaded, season_results):
+    stats = load_season_stats(loaded, season_id=1)
+
+    assert len(stats) == len(season_results) * 2 * PLAYERS_PER_TEAM
+    assert np.all(np.diff(stats["player_id"]) >= 0)
+    assert np.isnan(stats["saves"]).all()
+    assert len(load_season_stats(loaded, season_id=99)) == 0
+
+
+def test_summary_matches_python_reference(loaded, season_results):
+    stats = load_season_stats(loaded, season_id=1)
+    summary = season_player_summary(stats, min_minutes=0)
+    reference = appearances_by_player(season_results)
+
+    assert list(summary["player_id"]) == sorted(reference)
+    for i, player_id in enumerate(summary["player_id"]):
+        entries = reference[player_id]
+        minutes = sum(e.statistics.minutesPlayed for e in entries)
+        goals = sum(e.statistics.goals for e in entries)
+        tackles = sum(e.statistics.totalTackle or 0 for e in entries)
+        ratings = [e.statistics.rating for e in entries]
+
+        assert summary["appearances"][i] == len(entries)
+        assert summary["minutes"][i] == minutes
+        assert summary["goals_p90"][i] == pytest.approx(goals / minutes * 90)
+        assert summary["tackles_p90"][i] == pytest.approx(tackles / minutes * 90)
+        assert summary["rating"][i] == pytest.approx(sum(ratings) / len(ratings))
+        form = ratings[-FORM_WINDOW:]
+        assert summary["form_rating"][i] == pytest.approx(sum(form) / len(form))
+        assert summary["team_id"][i] == entries[-1].team_id
+        assert not math.isnan(summary["goals_pct"][i])
+
+
+def test_rolling_mean_stays_within_groups():
+    keys = np.array([1, 1, 1, 2, 2])
+    values = np.array([1.0, np.nan, 3.0, 10.0, 20.0])
+    _, _, first = group_index(keys)
+
+    result = rolling_mean(values, first, window=2)
+
+    np.testing.assert_allclose(result, [1.0, 1.0, 3.0, 10.0, 15.0])
+
+
+def test_percentile_ranks_share_ties_and_skip_ineligible():
+    values = np.array([1.0, 2.0, 2.0, 3.0, np.nan, 100.0])
+    eligible = np.array([True, True, True, True, True, False])
+
+    ranks = percentile_ranks(values, eligible)
+
+    np.testing.assert_allclose(ranks[:4], [12.5, 50.0, 50.0, 87.5])
+    assert np.isnan(ranks[4:]).all()
+
+
+def test_refresh_player_summaries_writes_season_rows(loaded, season_results):
+    written = refresh_player_summaries(loaded, season_id=1)
+    refresh_player_summaries(loaded, season_id=1)
+
+    with Session(loaded) as session:
+        rows = list(session.execute(select(sqlschema.PlayerSeasonSummary)).scalars())
+    assert written == len(rows) == 6 * PLAYERS_PER_TEAM
+    ranked = [r for r in rows if r.goals_pct is not None]
+    assert ranked and all(0 < r.goals_pct <= 100 for r in ranked)
+    assert all(r.minutes >= 450 for r in ranked)
+    assert all(r.goals_pct is None for r in rows if r.minutes < 450)
+
+
+def test_refresh_writes_through_a_bulk_session(loaded, monkeypatch):
+    opened = []
+
+    def recording(engine, bulk=False, **kwargs):
+        opened.append(bulk)
+        return open_session(engine, bulk=bulk, **kwargs)
+
+    monkeypatch.setattr(player_stats, "open_session", recording)
+    refresh_player_summaries(loaded, season_id=1)
+
+    # Reading the appearances, then writing the summaries
+    assert opened == [False, True]
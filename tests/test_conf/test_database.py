@@ -0,0 +1,110 @@
+# tests/test_conf/test_database.py
+import pytest  # type: ignore
+from sqlalchemy import text
+from sqlmodel import SQLModel
+
+from sqlsofa.conf import engine_from_config, load_config, open_session
+from sqlsofa.conf.database import engine_kwargs
+from sqlsofa.loaders import BulkLoader
+
+from ..conftest import statement_count, synthetic_season
+
+
+def test_overrides_and_files_merge(tmp_path):
+    override = tmp_path / "prod.yaml"
+    override.write_text("database:\n  pool:\n    size: 20\n")
+
+    cfg = load_config(override, overrides=["database.pool.max_overflow=0"])
+
+    assert cfg.database.pool.size == 20
+    assert cfg.database.pool.max_overflow == 0
+    assert cfg.database.pool.pre_ping is True
+
+
+def test_url_from_environment(monkeypatch):
+    monkeypatch.setenv("SQLSOFA_DATABASE_URL", "postgresql+psycopg://u@db/sofa")
+    assert load_config().database.url == "postgresql+psycopg://u@db/sofa"
+
+
+@pytest.mark.parametrize(
+    "url, present, absent",
+    [
+        (
+            "postgresql+psycopg://u@db/sofa",
+            {"pool_size": 5, "connect_args": {"prepare_threshold": 5}},
+            ["executemany_mode"],
+        ),
+        (
+            "postgresql+psycopg2://u@db/sofa",
+            {"pool_size": 5, "executemany_mode": "values_plus_batch"},
+            ["connect_args"],
+        ),
+        ("sqlite:///sofa.db", {"pool_pre_ping": True}, ["pool_size"]),
+    ],
+)
+def test_engine_kwargs_per_driver(url, present, absent):
+    kwargs = engine_kwargs(load_config(overrides=[f"database.url={url}"]))
+    assert present.items() <= kwargs.items()
+    assert not set(absent) & set(kwargs)
+    assert kwargs["insertmanyvalues_page_size"] == 1000
+
+
+def test_statement_timeout_is_a_connect_option():
+    cfg = load_config(
+        overrides=[
+            "database.url=postgresql+psycopg://u@db/sofa",
+            "database.statement_timeout_ms=30000",
+        ]
+    )
+    assert engine_kwargs(cfg)["connect_args"]["options"] == "-c statement_timeout=30000"
+
+
+@pytest.fixture
+def configured_engine(database_url, tmp_path):
+    url = database_url or f"sqlite:///{tmp_path / 'conf.db'}"
+    engine = engine_from_config(load_config(overrides=[f"database.url={url}"]))
+    SQLModel.metadata.drop_all(engine)
+    SQLModel.metadata.create_all(engine)
+    yield engine
+    SQLModel.metadata.drop_all(engine)
+    engine.dispose()
+
+
+def test_loaders_run_on_configured_engine(configured_engine):
+    result = BulkLoader(configured_engine).load_batch(synthetic_season(n_teams=3))
+    assert result.rows["events"] == 6
+
+
+def test_bulk_sessions_apply_synchronous_commit(configured_engine):
+    with statement_count(configured_engine) as statements:
+        with open_session(configured_engine, bulk=True) as session:
+            session.execute(text("SELECT 1"))
+        with open_session(configured_engine) as session:
+            session.execute(text("SELECT 1"))
+
+    settings = [s for s in statements if "set_config" in s]
+    if configured_engine.dialect.name == "postgresql":
+        assert len(settings) == 1
+        with open_session(configured_engine, bulk=True) as session:
+            value = session.execute(text("SHOW synchronous_commit")).scalar_one()
+        assert value == "off"
+    else:
+        assert settings == []
+
+
+def test_statement_stats_from_config(tmp_path):
+    from sqlsofa.utils.sql_stats import recorder_for
+
+    cfg = load_config(
+        overrides=[
+            f"database.url=sqlite:///{tmp_path / 'stats.db'}",
+            "database.statement_stats.enabled=true",
+        ]
+    )
+    engine = engine_from_config(cfg)
+    SQLModel.metadata.create_all(engine)
+
+    assert recorder_for(engine) is not None
+    result = BulkLoader(engine).load_batch(synthetic_season(n_teams=2))
+    assert result.statements.count(table="events") == 1
+    engine.dispose()
@@ -0,0 +1,129 @@
+# tests/test_converter/test_conversion_cache.py
+import pytest  # type: ignore
+
+from sqlsofa.converters import ConversionCache, LocalRef
+from sqlsofa.converters.conversion_cache import dumps, loads
+from sqlsofa.loaders import BulkLoader
+
+from ..conftest import synthetic_season
+
+SEASON = {result.match_id: result for result in synthetic_season(n_teams=4)}
+
+
+class FakeConverter:
+    calls = 0
+
+    def __init__(self, payload):
+        self.payload = payload
+        self.failures = {}
+
+    def convert(self, components=None):
+        FakeConverter.calls += 1
+        if self.payload.get("broken"):
+            self.failures["incidents"] = "bad payload"
+        return SEASON[self.payload["match_id"]]
+
+
+@pytest.fixture(autouse=True)
+def reset_calls():
+    FakeConverter.calls = 0
+
+
+def payloads():
+    return [{"match_id": match_id, "raw": [1, 2, 3]} for match_id in SEASON]
+
+
+def test_serialisation_round_trip():
+    compact = next(iter(SEASON.values())).compact()
+    restored = loads(dumps(compact))
+
+    assert restored.match_id == compact.match_id
+    assert restored.processed_components == compact.processed_components
+    for table, buffer in compact.tables.items():
+        assert restored.tables[table].rows == buffer.rows, table
+    refs = [
+        value
+        for row in restored.tables["statistic_groups"].rows
+        for value in row
+        if isinstance(value, LocalRef)
+    ]
+    assert refs and all(type(value) is LocalRef for value in refs)
+
+
+def test_hits_skip_conversion(tmp_path):
+    cache = ConversionCache(tmp_path)
+    first = [cache.convert(p, FakeConverter) for p in payloads()]
+    assert FakeConverter.calls == len(SEASON)
+
+    # A fresh process over the same directory
+    cache = ConversionCache(tmp_path)
+    second = [cache.convert(p, FakeConverter) for p in payloads()]
+    assert FakeConverter.calls == len(SEASON)
+    assert cache.stats()["hits"] == len(SEASON)
+    assert [r.tables["events"].rows for r in second] == [
+        r.tables["events"].rows for r in first
+    ]
+
+
+def test_cached_results_load(tmp_path, engine):
+    cache = ConversionCache(tmp_path)
+    for p in payloads():
+        cache.convert(p, FakeConverter)
+
+    results = [cache.convert(p, FakeConverter) for p in payloads()]
+    loaded = BulkLoader(engine).load_batch(results)
+    assert loaded.rows["events"] == len(SEASON)
+
+
+def test_key_covers_payload_version_and_components(tmp_path):
+    cache = ConversionCache(tmp_path)
+    payload = payloads()[0]
+    key = cache.key(payload, FakeConverter)
+
+    assert key == cache.key(dict(payload), FakeConverter)
+    assert key != cache.key({**payload, "raw": [1, 2]}, FakeConverter)
+    assert key != cache.key(payload, FakeConverter, components=["graph"])
+    assert key != ConversionCache(tmp_path, version="2").key(payload, FakeConverter)
+
+    class FixedConverter(FakeConverter):
+        VERSION = 2
+
+    FixedConverter.__qualname__ = FakeConverter.__qualname__
+    assert key != cache.key(payload, FixedConverter)
+
+
+def test_failed_conversions_are_not_cached(tmp_path):
+    cache = ConversionCache(tmp_path)
+    payload = {**payloads()[0], "broken": True}
+    cache.convert(payload, FakeConverter)
+    cache.convert(payload, FakeConverter)
+
+    assert FakeConverter.calls == 2
+    assert cache.stats()["entries"] == 0
+
+
+def test_least_recently_used_entries_are_evicted(tmp_path):
+    entry_size = len(dumps(next(iter(SEASON.values())).compact()))
+    cache = ConversionCache(tmp_path, max_bytes=int(entry_size * 3.5))
+    first, second, *rest = payloads()
+
+    cache.convert(first, FakeConverter)
+    cache.convert(second, FakeConverter)
+    cache.convert(rest[0], FakeConverter)
+    cache.convert(first, FakeConverter)  # first is now the most recent
+    cache.convert(rest[1], FakeConverter)
+
+    assert cache.size <= cache.max_bytes
+    assert cache.get(cache.key(second, FakeConverter)) is None
+    assert cache.get(cache.key(first, FakeConverter)) is not None
+    assert sum(1 for _ in tmp_path.glob("*/*.msgpack")) == cache.stats()["entries"]
+
+
+def test_corrupt_entries_are_dropped(tmp_path):
+    cache = ConversionCache(tmp_path)
+    payload = payloads()[0]
+    cache.convert(payload, FakeConverter)
+    next(tmp_path.glob("*/*.msgpack")).write_bytes(b"\x00garbage")
+
+    assert cache.get(cache.key(payload, FakeConverter)) is None
+    assert cache.stats()["entries"] == 0
@@ -0,0 +1,131 @@
+# tests/test_converter/test_dead_letter.py
+from types import SimpleNamespace
+
+import pytest  # type: ignore
+from sqlalchemy import func, select
+from sqlmodel import Session, create_engine
+
+import sqlsofa.schema.sqlmodels as sqlschema
+from sqlsofa.converters import (
+    ComponentFailure,
+    DatabaseDeadLetterQueue,
+    FileDeadLetterQueue,
+    FootballMatchConverter,
+    retry_dead_letters,
+)
+from sqlsofa.loaders import BulkLoader
+
+from .test_parallel_builders import MATCH_ID, FakeBase, FakeGraph, FakeIncidents
+
+
+def converter_factory(fail_incidents: bool):
+    def make(match_data, dead_letters=None, executor=None):
+        converter = FootballMatchConverter(
+            match_data, executor=executor, dead_letters=dead_letters
+        )
+        converter.builders = {
+            "base": FakeBase(converter),
+            "incidents": FakeIncidents(converter),
+            "graph": FakeGraph(converter),
+        }
+        converter.builders["incidents"].fail = fail_incidents
+        return converter
+
+    return make
+
+
+def match_data():
+    return SimpleNamespace(
+        match_id=MATCH_ID, base=None, incidents={"incidents": [{"id": 1}]}
+    )
+
+
+@pytest.fixture
+def engine(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'dlq.db'}")
+    sqlschema.create_all_tables(engine)
+    yield engine
+    engine.dispose()
+
+
+@pytest.fixture(params=["database", "file"])
+def queue(request, engine, tmp_path):
+    if request.param == "database":
+        return DatabaseDeadLetterQueue(engine)
+    return FileDeadLetterQueue(tmp_path / "dlq")
+
+
+def count(engine, model) -> int:
+    with Session(engine) as session:
+        return session.execute(select(func.count()).select_from(model)).scalar_one()
+
+
+def test_failed_component_is_dead_lettered(queue):
+    converter = converter_factory(fail_incidents=True)(match_data(), queue)
+    result = converter.convert()
+
+    assert result.incidents == []
+    assert len(result.graph_points) == 5
+    assert not result.processed_components["incidents"]
+
+    (failure,) = queue.pending()
+    assert (failure.match_id, failure.component) == (MATCH_ID, "incidents")
+    assert "bad incident payload" in failure.error_message
+    assert "Traceback" in failure.traceback
+    assert failure.payload == '{"incidents": [{"id": 1}]}'
+    assert converter.failures["incidents"].error_message == failure.error_message
+
+
+def test_repeated_failures_bump_retries(queue):
+    failure = ComponentFailure(match_id=1, component="graph", error_message="boom")
+    queue.put(failure)
+    queue.put(ComponentFailure(match_id=1, component="graph", error_message="again"))
+    queue.put(ComponentFailure(match_id=2, component="graph", error_message="other"))
+
+    pending = queue.pending()
+    assert [(f.match_id, f.retries, f.error_message) for f in pending] == [
+        (1, 1, "again"),
+        (2, 0, "other"),
+    ]
+    assert len(queue.pending(limit=1)) == 1
+
+    queue.resolve(failure)
+    assert [f.match_id for f in queue.pending()] == [2]
+
+
+def test_successful_components_still_load_and_retry_fills_gap(engine, queue):
+    loader = BulkLoader(engine)
+    result = converter_factory(fail_incidents=True)(match_data(), queue).convert()
+    loader.load(result)
+
+    assert count(engine, sqlschema.GraphPoint) == 5
+    assert count(engine, sqlschema.Incident) == 0
+
+    FakeGraph.builds = 0
+    counts = retry_dead_letters(
+        queue,
+        fetch_match=lambda match_id: match_data(),
+        loader=loader,
+        converter_cls=converter_factory(fail_incidents=False),
+    )
+
+    assert counts == {"resolved": 1, "failed": 0}
+    assert queue.pending() == []
+    assert count(engine, sqlschema.Incident) == 3
+    # Only the dead-lettered component was rebuilt
+    assert FakeGraph.builds == 0
+    assert count(engine, sqlschema.GraphPoint) == 5
+    assert count(engine, sqlschema.Event) == 1
+
+
+def test_retry_that_fails_again_stays_queued(engine, queue):
+    make = converter_factory(fail_incidents=True)
+    make(match_data(), queue).convert()
+
+    counts = retry_dead_letters(
+        queue, lambda match_id: match_data(), BulkLoader(engine), converter_cls=make
+    )
+
+    assert counts == {"resolved": 0, "failed": 1}
+    (failure,) = queue.pending()
+    assert failure.retries == 1
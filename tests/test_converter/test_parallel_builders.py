@@ -0,0 +1,183 @@
+# tests/test_converter/test_parallel_builders.py
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from types import SimpleNamespace
+
+import pytest  # type: ignore
+
+import sqlsofa.schema.sqlmodels as sqlschema
+from sqlsofa.converters import FootballMatchConverter
+from sqlsofa.converters.base_converter import BaseComponentBuilder
+
+MATCH_ID = 11_000_001
+
+
+class FakeBase(BaseComponentBuilder):
+    def can_build(self) -> bool:
+        return True
+
+    def build(self) -> None:
+        event = sqlschema.Event(
+            id=MATCH_ID, slug="a-b", customId="x", startTimestamp=1_700_000_000
+        )
+        self.entity_map["event"] = event
+        self.normalized_entities["events"].add(event)
+
+
+class FakeIncidents(BaseComponentBuilder):
+    delay = 0.0
+    fail = False
+
+    def can_build(self) -> bool:
+        return True
+
+    def build(self) -> None:
+        time.sleep(self.delay)
+        if self.fail:
+            raise ValueError("bad incident payload")
+        event_id = self.entity_map["event"].id
+        for minute in range(3):
+            incident = sqlschema.Incident(
+                event_id=event_id, incidentType="card", time=minute
+            )
+            self.normalized_entities["incidents"].append(incident)
+        self.entity_map["incidents_by_type"] = {"cards": 3}
+
+
+class FakeGraph(BaseComponentBuilder):
+    delay = 0.0
+    # Builds in this process, across instances
+    builds = 0
+
+    def can_build(self) -> bool:
+        return True
+
+    def build(self) -> None:
+        FakeGraph.builds += 1
+        time.sleep(self.delay)
+        event_id = self.entity_map["event"].id
+        for minute in range(5):
+            point = sqlschema.GraphPoint(event_id=event_id, minute=minute, value=1)
+            self.normalized_entities["graph_points"].append(point)
+
+
+class FakePlayers(BaseComponentBuilder):
+    """Adds to the nested collections of the entity map, like the lineup builder"""
+
+    players = ()
+    shared = None
+
+    def can_build(self) -> bool:
+        return True
+
+    def build(self) -> None:
+        players = self.entity_map["players"]
+        self.shared = players is self.parent.entity_map["players"]
+        for player_id in self.players:
+            players[player_id] = f"player {player_id}"
+        self.entity_map["lineup_data"]["home_lineup"] = len(self.players)
+
+
+class FakeStats(BaseComponentBuilder):
+    def can_build(self) -> bool:
+        return False
+
+    def build(self) -> None:
+        raise AssertionError("not buildable")
+
+
+def make_converter(executor=None, **overrides) -> FootballMatchConverter:
+    match_data = SimpleNamespace(match_id=MATCH_ID, base=None)
+    converter = FootballMatchConverter(match_data, executor=executor)
+    converter.builders = {
+        "base": FakeBase(converter),
+        "stats": FakeStats(converter),
+        "incidents": FakeIncidents(converter),
+        "graph": FakeGraph(converter),
+    }
+    for name, attrs in overrides.items():
+        for attr, value in attrs.items():
+            setattr(converter.builders[name], attr, value)
+    return converter
+
+
+def summary(result):
+    return (
+        [(i.event_id, i.time) for i in result.incidents],
+        [(p.event_id, p.minute) for p in result.graph_points],
+        {e.id for e in result.events},
+        result.processed_components,
+    )
+
+
+def test_parallel_matches_serial():
+    serial = make_converter().convert()
+
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        parallel = make_converter(executor).convert()
+
+    assert summary(parallel) == summary(serial)
+    assert serial.processed_components["incidents"]
+    assert not serial.processed_components["stats"]
+
+
+def test_merge_order_is_deterministic():
+    # Incidents finishes last but is still merged before graph
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        converter = make_converter(executor, incidents={"delay": 0.05})
+        result = converter.convert()
+
+    assert len(result.incidents) == 3 and len(result.graph_points) == 5
+    assert converter.entity_map["incidents_by_type"] == {"cards": 3}
+    # Builders are pointed back at the converter collections afterwards
+    builder = converter.builders["incidents"]
+    assert builder.entity_map is converter.entity_map
+    assert builder.normalized_entities is converter.normalized_entities
+
+
+def test_components_run_concurrently():
+    delays = {"incidents": {"delay": 0.2}}
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        converter = make_converter(executor, **delays)
+        converter.builders["graph"].delay = 0.2
+        start = time.perf_counter()
+        converter.convert()
+        elapsed = time.perf_counter() - start
+
+    assert elapsed < 0.35
+
+
+def test_failed_component_is_not_merged():
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        result = make_converter(executor, incidents={"fail": True}).convert()
+
+    assert result.incidents == []
+    assert len(result.graph_points) == 5
+    assert not result.processed_components["incidents"]
+    assert result.processed_components["graph"]
+
+
+def test_process_pools_are_rejected():
+    with ProcessPoolExecutor(max_workers=1) as executor:
+        with pytest.raises(ValueError, match="ThreadPoolExecutor"):
+            make_converter(executor)
+
+
+def test_nested_entity_map_writes_are_merged():
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        converter = make_converter(executor)
+        converter.builders["lineup"] = FakePlayers(converter)
+        converter.builders["lineup"].players = (1, 2)
+        converter.builders["stats"] = FakePlayers(converter)
+        converter.builders["stats"].players = (3,)
+        converter.convert()
+
+    assert converter.entity_map["players"] == {
+        1: "player 1",
+        2: "player 2",
+        3: "player 3",
+    }
+    # Merged in COMPONENTS order, lineup after stats
+    assert converter.entity_map["lineup_data"]["home_lineup"] == 2
+    assert converter.entity_map["lineup_data"]["away_lineup"] is None
+    assert converter.builders["lineup"].shared is False
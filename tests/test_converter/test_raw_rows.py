@@ -0,0 +1,176 @@
+# tests/test_converter/test_raw_rows.py
+import copy
+import io
+import json
+from pathlib import Path
+
+import pytest  # type: ignore
+from sqlmodel import Session, SQLModel, create_engine, select
+
+import sqlsofa.schema.sqlmodels as sqlschema
+from sqlsofa.converters import CompactResult, RawEventsConverter
+from sqlsofa.converters.raw_rows import EVENT, TEAM
+from sqlsofa.loaders import BulkLoader, SessionLoader
+
+from ..conftest import compact_rows, json_lines, raw_events
+
+LOADED_MODELS = (
+    sqlschema.Sport,
+    sqlschema.Category,
+    sqlschema.Tournament,
+    sqlschema.Season,
+    sqlschema.Country,
+    sqlschema.Team,
+    sqlschema.Status,
+    sqlschema.Score,
+    sqlschema.Event,
+)
+
+# Tournament payloads as scraped from sofascore, each with the values the
+# sofascrape TournamentSchema validated it into (example_data/tournaments_data.pkl)
+REAL_TOURNAMENTS = json.loads(
+    (Path(__file__).parents[1] / "data" / "real_tournaments.json").read_text()
+)
+
+
+@pytest.fixture(scope="module")
+def season_61627():
+    """
+    The events_season_61627 notebook fixture, raw and converted through the
+    sofascrape EventsListSchema by EventsComponentConverter.
+    """
+    sofaschemas = pytest.importorskip("sofascrape.schemas.general")
+    from sofascrape.utils import NoteBookType, NotebookUtils  # type: ignore
+
+    from sqlsofa.general import EventsComponentConverter
+
+    nbu = NotebookUtils(type=NoteBookType.GENERAL, web_on=False)
+    raw = nbu.load(file_name="events_season_61627")
+    converter = EventsComponentConverter()
+    converter.convert(sofaschemas.EventsListSchema.model_validate(copy.deepcopy(raw)))
+    validated = {
+        match_id: CompactResult.from_conversion_result(result)
+        for match_id, result in converter.results.items()
+    }
+    return raw, validated
+
+
+def raw_results(data):
+    converter = RawEventsConverter()
+    converter.convert(data)
+    return converter.results
+
+
+def test_rows_match_sofascrape(season_61627):
+    raw, validated = season_61627
+    actual = raw_results(raw)
+
+    assert validated
+    assert sorted(actual) == sorted(validated)
+    for match_id, result in actual.items():
+        assert compact_rows(result) == compact_rows(validated[match_id]), match_id
+        assert result.processed_components == validated[match_id].processed_components
+
+
+def table_contents(engine, model):
+    with Session(engine) as session:
+        return sorted(
+            (
+                obj.model_dump(exclude={"id", "created_at"})
+                for obj in session.exec(select(model)).all()
+            ),
+            key=repr,
+        )
+
+
+@pytest.mark.parametrize("loader_cls", [SessionLoader, BulkLoader])
+def test_loaded_tables_match_sofascrape(engine, tmp_path, loader_cls, season_61627):
+    raw, validated = season_61627
+    other = create_engine(f"sqlite:///{tmp_path / 'sofascrape.db'}")
+    SQLModel.metadata.create_all(other)
+
+    loader_cls(engine).load_batch(list(raw_results(raw).values()))
+    loader_cls(other).load_batch(list(validated.values()))
+
+    for model in LOADED_MODELS:
+        loaded = table_contents(engine, model)
+        assert loaded, model.__tablename__
+        assert loaded == table_contents(other, model), model.__tablename__
+
+
+@pytest.mark.parametrize(
+    "sample", REAL_TOURNAMENTS, ids=[t["raw"]["slug"] for t in REAL_TOURNAMENTS]
+)
+def test_real_tournament_payloads(sample):
+    # Runs without sofascrape, the validated side is checked in with the payload
+    event = raw_events()[0]
+    event["tournament"] = sample["raw"]
+    [result] = raw_results([event]).values()
+
+    validated = sample["validated"]
+    category = validated["category"]
+    expected = {
+        "sports": sqlschema.Sport(**category["sport"]),
+        "categories": sqlschema.Category(
+            **{k: v for k, v in category.items() if k != "sport"},
+            sport_id=category["sport"]["id"],
+        ),
+        "tournaments": sqlschema.Tournament(
+            **{k: v for k, v in validated.items() if k != "category"},
+            category_id=category["id"],
+        ),
+    }
+    rows = compact_rows(result)
+    for table, obj in expected.items():
+        assert rows[table] == [obj.model_dump(exclude={"created_at"})], table
+    [stored_event] = rows["events"]
+    assert stored_event["tournament_id"] == validated["id"]
+
+
+def test_missing_and_null_fields():
+    items = raw_events(2)
+    del items[0]["homeScore"]
+    items[0]["status"] = None
+    items[1]["slug"] = None
+    del items[1]["startTimestamp"]
+
+    first, second = raw_results(items).values()
+    assert "statuses" not in compact_rows(first)
+    [event] = compact_rows(first)["events"]
+    assert event["home_score_id"] is None and event["status_id"] is None
+    [event] = compact_rows(second)["events"]
+    assert event["slug"] is None
+    assert event["startTimestamp"] is None
+
+
+def test_json_entry_points():
+    from_bytes = RawEventsConverter()
+    from_bytes.convert(json.dumps({"events": raw_events()}).encode())
+    from_lines = RawEventsConverter()
+    from_lines.convert_json_lines(io.BytesIO(json_lines(raw_events())))
+
+    expected = [compact_rows(r) for r in raw_results(raw_events()).values()]
+    assert [compact_rows(r) for r in from_bytes] == expected
+    assert [compact_rows(r) for r in from_lines] == expected
+
+
+def test_declared_paths():
+    team = raw_events()[0]["homeTeam"]
+    assert TEAM.row(team)["class_"] == team["class"]
+    assert "country_id" not in TEAM.row(team)
+
+    event = raw_events()[0]
+    row = EVENT.row(event)
+    assert row["home_team_id"] == event["homeTeam"]["id"]
+    assert row["tournament_id"] == 17 and row["season_id"] == 7
+    assert "status_id" not in row and "created_at" not in row
+
+
+@pytest.mark.parametrize("loader_cls", [SessionLoader, BulkLoader])
+def test_raw_rows_load(engine, loader_cls):
+    items = raw_events()
+    loader_cls(engine).load_batch(list(raw_results(items).values()))
+
+    for model in LOADED_MODELS:
+        assert table_contents(engine, model), model.__tablename__
+    assert len(table_contents(engine, sqlschema.Event)) == len(items)
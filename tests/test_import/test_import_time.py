@@ -0,0 +1,88 @@
+# tests/test_import/test_import_time.py
+import json
+import subprocess
+import sys
+
+import pytest  # type: ignore
+
+# Cold start budget for short-lived CLI / cron jobs. Measured on top of the
+# sqlalchemy/sqlmodel import itself, which is outside our control.
+COLD_START_SECONDS = 0.75
+
+HEAVY_MODULES = ["sqlalchemy", "sqlmodel", "pydantic", "sofascrape"]
+
+TIMED = """
+import json, sys, time
+start = time.perf_counter()
+{setup}
+setup = time.perf_counter() - start
+start = time.perf_counter()
+{code}
+elapsed = time.perf_counter() - start
+heavy = sorted(m for m in {heavy!r} if m in sys.modules)
+print(json.dumps({{"setup": setup, "elapsed": elapsed, "heavy": heavy}}))
+"""
+
+LIBRARIES = "import sqlalchemy.orm, sqlmodel"
+
+
+def run_cold(code: str, setup: str = "pass") -> dict:
+    """Run ``setup`` then ``code`` in a fresh interpreter, timing both"""
+    script = TIMED.format(setup=setup, code=code, heavy=HEAVY_MODULES)
+    out = subprocess.run(
+        [sys.executable, "-c", script], capture_output=True, text=True, check=True
+    )
+    return json.loads(out.stdout.strip().splitlines()[-1])
+
+
+@pytest.mark.parametrize(
+    "code",
+    [
+        "import sqlsofa",
+        "import sqlsofa.converters",
+        "import sqlsofa.general",
+        "import sqlsofa.football",
+        "import sqlsofa.loaders",
+        "import sqlsofa.query",
+        "import sqlsofa.analytics",
+        "import sqlsofa.conf",
+    ],
+)
+def test_package_imports_are_lazy(code):
+    result = run_cold(code)
+    assert result["heavy"] == [], f"{code!r} eagerly imported {result['heavy']}"
+
+
+def test_lazy_attributes_resolve():
+    import sqlsofa
+    from sqlsofa.loaders.bulk_loader import BulkLoader
+
+    assert sqlsofa.loaders.BulkLoader is BulkLoader
+    assert "BulkLoader" in dir(sqlsofa.loaders)
+    with pytest.raises(AttributeError):
+        sqlsofa.loaders.NotALoader
+
+
+def test_conversion_result_does_not_need_sofascrape():
+    result = run_cold("from sqlsofa.converters import ConversionResult")
+    assert "sofascrape" not in result["heavy"]
+
+
+@pytest.mark.parametrize(
+    "code",
+    [
+        # Everything a single-match conversion touches, mappers included
+        "from sqlsofa.converters import FootballMatchConverter\n"
+        "from sqlalchemy.orm import configure_mappers\n"
+        "configure_mappers()",
+        "from sqlsofa.loaders import BulkLoader\n"
+        "from sqlalchemy.orm import configure_mappers\n"
+        "configure_mappers()",
+    ],
+)
+def test_cold_start_budget(code):
+    result = run_cold(code, setup=LIBRARIES)
+    assert result["elapsed"] < COLD_START_SECONDS, (
+        f"{code.splitlines()[0]!r}: {result['elapsed']:.3f}s "
+        f"(+{result['setup']:.3f}s sqlalchemy/sqlmodel)"
+    )
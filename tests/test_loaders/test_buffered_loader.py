@@ -0,0 +1,142 @@
+# tests/test_loaders/test_buffered_loader.py
+import pytest  # type: ignore
+from sqlalchemy.exc import OperationalError
+from sqlmodel import Session, select
+
+import sqlsofa.schema.sqlmodels as sqlschema
+from sqlsofa.loaders import BufferedLoader, BulkLoader
+
+from ..conftest import synthetic_season
+from .test_loader_throughput import count
+
+
+class FlakyLoader(BulkLoader):
+    """Fails the first ``failures`` batches with ``message``"""
+
+    def __init__(self, engine, failures: int, message: str) -> None:
+        super().__init__(engine)
+        self.failures = failures
+        self.message = message
+        self.calls = 0
+
+    def _load(self, results):
+        self.calls += 1
+        if self.calls <= self.failures:
+            raise OperationalError("INSERT", {}, Exception(self.message))
+        return super()._load(results)
+
+
+class Clock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def test_flushes_on_row_threshold(engine, season_results):
+    first_three = sum(r.compact().row_count for r in season_results[:3])
+    buffered = BufferedLoader(engine, max_rows=first_three)
+
+    flushes = [buffered.add(result) for result in season_results[:4]]
+
+    assert [f is not None for f in flushes] == [False, False, True, False]
+    assert flushes[2].match_ids == [r.match_id for r in season_results[:3]]
+    assert count(engine, sqlschema.Event) == 3
+    assert len(buffered) == 1
+
+
+def test_flushes_on_byte_threshold(engine, season_results):
+    buffered = BufferedLoader(engine, max_bytes=1)
+
+    assert buffered.add(season_results[0]) is not None
+    assert count(engine, sqlschema.Event) == 1
+
+
+def test_flushes_on_age(engine, season_results):
+    clock = Clock()
+    buffered = BufferedLoader(engine, max_seconds=5.0, clock=clock)
+
+    assert buffered.add(season_results[0]) is None
+    clock.now = 4.0
+    assert buffered.add(season_results[1]) is None
+    assert buffered.poll() is None
+    clock.now = 5.0
+    result = buffered.poll()
+
+    assert result is not None and len(result.match_ids) == 2
+    assert buffered.pending_rows == 0 and buffered.oldest is None
+
+
+def test_context_manager_flushes_remainder(engine, season_results):
+    with BufferedLoader(engine) as buffered:
+        for result in season_results[:2]:
+            buffered.add(result)
+        assert count(engine, sqlschema.Event) == 0
+    assert count(engine, sqlschema.Event) == 2
+
+
+def test_context_manager_keeps_the_original_error(engine, season_results):
+    loader = FlakyLoader(engine, failures=1, message="disk I/O error")
+
+    with pytest.raises(KeyError):
+        with BufferedLoader(engine, loader=loader, retry_delay=0) as buffered:
+            buffered.add(season_results[0])
+            raise KeyError("worker failed")
+    assert loader.calls == 1
+
+
+def test_newer_version_of_a_match_wins(engine):
+    [older] = synthetic_season(n_teams=2)[:1]
+    [newer] = synthetic_season(n_teams=2)[:1]
+    [event] = newer.events
+    event.winnerCode = 3
+    [team] = [t for t in newer.teams if t.id == event.home_team_id]
+    team.name = "Renamed"
+
+    with BufferedLoader(engine) as buffered:
+        buffered.add(older)
+        buffered.add(newer)
+        assert len(buffered) == 1
+        assert buffered.pending_rows == newer.compact().row_count
+
+    with Session(engine) as session:
+        assert session.get(sqlschema.Event, event.id).winnerCode == 3
+        assert session.get(sqlschema.Team, team.id).name == "Renamed"
+
+
+def test_shared_rows_keep_the_newest_values(engine):
+    # Separate builds, the matches of one build share their Team objects
+    first, _ = synthetic_season(n_teams=2)
+    _, second = synthetic_season(n_teams=2)
+    [team] = [t for t in second.teams if t.id == 1000]
+    team.name = "Renamed"
+
+    BulkLoader(engine).load_batch([first, second])
+
+    with Session(engine) as session:
+        stored = session.exec(select(sqlschema.Team).where(sqlschema.Team.id == 1000))
+        assert stored.one().name == "Renamed"
+
+
+def test_retries_deadlocks(engine, season_results):
+    loader = FlakyLoader(engine, failures=2, message="deadlock detected")
+    buffered = BufferedLoader(engine, loader=loader, retry_delay=0)
+    buffered.add(season_results[0])
+
+    assert buffered.flush() is not None
+    assert loader.calls == 3
+    assert count(engine, sqlschema.Event) == 1
+
+
+def test_other_errors_are_not_retried(engine, season_results):
+    loader = FlakyLoader(engine, failures=1, message="disk I/O error")
+    buffered = BufferedLoader(engine, loader=loader, retry_delay=0)
+    buffered.add(season_results[0])
+
+    with pytest.raises(OperationalError):
+        buffered.flush()
+    assert loader.calls == 1
+    # Nothing is lost, the next flush loads the same batch
+    assert buffered.flush() is not None
+    assert count(engine, sqlschema.Event) == 1
@@ -0,0 +1,45 @@
+# tests/test_loaders/test_change_detection.py
+import pytest  # type: ignore
+from sqlalchemy import text
+
+from sqlsofa.loaders import BulkLoader, SessionLoader
+from sqlsofa.schema.tables import LOAD_ORDER
+
+from ..conftest import synthetic_season
+
+KEYED_TABLES = [spec.tablename for spec in LOAD_ORDER if spec.conflict]
+
+
+def xmins(engine, table):
+    with engine.connect() as conn:
+        return dict(conn.execute(text(f"SELECT id, xmin::text FROM {table}")).all())
+
+
+@pytest.mark.parametrize("loader_cls", [SessionLoader, BulkLoader])
+def test_reload_leaves_keyed_rows_alone(engine, loader_cls):
+    loader = loader_cls(engine)
+    first = loader.load_batch(synthetic_season(n_teams=3))
+    assert first.unchanged.get("events", 0) == 0
+
+    second = loader.load_batch(synthetic_season(n_teams=3))
+
+    for table in KEYED_TABLES:
+        assert second.unchanged.get(table, 0) == second.rows.get(table, 0), table
+    assert second.unchanged["events"] == 6
+
+
+@pytest.mark.parametrize("loader_cls", [SessionLoader, BulkLoader])
+def test_only_changed_rows_are_updated(engine, loader_cls):
+    loader = loader_cls(engine)
+    loader.load_batch(synthetic_season(n_teams=3))
+    before = xmins(engine, "events") if engine.dialect.name == "postgresql" else {}
+
+    results = synthetic_season(n_teams=3)
+    changed = next(iter(results[0].events))
+    changed.attendance = 40_000
+    reloaded = loader.load_batch(results)
+
+    assert reloaded.rows["events"] - reloaded.unchanged["events"] == 1
+    if before:
+        after = xmins(engine, "events")
+        assert [i for i in before if before[i] != after[i]] == [changed.id]
@@ -0,0 +1,78 @@
+# tests/test_loaders/test_compact_result.py
+import tracemalloc
+
+import pytest  # type: ignore
+
+import sqlsofa.schema.sqlmodels as sqlschema
+from sqlsofa.converters import CompactResult, LocalRef
+from sqlsofa.loaders import BulkLoader, SessionLoader
+
+from ..conftest import PLAYERS_PER_TEAM, STAT_GROUPS, STAT_PERIODS, synthetic_season
+from .test_loader_throughput import count
+
+
+def test_compact_keeps_every_row(season_results):
+    result = season_results[0]
+    compact = result.compact()
+
+    assert isinstance(compact, CompactResult)
+    assert compact.match_id == result.match_id
+    assert len(compact.tables["events"]) == 1
+    assert len(compact.tables["countries"]) == 1
+    assert len(compact.tables["football_statistic_periods"]) == len(STAT_PERIODS)
+    assert len(compact.tables["statistic_groups"]) == len(STAT_PERIODS) * STAT_GROUPS
+    assert len(compact.tables["lineup_player_entries"]) == 2 * PLAYERS_PER_TEAM
+
+
+def test_compact_links_surrogate_parents_by_row(season_results):
+    compact = season_results[0].compact()
+
+    groups = compact.tables["statistic_groups"]
+    for values in groups.dicts():
+        ref = values["statistic_period_id"]
+        assert isinstance(ref, LocalRef)
+        assert ref < len(compact.tables["football_statistic_periods"])
+
+    # Parents with sofascore ids keep the real id
+    periods = list(compact.tables["football_statistic_periods"].dicts())
+    assert {p["event_id"] for p in periods} == {season_results[0].match_id}
+
+
+def test_compact_models_round_trip(season_results):
+    compact = season_results[0].compact()
+
+    events = compact.models("events")
+    assert [e.id for e in events] == [season_results[0].match_id]
+    assert all(isinstance(e, sqlschema.Event) for e in events)
+
+    groups = compact.models("statistic_groups")
+    assert all(g.statistic_period_id is None for g in groups)
+    assert compact.models("missing_table") == []
+
+
+def test_compact_is_smaller_than_orm_graph():
+    def traced(build):
+        tracemalloc.start()
+        value = build()
+        size, _ = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        return value, size
+
+    results, orm_size = traced(lambda: synthetic_season(n_teams=2))
+    tracemalloc.start()
+    compact = [r.compact() for r in results]
+    compact_size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    assert compact
+    assert compact_size * 3 < orm_size, (compact_size, orm_size)
+
+
+@pytest.mark.parametrize("loader_cls", [SessionLoader, BulkLoader])
+def test_loaders_accept_compact_results(engine, season_results, loader_cls):
+    batch = [r.compact() for r in season_results[:2]]
+    result = loader_cls(engine).load_batch(batch)
+
+    assert result.match_ids == [r.match_id for r in batch]
+    assert count(engine, sqlschema.Event) == 2
+    assert count(engine, sqlschema.FootballStatisticPeriod) == 2 * len(STAT_PERIODS)
@@ -0,0 +1,161 @@
+# tests/test_loaders/test_event_sync.py
+from types import SimpleNamespace
+
+import pytest  # type: ignore
+from sqlalchemy import func, select
+from sqlmodel import Session
+
+import sqlsofa.schema.sqlmodels as sqlschema
+from sqlsofa.general import EventsComponentConverter
+from sqlsofa.loaders import sync_events
+from sqlsofa.loaders.event_sync import event_hash, load_snapshot
+
+from ..conftest import statement_count
+
+SEASON_ID = 7
+FINISHED = {"code": 100, "description": "Ended", "type": "finished"}
+NOT_STARTED = {"code": 0, "description": "Not started", "type": "notstarted"}
+
+
+class Payload(SimpleNamespace):
+    """Stand-in for a sofascrape schema - nested schemas plus to_sql_dict()"""
+
+    def __init__(self, sql, **nested):
+        super().__init__(**{**sql, **nested})
+        self._sql = sql
+
+    def to_sql_dict(self):
+        return dict(self._sql)
+
+
+def score(goals):
+    return Payload({"current": goals, "display": goals, "period1": 0, "period2": goals})
+
+
+def events_list(n_teams=4, played=None):
+    """Round-robin fixture list, the first ``played`` fixtures finished"""
+    sport = Payload({"id": 1, "name": "Football", "slug": "football"})
+    category = Payload(
+        {"id": 1, "name": "England", "slug": "england", "sport_id": 1}, sport=sport
+    )
+    tournament = Payload(
+        {"id": 17, "name": "League", "slug": "league", "category_id": 1},
+        category=category,
+    )
+    season = Payload({"id": SEASON_ID, "name": "Season", "year": "24/25"})
+    country = Payload(
+        {"name": "England", "slug": "england", "alpha2": "EN", "alpha3": "ENG"}
+    )
+    teams = [
+        Payload(
+            {
+                "id": 2000 + i,
+                "name": f"Team {i}",
+                "slug": f"team-{i}",
+                "shortName": f"T{i}",
+                "nameCode": f"T{i}",
+                "gender": "M",
+            },
+            country=country,
+        )
+        for i in range(n_teams)
+    ]
+    fixtures = [(h, a) for h in teams for a in teams if h is not a]
+    played = len(fixtures) if played is None else played
+
+    events = []
+    for n, (home, away) in enumerate(fixtures):
+        finished = n < played
+        events.append(
+            Payload(
+                {
+                    "id": SEASON_ID * 1_000_000 + n,
+                    "slug": f"{home.slug}-{away.slug}",
+                    "startTimestamp": 1_700_000_000 + n * 3600,
+                    "winnerCode": 1 if finished else None,
+                    "hasXg": 1,
+                },
+                tournament=tournament,
+                season=season,
+                homeTeam=home,
+                awayTeam=away,
+                status=Payload(FINISHED if finished else NOT_STARTED),
+                homeScore=score(1) if finished else None,
+                awayScore=score(0) if finished else None,
+            )
+        )
+    return SimpleNamespace(events=events)
+
+
+def convert(payload):
+    converter = EventsComponentConverter()
+    converter.convert(payload)
+    return converter
+
+
+def count(engine, model):
+    with Session(engine) as session:
+        return session.execute(select(func.count()).select_from(model)).scalar_one()
+
+
+def test_convert_shares_entities_across_events():
+    converter = convert(events_list())
+
+    assert len(converter.data) == len(converter.results) == 12
+    teams = {id(t) for r in converter.results.values() for t in r.teams}
+    assert len(teams) == 4
+    statuses = {id(e.status) for e in converter.data}
+    assert len(statuses) == 1
+    assert all(e.home_team_id and e.season_id == SEASON_ID for e in converter.data)
+
+
+def test_first_sync_writes_everything(engine):
+    result = sync_events(engine, convert(events_list(played=5)))
+
+    assert len(result.diff.new) == 12 and not result.diff.changed
+    assert count(engine, sqlschema.Event) == 12
+    assert count(engine, sqlschema.Team) == 4
+    assert count(engine, sqlschema.Status) == 2
+    # 1-0 home and away score rows, shared by the finished events
+    assert count(engine, sqlschema.Score) == 2
+    with Session(engine) as session:
+        event = session.get(sqlschema.Event, SEASON_ID * 1_000_000)
+        assert event.status.code == 100 and event.home_score.current == 1
+        assert event.home_team.country.slug == "england"
+
+
+def test_snapshot_matches_converted_hashes(engine):
+    converter = convert(events_list(played=5))
+    sync_events(engine, converter)
+
+    snapshot = load_snapshot(engine, [SEASON_ID])
+    assert snapshot == {e.id: event_hash(e) for e in converter.data}
+
+
+def test_unchanged_list_costs_one_query(engine):
+    sync_events(engine, convert(events_list(played=5)))
+
+    with statement_count(engine) as statements:
+        result = sync_events(engine, convert(events_list(played=5)))
+
+    assert len(result.diff.unchanged) == 12
+    assert result.load is None
+    assert len(statements) == 1
+
+
+@pytest.mark.parametrize("played", [6, 12])
+def test_only_changed_events_are_written(engine, played):
+    sync_events(engine, convert(events_list(played=5)))
+
+    result = sync_events(engine, convert(events_list(played=played)))
+
+    assert result.diff.new == []
+    assert len(result.diff.changed) == played - 5
+    assert result.load.rows["events"] == played - 5
+    with Session(engine) as session:
+        finished = session.execute(
+            select(func.count())
+            .select_from(sqlschema.Event)
+            .where(sqlschema.Event.winnerCode == 1)
+        ).scalar_one()
+    assert finished == played
@@ -0,0 +1,103 @@
+# tests/test_loaders/test_id_blocks.py
+from sqlmodel import Session, select
+
+import sqlsofa.schema.sqlmodels as sqlschema
+from sqlsofa.loaders import BulkLoader
+from sqlsofa.loaders.id_blocks import IdAllocator
+
+from ..conftest import statement_count, synthetic_season
+from .test_loader_throughput import count, expected_counts
+
+MATCH_TABLES = (
+    "football_statistic_periods",
+    "statistic_groups",
+    "football_statistic_items",
+    "football_lineups",
+    "team_lineups",
+    "lineup_player_entries",
+    "player_statistics",
+)
+
+
+def test_reserved_blocks_do_not_overlap(engine, season_results):
+    BulkLoader(engine).load(season_results[0])
+    table = sqlschema.GraphPoint.__table__
+
+    with Session(engine) as session:
+        allocator = IdAllocator(engine)
+        first = allocator.reserve(session, table, 10)
+        second = allocator.reserve(session, table, 5)
+        session.rollback()
+
+    assert len(first) == 10 and len(second) == 5
+    assert min(first) > count(engine, sqlschema.GraphPoint)
+    assert not set(first) & set(second)
+    assert first == sorted(first)
+
+
+def test_preallocated_load_matches_returning_load(engine, season_results):
+    loader = BulkLoader(engine, preallocate_ids=True)
+
+    with statement_count(engine) as statements:
+        result = loader.load_batch(season_results)
+
+    for model, expected in expected_counts(len(season_results), 6).items():
+        assert count(engine, model) == expected, model.__tablename__
+    for table in MATCH_TABLES:
+        # Keys are resolved in one SELECT, new rows keep their reserved ids
+        assert any(s.startswith(f"INSERT INTO {table}") for s in statements)
+        assert len([s for s in statements if s.startswith(f"SELECT {table}.id")]) == 1
+    assert not [s for s in statements if "RETURNING" in s]
+    assert result.rows["lineup_player_entries"] == count(
+        engine, sqlschema.LineupPlayerEntry
+    )
+
+    with Session(engine) as session:
+        for entry in session.exec(select(sqlschema.LineupPlayerEntry).limit(20)):
+            assert entry.statistics is not None
+            assert entry.team_lineup.football_lineup.event_id is not None
+        for item in session.exec(select(sqlschema.FootballStatisticItem).limit(20)):
+            assert item.statistic_group.statistic_period.event_id is not None
+
+
+def test_preallocated_loads_continue_after_existing_rows(engine):
+    BulkLoader(engine).load_batch(synthetic_season(n_teams=3, season_id=1))
+    BulkLoader(engine, preallocate_ids=True).load_batch(
+        synthetic_season(n_teams=3, season_id=2)
+    )
+    BulkLoader(engine).load_batch(synthetic_season(n_teams=3, season_id=3))
+
+    assert count(engine, sqlschema.FootballLineup) == 18
+
+
+def lineup_entries(results):
+    for result in results:
+        for lineup in result.lineups:
+            for team_lineup in lineup.lineups:
+                yield from team_lineup.players
+
+
+def test_preallocated_reloads_do_not_use_returning(engine):
+    BulkLoader(engine, preallocate_ids=True).load_batch(synthetic_season(n_teams=2))
+    stored = expected_counts(2, 2)
+    results = synthetic_season(n_teams=2)
+    for entry in lineup_entries(results):
+        entry.statistics.touches += 1
+
+    with statement_count(engine) as statements:
+        load = BulkLoader(engine, preallocate_ids=True).load_batch(results)
+
+    assert not [s for s in statements if "RETURNING" in s]
+    for model, expected in stored.items():
+        assert count(engine, model) == expected, model.__tablename__
+    # Changed rows are updated in place, the others are left alone
+    assert "player_statistics" not in load.unchanged
+    assert (
+        load.unchanged["football_statistic_items"]
+        == load.rows["football_statistic_items"]
+    )
+    with Session(engine) as session:
+        touches = session.exec(select(sqlschema.PlayerStatistics.touches)).all()
+    assert sorted(touches) == sorted(
+        entry.statistics.touches for entry in lineup_entries(results)
+    )
@@ -0,0 +1,173 @@
+# tests/test_loaders/test_job_queue.py
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+
+from sqlalchemy.dialects import postgresql
+from sqlmodel import Session, select
+
+import sqlsofa.schema.sqlmodels as sqlschema
+from sqlsofa.loaders import BulkLoader, JobQueue, run_worker
+
+from ..conftest import synthetic_season
+from .test_loader_throughput import count
+
+
+class FakeConverter:
+    def __init__(self, result):
+        self.result = result
+
+    def convert(self):
+        if isinstance(self.result, Exception):
+            raise self.result
+        return self.result
+
+
+def job(engine, match_id):
+    with Session(engine) as session:
+        return session.exec(
+            select(sqlschema.IngestJob).where(sqlschema.IngestJob.match_id == match_id)
+        ).one()
+
+
+def test_claim_uses_skip_locked(engine):
+    stmt = JobQueue(engine).claim_statement("w1", 10)
+    sql = str(stmt.compile(dialect=postgresql.dialect()))
+    assert "FOR UPDATE SKIP LOCKED" in sql
+    assert sql.startswith("UPDATE ingest_jobs")
+    assert "timezone('utc', now())" in sql
+
+
+def test_leases_use_database_utc_time(engine):
+    queue = JobQueue(engine, lease=timedelta(minutes=5))
+    queue.enqueue([1])
+    queue.claim("w1", 1)
+
+    claimed = job(engine, 1)
+    utc = datetime.now(timezone.utc).replace(tzinfo=None)
+    assert abs(claimed.heartbeat_at - utc) < timedelta(seconds=5)
+    assert claimed.leased_until - claimed.heartbeat_at == timedelta(minutes=5)
+
+
+def test_enqueue_is_idempotent(engine):
+    queue = JobQueue(engine)
+    assert queue.enqueue([1, 2, 3]) == 3
+    assert queue.enqueue([3, 4]) == 1
+    assert queue.counts() == {"pending": 4}
+
+
+def test_concurrent_claims_are_disjoint(engine):
+    queue = JobQueue(engine)
+    queue.enqueue(range(1, 101))
+    claimed = {}
+
+    def claim(worker):
+        ids = []
+        while batch := queue.claim(worker, 7):
+            ids.extend(batch)
+        claimed[worker] = ids
+
+    threads = [threading.Thread(target=claim, args=(f"w{i}",)) for i in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    everything = [i for ids in claimed.values() for i in ids]
+    assert sorted(everything) == list(range(1, 101))
+    assert queue.counts() == {"running": 100}
+
+
+def test_expired_lease_is_reclaimed(engine):
+    queue = JobQueue(engine, lease=timedelta(seconds=-1))
+    queue.enqueue([1, 2])
+    assert queue.claim("dead", 2) == [1, 2]
+
+    assert queue.claim("alive", 5) == [1, 2]
+    # The first worker lost its jobs and can no longer finish them
+    assert queue.heartbeat("dead", [1, 2]) == 0
+    assert queue.complete("dead", [1, 2]) == 0
+    assert queue.complete("alive", [1, 2]) == 2
+    assert job(engine, 1).attempts == 2
+
+
+def test_heartbeat_keeps_the_lease(engine):
+    queue = JobQueue(engine)
+    queue.enqueue([1])
+    queue.claim("w1", 1)
+    before = job(engine, 1).leased_until
+
+    assert queue.heartbeat("w1", [1]) == 1
+    assert job(engine, 1).leased_until >= before
+    assert queue.claim("w2", 1) == []
+
+
+def test_failures_retry_then_park(engine):
+    queue = JobQueue(engine, max_attempts=2)
+    queue.enqueue([1])
+    for expected in ("pending", "failed"):
+        queue.claim("w1", 1)
+        queue.fail("w1", 1, ValueError("bad payload"))
+        assert job(engine, 1).status.value == expected
+    assert job(engine, 1).error_message == "ValueError: bad payload"
+    assert queue.claim("w1", 1) == []
+
+
+def test_workers_drain_the_queue(engine):
+    results = {r.match_id: r for r in synthetic_season(n_teams=4)}
+    broken = next(iter(results))
+    results[broken] = RuntimeError("missing component")
+    queue = JobQueue(engine)
+    queue.enqueue(results)
+
+    counts = [{}, {}]
+
+    def work(i):
+        counts[i] = run_worker(
+            queue,
+            results.__getitem__,
+            BulkLoader(engine),
+            converter_cls=FakeConverter,
+            worker=f"w{i}",
+            batch_size=3,
+        )
+
+    threads = [threading.Thread(target=work, args=(i,)) for i in range(2)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert sum(c["done"] for c in counts) == len(results) - 1
+    assert count(engine, sqlschema.Event) == len(results) - 1
+    assert queue.counts()["done"] == len(results) - 1
+    assert job(engine, broken).status.value in ("pending", "failed")
+
+
+class SlowLoader(BulkLoader):
+    """Loads after outlasting the lease, while another worker tries to claim"""
+
+    def __init__(self, engine, queue, seconds):
+        super().__init__(engine)
+        self.queue = queue
+        self.seconds = seconds
+        self.stolen = None
+
+    def load_batch(self, results):
+        time.sleep(self.seconds)
+        self.stolen = self.queue.claim("thief", 10)
+        return super().load_batch(results)
+
+
+def test_slow_loads_keep_their_lease(engine):
+    results = {r.match_id: r for r in synthetic_season(n_teams=2)}
+    queue = JobQueue(engine, lease=timedelta(seconds=1.5))
+    queue.enqueue(results)
+    loader = SlowLoader(engine, queue, seconds=2.5)
+
+    counts = run_worker(
+        queue, results.__getitem__, loader, converter_cls=FakeConverter, worker="w1"
+    )
+
+    assert loader.stolen == []
+    assert counts == {"done": len(results), "failed": 0, "lost": 0}
@@ -0,0 +1,127 @@
+# tests/test_loaders/test_live_loader.py
+from sqlalchemy import select
+from sqlmodel import Session
+
+import sqlsofa.schema.sqlmodels as sqlschema
+from sqlsofa.converters.compact_result import CompactResult, RowBuffer
+from sqlsofa.loaders import BulkLoader, LiveLoader
+from sqlsofa.utils.sql_stats import max_statements
+
+from ..conftest import (
+    GRAPH_POINTS_PER_MATCH,
+    INCIDENTS_PER_MATCH,
+    statement_count,
+    synthetic_season,
+)
+from .test_loader_throughput import count, expected_counts
+from .test_natural_keys import sourced_match, stored_incidents
+
+LIVE_TABLES = {"statuses", "scores", "events", "incidents", "graph_points"}
+
+
+def match(n_teams=2):
+    return synthetic_season(n_teams=n_teams)[0]
+
+
+def at_minute(result: CompactResult, minute: int) -> CompactResult:
+    """The match as scraped at ``minute``"""
+    early = CompactResult(result.match_id)
+    early.tables = dict(result.tables)
+    for table, column in (("incidents", "time"), ("graph_points", "minute")):
+        buffer = result.tables[table]
+        position = buffer.columns.index(column)
+        early.tables[table] = RowBuffer(table)
+        early.tables[table].rows = [r for r in buffer.rows if r[position] <= minute]
+    return early
+
+
+def test_refresh_appends_new_rows_only(engine):
+    full = match().compact()
+    BulkLoader(engine).load(at_minute(full, 25))
+    assert count(engine, sqlschema.GraphPoint) == 25
+    assert count(engine, sqlschema.Incident) == 3
+
+    result = LiveLoader(engine).load(full)
+
+    assert set(result.rows) <= LIVE_TABLES
+    assert result.rows["graph_points"] == GRAPH_POINTS_PER_MATCH - 25
+    assert result.rows["incidents"] == INCIDENTS_PER_MATCH - 3
+    assert count(engine, sqlschema.GraphPoint) == GRAPH_POINTS_PER_MATCH
+    assert count(engine, sqlschema.Incident) == INCIDENTS_PER_MATCH
+    with Session(engine) as session:
+        sequences = session.exec(select(sqlschema.Incident.sequence)).all()
+    assert sorted(s for (s,) in sequences) == list(range(-INCIDENTS_PER_MATCH, 0))
+
+
+def test_refresh_costs_a_few_statements(engine):
+    full = match(n_teams=4).compact()
+    BulkLoader(engine).load(at_minute(full, 60))
+
+    with max_statements(engine, 7) as stats:
+        LiveLoader(engine).load(full)
+    static = {"teams", "lineup_players", "football_statistic_items", "team_lineups"}
+    assert not static & set(stats.group("table"))
+
+
+def test_unchanged_refresh_writes_nothing(engine):
+    full = match().compact()
+    BulkLoader(engine).load(full)
+
+    result = LiveLoader(engine).load(full)
+
+    assert result.changed_rows == 0
+    assert "graph_points" not in result.rows and "incidents" not in result.rows
+
+
+def test_score_changes_move_the_event(engine):
+    BulkLoader(engine).load(match())
+    scored = match()
+    event = next(iter(scored.events))
+    event.home_score.current += 1
+    event.home_score.display += 1
+
+    LiveLoader(engine).load(scored)
+
+    with Session(engine) as session:
+        stored = session.get(sqlschema.Event, event.id)
+        assert stored.home_score.current == event.home_score.current
+    assert count(engine, sqlschema.Event) == 1
+
+
+def test_new_matches_are_loaded_in_full(engine):
+    results = synthetic_season(n_teams=2)
+    BulkLoader(engine).load(at_minute(results[0].compact(), 10))
+
+    LiveLoader(engine).load_batch(results)
+
+    for model, expected in expected_counts(len(results), 2).items():
+        assert count(engine, model) == expected, model.__tablename__
+
+
+def deletes(statements):
+    return [s for s in statements if s.lstrip().upper().startswith("DELETE")]
+
+
+def test_late_and_removed_incidents(engine):
+    BulkLoader(engine).load(sourced_match())
+    before = stored_incidents(engine)
+
+    with statement_count(engine) as statements:
+        result = LiveLoader(engine).load(sourced_match(drop=[902], late=[(950, 5)]))
+
+    assert len(deletes(statements)) == 1
+    assert result.rows["incidents"] == 1
+    after = stored_incidents(engine)
+    assert after[950][1] == 5
+    # The goal disallowed after VAR review is gone, the others are untouched
+    del before[902]
+    assert {k: v for k, v in after.items() if k != 950} == before
+
+
+def test_refresh_without_removed_incidents_deletes_nothing(engine):
+    BulkLoader(engine).load(sourced_match())
+
+    with statement_count(engine) as statements:
+        LiveLoader(engine).load(sourced_match(late=[(950, 5)]))
+
+    assert deletes(statements) == []
@@ -0,0 +1,113 @@
+# tests/test_loaders/test_loader_throughput.py
+import pytest  # type: ignore
+from sqlalchemy import func, select
+from sqlmodel import Session
+
+import sqlsofa.schema.sqlmodels as sqlschema
+from sqlsofa.loaders import BulkLoader, SessionLoader
+
+from ..conftest import (
+    GRAPH_POINTS_PER_MATCH,
+    INCIDENTS_PER_MATCH,
+    PLAYERS_PER_TEAM,
+    STAT_GROUPS,
+    STAT_ITEMS,
+    STAT_PERIODS,
+    synthetic_season,
+)
+
+# Minimum rows/second per loader path, deliberately conservative so they
+# hold on SQLite in CI while still catching order-of-magnitude regressions.
+MIN_ROWS_PER_SECOND = {
+    SessionLoader: 300,
+    BulkLoader: 3_000,
+}
+
+LOADERS = [SessionLoader, BulkLoader]
+
+
+def count(engine, model) -> int:
+    with Session(engine) as session:
+        return session.exec(select(func.count()).select_from(model)).one()[0]
+
+
+def expected_counts(n_matches: int, n_teams: int):
+    return {
+        sqlschema.Event: n_matches,
+        sqlschema.Team: n_teams,
+        sqlschema.Country: 1,
+        sqlschema.LineupPlayer: n_teams * PLAYERS_PER_TEAM,
+        sqlschema.FootballStatisticPeriod: n_matches * len(STAT_PERIODS),
+        sqlschema.StatisticGroup: n_matches * len(STAT_PERIODS) * STAT_GROUPS,
+        sqlschema.FootballStatisticItem: n_matches
+        * len(STAT_PERIODS)
+        * STAT_GROUPS
+        * STAT_ITEMS,
+        sqlschema.TeamLineup: n_matches * 2,
+        sqlschema.LineupPlayerEntry: n_matches * 2 * PLAYERS_PER_TEAM,
+        sqlschema.PlayerStatistics: n_matches * 2 * PLAYERS_PER_TEAM,
+        sqlschema.Incident: n_matches * INCIDENTS_PER_MATCH,
+        sqlschema.GraphPoint: n_matches * GRAPH_POINTS_PER_MATCH,
+    }
+
+
+@pytest.mark.parametrize("loader_cls", LOADERS)
+def test_load_season_row_counts(engine, season_results, loader_cls):
+    result = loader_cls(engine).load_batch(season_results)
+
+    assert result.match_ids == [r.match_id for r in season_results]
+    for model, expected in expected_counts(len(season_results), 6).items():
+        assert count(engine, model) == expected, model.__tablename__
+    # Scores are value rows shared between events
+    goals = {
+        score.current
+        for r in season_results
+        for event in r.events
+        for score in (event.home_score, event.away_score)
+    }
+    assert count(engine, sqlschema.Score) == len(goals)
+
+
+@pytest.mark.parametrize("loader_cls", LOADERS)
+def test_load_links_hierarchies(engine, season_results, loader_cls):
+    loader_cls(engine).load(season_results[0])
+
+    with Session(engine) as session:
+        period = session.exec(select(sqlschema.FootballStatisticPeriod)).first()[0]
+        assert len(period.groups) == STAT_GROUPS
+        assert all(len(g.statistics_items) == STAT_ITEMS for g in period.groups)
+
+        entry = session.exec(select(sqlschema.LineupPlayerEntry)).first()[0]
+        assert entry.player is not None
+        assert entry.player.country.slug == "england"
+        assert entry.statistics is not None
+        assert entry.team_lineup.football_lineup.event_id == season_results[0].match_id
+
+
+@pytest.mark.parametrize("loader_cls", LOADERS)
+def test_reload_is_idempotent_for_keyed_rows(engine, season_results, loader_cls):
+    batch = season_results[:3]
+    loader = loader_cls(engine)
+    loader.load_batch(batch)
+    loader.load_batch(batch)
+
+    assert count(engine, sqlschema.Event) == 3
+    assert count(engine, sqlschema.Team) == len(set().union(*(r.teams for r in batch)))
+    assert count(engine, sqlschema.Country) == 1
+
+
+@pytest.mark.parametrize("loader_cls", LOADERS)
+def test_loader_throughput(engine, season_results, loader_cls):
+    # Two seasons through the same tournament, the second reuses every team
+    loader = loader_cls(engine)
+    results = [
+        loader.load_batch(season_results),
+        loader.load_batch(synthetic_season(season_id=2)),
+    ]
+
+    for result in results:
+        assert result.rows_per_second >= MIN_ROWS_PER_SECOND[loader_cls], (
+            f"{loader_cls.__name__}: {result.total_rows} rows in "
+            f"{result.duration:.3f}s ({result.rows_per_second:,.0f} rows/s)"
+        )
+    assert count(engine, sqlschema.Season) == 2
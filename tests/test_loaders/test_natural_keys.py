@@ -0,0 +1,165 @@
+# tests/test_loaders/test_natural_keys.py
+import pytest  # type: ignore
+from sqlmodel import Session, select
+
+import sqlsofa.schema.sqlmodels as sqlschema
+from sqlsofa.converters.compact_result import CompactResult
+from sqlsofa.loaders import BulkLoader, SessionLoader
+from sqlsofa.schema.tables import LOAD_ORDER
+
+from ..conftest import INCIDENTS_PER_MATCH, synthetic_season
+from .test_loader_throughput import count, expected_counts
+
+MATCH_SCOPED = [spec.model for spec in LOAD_ORDER if spec.match_scoped]
+
+LOADERS = {
+    "session": lambda engine: SessionLoader(engine),
+    "bulk": lambda engine: BulkLoader(engine),
+    "preallocated": lambda engine: BulkLoader(engine, preallocate_ids=True),
+}
+
+
+def test_match_scoped_tables_have_natural_keys():
+    assert MATCH_SCOPED
+    assert all(
+        spec.has_natural_key for spec in LOAD_ORDER if spec.match_scoped
+    ), "match child rows need a key to be re-ingested"
+
+
+@pytest.mark.parametrize("first", LOADERS)
+@pytest.mark.parametrize("second", LOADERS)
+def test_reingesting_a_season_adds_no_rows(engine, first, second):
+    LOADERS[first](engine).load_batch(synthetic_season(n_teams=3))
+    before = {model: count(engine, model) for model in MATCH_SCOPED}
+
+    LOADERS[second](engine).load_batch(synthetic_season(n_teams=3))
+
+    assert {model: count(engine, model) for model in MATCH_SCOPED} == before
+    for model, expected in expected_counts(6, 3).items():
+        assert count(engine, model) == expected, model.__tablename__
+
+
+def test_reingest_updates_child_rows_in_place(engine):
+    loader = BulkLoader(engine)
+    loader.load_batch(synthetic_season(n_teams=3))
+    with Session(engine) as session:
+        ids = set(session.exec(select(sqlschema.FootballStatisticItem.id)))
+
+    results = synthetic_season(n_teams=3)
+    item = results[0].statistic_periods[0].groups[0].statistics_items[0]
+    item.home = "99"
+    reloaded = loader.load_batch(results)
+
+    table = "football_statistic_items"
+    assert reloaded.rows[table] - reloaded.unchanged[table] == 1
+    with Session(engine) as session:
+        assert set(session.exec(select(sqlschema.FootballStatisticItem.id))) == ids
+        homes = session.exec(select(sqlschema.FootballStatisticItem.home)).all()
+    assert homes.count("99") == 1
+
+
+def test_compaction_fills_derived_keys():
+    result = synthetic_season(n_teams=2)[0]
+    result.incidents.reverse()
+    compact = CompactResult.from_conversion_result(result)
+
+    incidents = compact.tables["incidents"]
+    rows = [dict(zip(incidents.columns, row)) for row in incidents.rows]
+    by_time = sorted(rows, key=lambda row: row["time"])
+    assert [row["sequence"] for row in by_time] == [
+        -1 - i for i in range(INCIDENTS_PER_MATCH)
+    ]
+
+    stats = compact.tables["player_statistics"]
+    keys = {
+        (row[stats.columns.index("event_id")], row[stats.columns.index("player_id")])
+        for row in stats.rows
+    }
+    assert len(keys) == len(stats.rows)
+    assert all(event_id == result.match_id for event_id, _ in keys)
+
+
+def sourced_match(drop=(), late=()):
+    """A match whose goals carry sofascore ids 900.., ``late`` adds (id, time)"""
+    result = synthetic_season(n_teams=2)[0]
+    for i, incident in enumerate(result.incidents):
+        incident.source_id = 900 + i
+    result.incidents = [i for i in result.incidents if i.source_id not in drop]
+    for source_id, time in late:
+        result.incidents.append(
+            sqlschema.Incident(
+                incidentType="goal",
+                time=time,
+                source_id=source_id,
+                event_id=result.match_id,
+            )
+        )
+    result.incidents.append(
+        sqlschema.Incident(incidentType="period", time=45, event_id=result.match_id)
+    )
+    result.processed_components["incidents"] = True
+    return result
+
+
+def stored_rows(engine):
+    with Session(engine) as session:
+        return session.exec(select(sqlschema.Incident)).all()
+
+
+def stored_incidents(engine):
+    with Session(engine) as session:
+        return {
+            incident.source_id: (incident.id, incident.time, incident.sequence)
+            for incident in session.exec(select(sqlschema.Incident)).all()
+        }
+
+
+def test_incidents_are_keyed_on_their_source_id():
+    compact = CompactResult.from_conversion_result(sourced_match(late=[(950, 5)]))
+
+    incidents = compact.tables["incidents"]
+    rows = [dict(zip(incidents.columns, row)) for row in incidents.rows]
+    assert {row["sequence"] for row in rows if row["incidentType"] == "goal"} == {
+        row["source_id"] for row in rows if row["incidentType"] == "goal"
+    }
+    [period] = [row for row in rows if row["incidentType"] == "period"]
+    assert period["sequence"] == -1 and period["source_id"] is None
+
+
+@pytest.mark.parametrize("loader", ["session", "bulk"])
+def test_positions_and_source_ids_do_not_collide(engine, loader):
+    result = sourced_match(late=[(1, 7)])
+    result.incidents.append(
+        sqlschema.Incident(incidentType="goal", time=8, event_id=result.match_id)
+    )
+
+    LOADERS[loader](engine).load(result)
+
+    goals = [i for i in stored_rows(engine) if i.incidentType == "goal"]
+    assert sorted(i.sequence for i in goals) == [-1, 1, 900, 901, 902, 903, 904, 905]
+
+
+@pytest.mark.parametrize("loader", ["session", "bulk"])
+def test_removed_and_late_incidents_do_not_shift_others(engine, loader):
+    LOADERS[loader](engine).load(sourced_match())
+    before = stored_incidents(engine)
+
+    # A goal disallowed after VAR review, and an earlier one scraped late
+    LOADERS[loader](engine).load(sourced_match(drop=[902], late=[(950, 5)]))
+    after = stored_incidents(engine)
+
+    assert after[950][1] == 5
+    assert 902 not in after
+    for source_id in (900, 901, 903, 904, 905, None):
+        assert after[source_id] == before[source_id], source_id
+
+
+@pytest.mark.parametrize("loader", ["session", "bulk"])
+def test_incidents_are_kept_without_the_incidents_component(engine, loader):
+    LOADERS[loader](engine).load(sourced_match())
+
+    partial = sourced_match(drop=[902])
+    del partial.processed_components["incidents"]
+    LOADERS[loader](engine).load(partial)
+
+    assert 902 in stored_incidents(engine)
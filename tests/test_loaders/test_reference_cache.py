@@ -0,0 +1,83 @@
+# tests/test_loaders/test_reference_cache.py
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest  # type: ignore
+from sqlmodel import Session
+
+import sqlsofa.schema.sqlmodels as sqlschema
+from sqlsofa.loaders import BulkLoader, SessionLoader
+from sqlsofa.utils.reference_cache import REFERENCE_TABLES, ReferenceCache
+
+LOADERS = [SessionLoader, BulkLoader]
+
+
+def test_cache_reuses_unchanged_models():
+    cache = ReferenceCache()
+    values = {"id": 1, "name": "Football", "slug": "football"}
+
+    first = cache.model(sqlschema.Sport, values)
+    assert cache.model(sqlschema.Sport, dict(values)) is first
+    changed = cache.model(sqlschema.Sport, {**values, "name": "Soccer"})
+
+    assert changed is not first
+    assert changed.name == "Soccer"
+    assert (cache.hits, cache.misses) == (1, 2)
+
+
+def test_cache_is_shared_across_threads():
+    cache = ReferenceCache()
+    values = [{"id": n % 5, "name": f"Sport {n % 5}", "slug": "s"} for n in range(500)]
+
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        built = list(executor.map(lambda v: cache.model(sqlschema.Sport, v), values))
+
+    assert len({id(obj) for obj in built}) == 5
+    assert (cache.hits, cache.misses) == (495, 5)
+
+
+@pytest.mark.parametrize("loader_cls", LOADERS)
+def test_loader_skips_stored_reference_rows(engine, season_results, loader_cls):
+    cache = ReferenceCache()
+    loader = loader_cls(engine, reference_cache=cache)
+
+    first = loader.load(season_results[0])
+    second = loader.load(season_results[1])
+
+    for table in REFERENCE_TABLES:
+        assert first.rows[table] == 1
+        assert second.rows.get(table, 0) == 0
+    assert second.rows["events"] == 1
+
+
+@pytest.mark.parametrize("loader_cls", LOADERS)
+def test_loader_rewrites_changed_reference_rows(engine, season_results, loader_cls):
+    cache = ReferenceCache()
+    loader = loader_cls(engine, reference_cache=cache)
+    loader.load(season_results[0])
+
+    # Stale cache entry - the loader must write the current values
+    season_id = season_results[0].match_id // 1_000_000
+    cache.rows["seasons"][season_id]["name"] = "Old name"
+    result = loader.load(season_results[1])
+
+    assert result.rows["seasons"] == 1
+    assert cache.rows["seasons"][season_id]["name"] == f"Season {season_id}"
+
+
+def test_cache_from_engine_and_disk(engine, season_results, tmp_path):
+    BulkLoader(engine).load(season_results[0])
+
+    cache = ReferenceCache.from_engine(engine)
+    assert all(len(cache.rows[table]) == 1 for table in REFERENCE_TABLES)
+
+    path = tmp_path / "reference.json"
+    cache.save(path)
+    restored = ReferenceCache.load(path)
+    assert restored.rows == cache.rows
+    assert ReferenceCache.load(tmp_path / "missing.json").rows == ReferenceCache().rows
+
+    with Session(engine) as session:
+        sport = session.get(sqlschema.Sport, 1)
+        values = sport.model_dump()
+    assert restored.is_current("sports", values)
+    assert not restored.is_current("sports", {**values, "name": "Other"})
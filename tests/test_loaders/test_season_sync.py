@@ -0,0 +1,101 @@
+# tests/test_loaders/test_season_sync.py
+from types import SimpleNamespace
+
+from sqlalchemy import select
+from sqlmodel import Session
+
+import sqlsofa.schema.sqlmodels as sqlschema
+from sqlsofa.general import SeasonsComponentConverter
+from sqlsofa.loaders import sync_seasons
+from sqlsofa.loaders.season_sync import apply_season_diff, diff_seasons, season_rows
+from sqlsofa.utils.reference_cache import ReferenceCache
+
+from ..conftest import statement_count
+
+
+def seasons_list(n=5, renamed=(), extra=0):
+    seasons = [
+        SimpleNamespace(
+            id=100 + i,
+            name=f"Season {i}" + (" (renamed)" if i in renamed else ""),
+            year=f"{i:02d}/{i + 1:02d}",
+        )
+        for i in range(n + extra)
+    ]
+    return SimpleNamespace(seasons=seasons)
+
+
+def convert(payload, reference_cache=None):
+    converter = SeasonsComponentConverter(reference_cache)
+    converter.convert(payload)
+    return converter
+
+
+def stored(engine):
+    with Session(engine) as session:
+        return {
+            s.id: s.name for s in session.execute(select(sqlschema.Season)).scalars()
+        }
+
+
+def test_convert_fills_data_one_season_per_id():
+    payload = seasons_list(3)
+    payload.seasons.append(SimpleNamespace(id=100, name="Season 0 again", year="x"))
+    converter = convert(payload)
+
+    assert len(converter.raw_data) == 4
+    assert [s.id for s in converter.data] == [100, 101, 102]
+    assert converter.seasons[100].name == "Season 0 again"
+
+
+def test_sync_inserts_updates_and_skips(engine):
+    diff = sync_seasons(engine, convert(seasons_list()))
+    assert diff.insert == [100, 101, 102, 103, 104] and not diff.update
+
+    diff = sync_seasons(engine, convert(seasons_list(renamed=(1,), extra=1)))
+    assert diff.insert == [105]
+    assert diff.update == [101]
+    assert diff.unchanged == [100, 102, 103, 104]
+    assert stored(engine)[101] == "Season 1 (renamed)"
+    assert len(stored(engine)) == 6
+
+
+def test_unchanged_poll_is_one_round_trip(engine):
+    sync_seasons(engine, convert(seasons_list()))
+
+    with statement_count(engine) as statements:
+        diff = sync_seasons(engine, convert(seasons_list()))
+
+    assert not diff.has_changes
+    assert len(statements) == 1
+
+
+def test_warm_cache_skips_the_read(engine):
+    cache = ReferenceCache()
+    sync_seasons(engine, convert(seasons_list(), cache))
+
+    with statement_count(engine) as statements:
+        diff = sync_seasons(engine, convert(seasons_list(), cache))
+    assert len(diff.unchanged) == 5
+    assert statements == []
+
+    with statement_count(engine) as statements:
+        diff = sync_seasons(engine, convert(seasons_list(renamed=(2,)), cache))
+    assert diff.update == [102]
+    # Only the changed season is read back, then one update
+    assert len(statements) == 2
+
+
+def test_concurrent_pollers_do_not_collide(engine):
+    rows = season_rows(convert(seasons_list(renamed=(1,))))
+    with engine.connect() as conn:
+        diff = diff_seasons(conn, rows)
+    # Another poller stores the same list meanwhile
+    sync_seasons(engine, convert(seasons_list()))
+
+    with engine.begin() as conn:
+        apply_season_diff(conn, rows, diff)
+
+    assert diff.insert == [100, 101, 102, 103, 104]
+    assert len(stored(engine)) == 5
+    assert stored(engine)[101] == "Season 1 (renamed)"
@@ -0,0 +1,111 @@
+# tests/test_loaders/test_summaries.py
+from collections import defaultdict
+
+import pytest  # type: ignore
+from sqlalchemy import select
+from sqlmodel import Session
+
+import sqlsofa.schema.sqlmodels as sqlschema
+from sqlsofa.loaders import BulkLoader, SessionLoader
+from sqlsofa.loaders.summaries import FORM_LENGTH, refresh_summaries
+
+from ..conftest import match_score, synthetic_season
+
+
+def expected_points(season_results, season_id):
+    points = defaultdict(int)
+    for result in season_results:
+        (event,) = result.events
+        home, away = match_score(event.home_team_id, event.away_team_id, season_id)
+        if home == away:
+            points[event.home_team_id] += 1
+            points[event.away_team_id] += 1
+        else:
+            winner = event.home_team_id if home > away else event.away_team_id
+            points[winner] += 3
+    return dict(points)
+
+
+def rows(engine, model, *criteria):
+    with Session(engine) as session:
+        return list(session.execute(select(model).where(*criteria)).scalars())
+
+
+@pytest.mark.parametrize("loader_cls", [SessionLoader, BulkLoader])
+def test_loader_refreshes_standings(engine, season_results, loader_cls):
+    loader_cls(engine, refresh_summaries=True).load_batch(season_results)
+
+    standings = rows(engine, sqlschema.SeasonStanding)
+    assert {s.team_id: s.points for s in standings} == expected_points(
+        season_results, season_id=1
+    )
+    standings.sort(key=lambda s: s.position)
+    assert [s.position for s in standings] == list(range(1, 7))
+    assert [s.points for s in standings] == sorted(
+        (s.points for s in standings), reverse=True
+    )
+    for s in standings:
+        assert s.played == 10 == s.won + s.drawn + s.lost
+        assert s.goal_difference == s.goals_for - s.goals_against
+        assert s.tournament_id == 17
+
+    form = rows(engine, sqlschema.TeamForm)
+    assert len(form) == 6
+    assert all(len(f.form) == FORM_LENGTH and set(f.form) <= set("WDL") for f in form)
+
+
+def test_head_to_head_spans_seasons(engine, season_results):
+    loader = BulkLoader(engine, refresh_summaries=True)
+    loader.load_batch(season_results)
+    (record,) = rows(
+        engine,
+        sqlschema.HeadToHead,
+        sqlschema.HeadToHead.team_a_id == 1000,
+        sqlschema.HeadToHead.team_b_id == 1001,
+    )
+    assert record.played == 2
+    assert record.team_a_wins + record.team_b_wins + record.draws == 2
+
+    loader.load_batch(synthetic_season(n_teams=3, season_id=2))
+    (record,) = rows(
+        engine,
+        sqlschema.HeadToHead,
+        sqlschema.HeadToHead.team_a_id == 1000,
+        sqlschema.HeadToHead.team_b_id == 1001,
+    )
+    assert record.played == 4
+    assert len(rows(engine, sqlschema.HeadToHead)) == 15
+
+
+def test_only_affected_seasons_are_refreshed(engine, season_results):
+    loader = BulkLoader(engine, refresh_summaries=True)
+    loader.load_batch(season_results)
+    before = {
+        s.team_id: s.updated_at
+        for s in rows(
+            engine, sqlschema.SeasonStanding, sqlschema.SeasonStanding.season_id == 1
+        )
+    }
+
+    loader.load_batch(synthetic_season(n_teams=3, season_id=2))
+
+    after = rows(engine, sqlschema.SeasonStanding)
+    assert {s.team_id: s.updated_at for s in after if s.season_id == 1} == before
+    assert len([s for s in after if s.season_id == 2]) == 3
+
+
+def test_refresh_drops_rows_of_undecided_events(engine, season_results):
+    BulkLoader(engine, refresh_summaries=True).load_batch(season_results[:2])
+    assert rows(engine, sqlschema.SeasonStanding)
+    assert rows(engine, sqlschema.HeadToHead)
+
+    with Session(engine) as session:
+        for event in session.execute(select(sqlschema.Event)).scalars():
+            event.winnerCode = None
+        session.commit()
+    refresh_summaries(engine, [1])
+
+    assert rows(engine, sqlschema.SeasonStanding) == []
+    assert rows(engine, sqlschema.TeamForm) == []
+    # The pairs of the undecided matches are rebuilt too
+    assert rows(engine, sqlschema.HeadToHead) == []
@@ -0,0 +1,108 @@
+# tests/test_query/test_queries.py
+import pytest  # type: ignore
+
+from sqlsofa.loaders import BulkLoader
+from sqlsofa.query import MatchReader, TTLCache
+
+from ..conftest import (
+    INCIDENTS_PER_MATCH,
+    PLAYERS_PER_TEAM,
+    STAT_GROUPS,
+    STAT_ITEMS,
+    STAT_PERIODS,
+    statement_count,
+)
+
+
+@pytest.fixture
+def loaded(engine, season_results):
+    BulkLoader(engine).load_batch(season_results)
+    return engine, season_results
+
+
+def test_match_is_fully_loaded_in_fixed_statements(loaded):
+    engine, season_results = loaded
+    match_id = season_results[0].match_id
+    reader = MatchReader(engine)
+
+    with statement_count(engine) as statements:
+        match = reader.match(match_id)
+    # Detached - any lazy load below would raise
+    assert match.home_team.name and match.away_team.name
+    assert len(match.football_stats) == len(STAT_PERIODS)
+    for period in match.football_stats:
+        assert len(period.groups) == STAT_GROUPS
+        assert all(len(g.statistics_items) == STAT_ITEMS for g in period.groups)
+    (lineup,) = match.football_lineups
+    assert sum(len(tl.players) for tl in lineup.lineups) == 2 * PLAYERS_PER_TEAM
+    assert all(
+        e.player.name and e.statistics for tl in lineup.lineups for e in tl.players
+    )
+    assert len(match.incidents) == INCIDENTS_PER_MATCH
+    assert len(statements) <= 10, statements
+
+
+def test_match_is_cached_by_event_id(loaded):
+    engine, season_results = loaded
+    match_id = season_results[0].match_id
+    reader = MatchReader(engine, TTLCache(maxsize=8, ttl=60))
+
+    first = reader.match(match_id)
+    with statement_count(engine) as statements:
+        assert reader.match(match_id) is first
+    assert statements == []
+
+    reader.invalidate(match_id)
+    assert reader.match(match_id) is not first
+    assert reader.match(-1) is None
+    assert -1 not in reader.cache
+
+
+def test_season_fixtures(loaded):
+    engine, season_results = loaded
+    reader = MatchReader(engine)
+    season_id = season_results[0].match_id // 1_000_000
+
+    with statement_count(engine) as statements:
+        fixtures = reader.season_fixtures(season_id)
+    assert len(statements) == 1
+    assert [e.id for e in fixtures] == [r.match_id for r in season_results]
+    assert all(e.home_team and e.away_team for e in fixtures)
+
+    team_id = fixtures[0].home_team_id
+    team_fixtures = reader.season_fixtures(season_id, team_id=team_id)
+    assert team_fixtures
+    assert all(team_id in (e.home_team_id, e.away_team_id) for e in team_fixtures)
+
+
+def test_player_history(loaded):
+    engine, season_results = loaded
+    reader = MatchReader(engine)
+    player_id = 1000 * 100
+
+    with statement_count(engine) as statements:
+        history = reader.player_history(player_id)
+    assert len(statements) == 1
+    assert history
+    events = [entry.team_lineup.football_lineup.event for entry in history]
+    starts = [e.startTimestamp for e in events]
+    assert starts == sorted(starts, reverse=True)
+    assert all(e.home_team and e.away_team for e in events)
+    assert all(entry.statistics is not None for entry in history)
+
+    assert len(reader.player_history(player_id, limit=2)) == 2
+
+
+def test_ttl_cache_expiry_and_lru():
+    now = [0.0]
+    cache = TTLCache(maxsize=2, ttl=10, clock=lambda: now[0])
+    cache.set("a", 1)
+    cache.set("b", 2)
+    assert cache.get("a") == 1
+    cache.set("c", 3)  # evicts b, a was used more recently
+    assert "b" not in cache and cache.get("a") == 1
+
+    now[0] = 10.0
+    assert cache.get("a") is None
+    assert cache.get_or_load("a", lambda: 5) == 5
+    assert cache.stats()["size"] == 2
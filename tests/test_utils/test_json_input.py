@@ -0,0 +1,119 @@
+# tests/test_utils/test_json_input.py
+import io
+import json
+from typing import List, Optional
+
+import pytest  # type: ignore
+from pydantic import BaseModel, ConfigDict
+
+from sqlsofa.general import EventsComponentConverter
+from sqlsofa.utils.json_input import iter_json_lines, validate_json
+
+from ..conftest import json_lines, raw_events
+
+
+class Row(BaseModel):
+    """Stand-in for a sofascrape schema - scalars as extras, nested schemas declared"""
+
+    model_config = ConfigDict(extra="allow")
+
+    def to_sql_dict(self):
+        return self.model_dump(exclude=set(type(self).model_fields))
+
+
+class Sport(Row):
+    pass
+
+
+class Category(Row):
+    sport: Sport
+
+
+class Tournament(Row):
+    category: Category
+
+
+class Country(Row):
+    pass
+
+
+class Team(Row):
+    country: Optional[Country] = None
+
+
+class Season(Row):
+    pass
+
+
+class Status(Row):
+    pass
+
+
+class Score(Row):
+    pass
+
+
+class Event(Row):
+    tournament: Tournament
+    season: Season
+    homeTeam: Team
+    awayTeam: Team
+    status: Optional[Status] = None
+    homeScore: Optional[Score] = None
+    awayScore: Optional[Score] = None
+
+
+class EventsList(BaseModel):
+    events: List[Event]
+
+
+class JsonEventsConverter(EventsComponentConverter):
+    schema = EventsList
+    event_schema = Event
+
+
+def test_validate_json_matches_dict_validation():
+    data = json.dumps({"events": raw_events()}).encode()
+    expected = EventsList.model_validate(json.loads(data))
+
+    assert validate_json(EventsList, data) == expected
+    assert validate_json(EventsList, memoryview(data)) == expected
+    assert validate_json(EventsList, data.decode()) == expected
+
+
+def test_json_lines_from_files_and_streams(tmp_path):
+    path = tmp_path / "events.jsonl"
+    path.write_bytes(json_lines(raw_events()) + b"\n\n")
+
+    from_path = list(iter_json_lines(Event, path))
+    from_stream = list(iter_json_lines(Event, io.BytesIO(path.read_bytes())))
+
+    assert len(from_path) == len(raw_events())
+    assert from_path == from_stream
+    assert from_path[3].homeTeam.country.slug == "england"
+
+
+def test_invalid_lines_raise_or_skip():
+    lines = json_lines(raw_events(2)).splitlines() + [b'{"id": 1}']
+
+    with pytest.raises(ValueError, match="Line 3"):
+        list(iter_json_lines(Event, lines))
+    assert len(list(iter_json_lines(Event, lines, skip_invalid=True))) == 2
+
+
+def test_events_converter_entry_points_agree():
+    from_model = JsonEventsConverter()
+    from_model.convert(EventsList.model_validate({"events": raw_events()}))
+
+    from_json = JsonEventsConverter()
+    from_json.convert_json(json.dumps({"events": raw_events()}).encode())
+
+    from_lines = JsonEventsConverter()
+    from_lines.convert_json_lines(io.BytesIO(json_lines(raw_events())))
+
+    expected = [e.model_dump(exclude={"created_at"}) for e in from_model.data]
+    for converter in (from_json, from_lines):
+        assert [
+            e.model_dump(exclude={"created_at"}) for e in converter.data
+        ] == expected
+    assert len(from_lines.results) == len(raw_events())
@@ -0,0 +1,87 @@
+# tests/test_utils/test_match_archive.py
+import json
+
+import pytest  # type: ignore
+from pydantic import BaseModel
+
+from sqlsofa.utils.match_archive import (
+    ArchiveWriter,
+    MatchArchive,
+    index_path,
+)
+
+
+class Match(BaseModel):
+    match_id: int
+    home: str
+    goals: list
+
+
+def payloads(n=50):
+    return [
+        {"match_id": 1000 + i, "home": f"team {i}", "goals": list(range(i % 4))}
+        for i in range(n)
+    ]
+
+
+@pytest.fixture
+def archive_path(tmp_path):
+    path = tmp_path / "season.sofa"
+    with ArchiveWriter(path) as writer:
+        writer.extend(payloads())
+    return path
+
+
+def test_random_access(archive_path):
+    with MatchArchive(archive_path) as archive:
+        assert len(archive) == 50
+        assert 1042 in archive and 999 not in archive
+        assert archive.load(1042) == payloads()[42]
+        match = archive.load(1007, Match)
+        assert match == Match(**payloads()[7])
+
+
+def test_raw_is_a_view_of_the_mapping(archive_path):
+    with MatchArchive(archive_path) as archive:
+        view = archive.raw(1003)
+        assert isinstance(view, memoryview)
+        assert json.loads(view.tobytes())["home"] == "team 3"
+        view.release()
+
+
+def test_appends_supersede_earlier_records(archive_path):
+    with ArchiveWriter(archive_path) as writer:
+        writer.append(1003, Match(match_id=1003, home="renamed", goals=[]))
+        writer.append(2000, json.dumps({"match_id": 2000, "home": "x", "goals": []}))
+
+    with MatchArchive(archive_path) as archive:
+        assert len(archive) == 51
+        assert archive.load(1003)["home"] == "renamed"
+        assert archive.fetcher(Match)(2000).home == "x"
+
+
+def test_lost_index_is_rebuilt(archive_path):
+    index_path(archive_path).unlink()
+
+    with MatchArchive(archive_path) as archive:
+        assert len(archive) == 50
+        assert archive.load(1049) == payloads()[49]
+    assert index_path(archive_path).exists()
+
+
+def test_torn_writes_are_ignored(archive_path):
+    # A crash mid-append leaves a partial index entry and record
+    with open(index_path(archive_path), "ab") as f:
+        f.write(b"\x01\x02\x03")
+    with open(archive_path, "ab") as f:
+        f.write(b"\x05\x00")
+
+    with MatchArchive(archive_path) as archive:
+        assert len(archive) == 50
+
+
+def test_other_files_are_rejected(tmp_path):
+    path = tmp_path / "tournaments_data.pkl"
+    path.write_bytes(b"\x80\x04\x95not an archive")
+    with pytest.raises(ValueError):
+        MatchArchive(path)
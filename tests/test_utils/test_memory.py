@@ -0,0 +1,116 @@
+# tests/test_utils/test_memory.py
+import json
+import tracemalloc
+
+import pytest  # type: ignore
+
+import sqlsofa.schema.sqlmodels as sqlschema
+from sqlsofa.loaders import BulkLoader
+from sqlsofa.utils import memory
+from sqlsofa.utils.memory import CONVERTERS_FILE, function_spans, tracked
+
+from ..conftest import synthetic_season
+
+retained = []
+
+
+def build_seasons(n, start=0):
+    return [
+        sqlschema.Season(id=start + i, name=f"Season {i}", year="24/25")
+        for i in range(n)
+    ]
+
+
+@tracked("convert")
+def convert(n, keep=False):
+    seasons = build_seasons(n, start=len(retained))
+    if keep:
+        retained.extend(seasons)
+    return len(seasons)
+
+
+@pytest.fixture
+def tracker(tmp_path):
+    retained.clear()
+    tracker = memory.enable(tmp_path, attribute_files=[__file__], leak_batches=3)
+    yield tracker
+    memory.disable()
+    retained.clear()
+
+
+def test_disabled_calls_pass_through():
+    assert memory.active_tracker() is None
+    assert convert(3) == 3
+
+
+def test_retained_memory_is_attributed(tracker):
+    convert(200, keep=True)
+
+    [report] = tracker.reports
+    assert report.name == "convert" and report.call == 1
+    size, blocks = report.functions[f"{__name__.rsplit('.', 1)[-1]}.build_seasons"]
+    assert size > 0 and blocks > 0
+    assert report.retained_bytes > 0
+    assert report.tables["seasons"][0] >= 200
+    assert report.suspects == []
+
+
+def test_growth_across_batches_is_suspected(tracker):
+    for _ in range(3):
+        convert(50)
+    assert tracker.reports[-1].suspects == []
+
+    for _ in range(3):
+        convert(50, keep=True)
+    [suspect] = tracker.reports[-1].suspects
+    assert suspect.startswith("seasons grew")
+
+
+def test_reports_are_written_as_json_lines(tracker, tmp_path):
+    convert(10)
+    convert(10)
+
+    lines = tracker.path.read_text().splitlines()
+    assert [json.loads(line)["call"] for line in lines] == [1, 2]
+
+
+def test_converter_functions_are_known():
+    names = [name for _, _, name in function_spans(CONVERTERS_FILE)]
+    assert "football_lineup" in names and "score" in names
+
+
+def test_loader_batches_are_tracked(engine, tmp_path):
+    results = synthetic_season(n_teams=2)
+    tracker = memory.enable(tmp_path, frames=5)
+    try:
+        BulkLoader(engine).load_batch(results)
+    finally:
+        memory.disable()
+
+    assert [r.name for r in tracker.reports] == ["load"]
+
+
+def test_disable_keeps_tracing_started_elsewhere():
+    tracemalloc.start()
+    try:
+        memory.enable()
+        memory.disable()
+        assert tracemalloc.is_tracing()
+    finally:
+        tracemalloc.stop()
+
+    memory.enable()
+    memory.disable()
+    assert not tracemalloc.is_tracing()
+
+
+@pytest.mark.parametrize(
+    "name, value",
+    [("SQLSOFA_MEMORY_FRAMES", "many"), ("SQLSOFA_MEMORY_LEAK_BATCHES", "1.5")],
+)
+def test_bad_env_settings_leave_accounting_off(tmp_path, monkeypatch, name, value):
+    monkeypatch.setenv("SQLSOFA_MEMORY_DIR", str(tmp_path))
+    monkeypatch.setenv(name, value)
+
+    assert memory.enable_from_env() is None
+    assert memory.active_tracker() is None
@@ -0,0 +1,104 @@
+# tests/test_utils/test_profiling.py
+import pstats
+
+import pytest  # type: ignore
+
+from sqlsofa.loaders import BulkLoader
+from sqlsofa.utils import profiling
+from sqlsofa.utils.profiling import Profiler, StackSampler, profiled
+
+from ..conftest import synthetic_season
+
+
+@profiled("work")
+def work(n):
+    return sum(i * i for i in range(n))
+
+
+@pytest.fixture(autouse=True)
+def no_profiler():
+    yield
+    profiling.disable()
+
+
+def outputs(directory, suffix):
+    return sorted(directory.glob(f"*.{suffix}"))
+
+
+def test_disabled_calls_pass_through(tmp_path):
+    assert profiling.active_profiler() is None
+    assert work(10) == 285
+    assert work.__name__ == "work"
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_one_in_n_calls_is_sampled(tmp_path):
+    profiler = profiling.enable(tmp_path, sample_every=3)
+    for _ in range(7):
+        assert work(1000) == sum(i * i for i in range(1000))
+
+    assert profiler.calls["work"] == 7
+    assert profiler.samples["work"] == 3
+    [stats_path] = outputs(tmp_path, "pstats")
+    [table_path] = outputs(tmp_path, "txt")
+    assert stats_path.name.startswith("work.")
+    assert "3 sampled of 7 calls" in table_path.read_text()
+    assert "test_profiling.py" in table_path.read_text()
+    assert pstats.Stats(str(stats_path)).total_calls > 0
+
+
+@pytest.mark.skipif(not StackSampler.available(), reason="needs SIGPROF")
+def test_stack_mode_writes_collapsed_stacks(tmp_path):
+    profiling.enable(tmp_path, sample_every=1, mode="stack", interval=0.001)
+    work(2_000_000)
+
+    [folded] = outputs(tmp_path, "folded")
+    stacks = [line.rsplit(" ", 1) for line in folded.read_text().splitlines()]
+    assert stacks
+    assert all(stack.startswith(f"{__name__}.work") for stack, _ in stacks)
+    assert sum(int(n) for _, n in stacks) > 0
+    assert f"{__name__}.work" in outputs(tmp_path, "txt")[0].read_text()
+
+
+def test_profiles_rotate_per_hour(tmp_path, monkeypatch):
+    hours = iter(["20250101-10", "20250101-10", "20250101-11"])
+    monkeypatch.setattr(profiling, "hour_stamp", lambda: next(hours))
+    profiler = Profiler(tmp_path, sample_every=1)
+    profiling._profiler = profiler
+
+    work(10)
+    work(10)
+
+    names = [p.name.split(".")[1] for p in outputs(tmp_path, "pstats")]
+    assert names == ["20250101-10", "20250101-11"]
+
+
+def test_env_configuration(tmp_path, monkeypatch):
+    monkeypatch.setenv("SQLSOFA_PROFILE_DIR", str(tmp_path / "profiles"))
+    monkeypatch.setenv("SQLSOFA_PROFILE_EVERY", "5")
+    profiler = profiling.enable_from_env()
+
+    assert profiling.active_profiler() is profiler
+    assert profiler.sample_every == 5 and profiler.mode == "cprofile"
+    with pytest.raises(ValueError):
+        Profiler(tmp_path, mode="perf")
+
+
+@pytest.mark.parametrize(
+    "name, value", [("SQLSOFA_PROFILE_MODE", "stacks"), ("SQLSOFA_PROFILE_EVERY", "x")]
+)
+def test_bad_env_settings_leave_profiling_off(tmp_path, monkeypatch, name, value):
+    monkeypatch.setenv("SQLSOFA_PROFILE_DIR", str(tmp_path / "profiles"))
+    monkeypatch.setenv(name, value)
+
+    assert profiling.enable_from_env() is None
+    assert profiling.active_profiler() is None
+
+
+def test_loaders_are_profiled(engine, tmp_path):
+    profiling.enable(tmp_path / "profiles", sample_every=1)
+    BulkLoader(engine).load_batch(synthetic_season(n_teams=4))
+
+    [table] = outputs(tmp_path / "profiles", "txt")
+    assert table.name.startswith("load.")
+    assert "bulk_loader.py" in table.read_text()
@@ -0,0 +1,151 @@
+# tests/test_utils/test_sql_stats.py
+import json
+import logging
+import threading
+
+import pytest  # type: ignore
+from sqlalchemy import Column, Integer, MetaData, Table, create_engine, insert, text
+
+from sqlsofa.loaders import BulkLoader, SessionLoader
+from sqlsofa.utils.sql_stats import (
+    instrument,
+    max_statements,
+    recorder_for,
+    statement_kind,
+    statement_table,
+    uninstrument,
+)
+
+from ..conftest import synthetic_season
+
+
+@pytest.fixture
+def instrumented(engine):
+    instrument(engine)
+    yield engine
+    uninstrument(engine)
+
+
+@pytest.mark.parametrize(
+    "statement, kind, table",
+    [
+        ('INSERT INTO teams (id, "shortName") VALUES (?, ?)', "INSERT", "teams"),
+        (
+            "UPDATE ingest_jobs SET status=? WHERE id IN (SELECT ...)",
+            "UPDATE",
+            "ingest_jobs",
+        ),
+        ("DELETE FROM standings WHERE season_id = ?", "DELETE", "standings"),
+        ("SELECT events.id FROM public.events JOIN teams ON ...", "SELECT", "events"),
+        ("\n(SELECT 1)", "SELECT", ""),
+    ],
+)
+def test_statement_classification(statement, kind, table):
+    assert statement_kind(statement) == kind
+    assert statement_table(statement) == table
+
+
+def test_uninstrumented_loads_have_no_stats(engine):
+    result = BulkLoader(engine).load(synthetic_season(n_teams=2)[0])
+    assert result.statements is None
+    assert recorder_for(engine) is None
+
+
+def test_bulk_load_of_one_match(instrumented):
+    result = BulkLoader(instrumented).load(synthetic_season(n_teams=4)[0])
+    stats = result.statements
+
+    # One multi-row statement per table, whatever the match size
+    assert stats.count() == len(result.rows)
+    assert stats.count(kind="SELECT") == 0
+    for table, rows in result.rows.items():
+        assert stats.total(table=table).rows == rows, table
+    assert set(stats.group("match_id")) == {result.match_ids[0]}
+    assert set(stats.group("phase")) == {"load"}
+
+
+def test_session_loads_are_bucketed_per_match(instrumented):
+    results = synthetic_season(n_teams=3)
+    stats = SessionLoader(instrumented).load_batch(results).statements
+
+    per_match = stats.group("match_id")
+    assert set(per_match) == {r.match_id for r in results}
+    assert sum(t.statements for t in per_match.values()) == stats.count()
+    assert stats.count(table="events", kind="INSERT") == len(results)
+
+
+def test_preallocated_ids_are_a_phase(instrumented):
+    result = BulkLoader(instrumented, preallocate_ids=True).load_batch(
+        synthetic_season(n_teams=3)
+    )
+    phases = result.statements.group("phase")
+    assert phases["allocate_ids"].statements > 0
+    assert phases["load"].statements > 0
+
+
+def test_json_summary_per_batch(engine, caplog):
+    instrument(engine, log_json=True)
+    try:
+        with caplog.at_level(logging.INFO, logger="sqlsofa.utils.sql_stats"):
+            BulkLoader(engine).load(synthetic_season(n_teams=2)[0])
+    finally:
+        uninstrument(engine)
+
+    [line] = [r.getMessage() for r in caplog.records]
+    summary = json.loads(line)
+    assert summary["batch"] == "BulkLoader"
+    assert summary["by_table"]["events"]["statements"] == 1
+    assert summary["by_kind"]["INSERT"]["rows"] == summary["rows"]
+
+
+def test_max_statements(engine):
+    with max_statements(engine, 2):
+        with engine.connect() as conn:
+            conn.execute(text("SELECT 1"))
+            conn.execute(text("SELECT 2"))
+
+    with pytest.raises(AssertionError, match="(?s)at most 1 statements.*SELECT 2"):
+        with max_statements(engine, 1, kind="SELECT"):
+            with engine.connect() as conn:
+                conn.execute(text("SELECT 1"))
+                conn.execute(text("SELECT 2"))
+    assert recorder_for(engine) is None
+
+
+def test_loading_one_match_is_bounded(engine):
+    # An N+1 in the bulk path would scale with the players, items and points
+    [result] = synthetic_season(n_teams=2)[:1]
+    with max_statements(engine, len(result.compact().tables)):
+        BulkLoader(engine).load(result)
+
+
+def test_other_threads_are_not_counted(engine):
+    def select_elsewhere():
+        with engine.connect() as conn:
+            for _ in range(5):
+                conn.execute(text("SELECT 1"))
+
+    with max_statements(engine, 1) as stats:
+        thread = threading.Thread(target=select_elsewhere)
+        thread.start()
+        thread.join()
+        with engine.connect() as conn:
+            conn.execute(text("SELECT 2"))
+    assert stats.count() == 1
+
+
+def test_returning_rows_are_counted_once_across_pages():
+    engine = create_engine("sqlite://", insertmanyvalues_page_size=10)
+    metadata = MetaData()
+    table = Table(
+        "pages", metadata, Column("id", Integer, primary_key=True), Column("v", Integer)
+    )
+    metadata.create_all(engine)
+
+    with max_statements(engine, 3) as stats:
+        with engine.begin() as conn:
+            conn.execute(
+                insert(table).returning(table.c.id), [{"v": v} for v in range(25)]
+            ).all()
+    assert stats.total(table="pages").statements == 3
+    assert stats.total(table="pages").rows == 25